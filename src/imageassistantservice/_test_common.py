@@ -0,0 +1,66 @@
+"""Helpers shared by the local test scripts."""
+
+import os
+import sys
+import functools
+from typing import Tuple
+
+from genproto import imageassistant_pb2
+
+# Health checks carry no per-call data, so one request object serves every caller
+HEALTH_REQUEST = imageassistant_pb2.HealthCheckRequest(service="imageassistant.ImageAssistantService")
+
+# Sample images shared by the test scripts and tests/, so each URL is downloaded and staged once
+ROOM_SCENE = "https://i.pinimg.com/736x/cb/f5/49/cbf549e2dc77cef0c4e9905323744e8a.jpg"
+POSTER = "https://postersbase.com/cdn/shop/files/1_ad98f783-e827-49e8-bd31-c46e82bddc80.png?v=1715679997&width=1080"
+ENTRY_TABLE = "https://decorcabinets.com/wp-content/uploads/2024/11/37-Entry-Pic-2.jpg"
+VASE = "https://static.athome.com/images/w_1200,h_1200,c_pad,f_auto,fl_lossy,q_auto/v1746793260/p/124379171_E1/providence-blue-white-floral-porcelain-vase-12.jpg"
+
+TEST_IMAGE_URLS = (ROOM_SCENE, POSTER, ENTRY_TABLE, VASE)
+
+TEST_CASES = (
+    {"name": "Decorative Vase", "base": ENTRY_TABLE, "product": VASE, "prompt": "Place this decorative vase on the table"},
+    {"name": "Wall Art", "base": ROOM_SCENE, "product": POSTER, "prompt": "How would this poster look on the wall in this room?"},
+)
+
+
+@functools.lru_cache(maxsize=1)
+def creds_ok() -> Tuple[bool, str]:
+    """(key file exists, path) for GOOGLE_APPLICATION_CREDENTIALS, stat'ed once per process."""
+    path = os.environ.get("GOOGLE_APPLICATION_CREDENTIALS", "")
+    return bool(path) and os.path.exists(path), path
+
+
+def install_uvloop():
+    """Use uvloop's faster event loop when it is installed; call before any grpc.aio channel exists."""
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
+
+class OutputBuffer:
+    """Collect a test's output lines and write them to stdout in one call.
+
+    Use one buffer per test (or per concurrent task) so output stays grouped and ordered.
+    """
+    __slots__ = ('lines',)
+
+    def __init__(self):
+        self.lines = []
+
+    def p(self, *values):
+        """Buffer a line, formatted like print()."""
+        self.lines.append(" ".join(str(value) for value in values) + "\n")
+
+    def flush(self):
+        sys.stdout.write("".join(self.lines))
+        sys.stdout.flush()
+        self.lines.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.flush()
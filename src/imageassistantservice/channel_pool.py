@@ -0,0 +1,69 @@
+import asyncio
+import itertools
+
+import grpc
+
+from genproto import imageassistant_pb2, imageassistant_pb2_grpc
+
+# Responses carry URLs, object lists, tags and metadata that gzip well; level 2 keeps CPU cost low
+COMPRESSION_OPTIONS = [
+    ('grpc.default_compression_algorithm', grpc.Compression.Gzip.value),
+    ('grpc.default_compression_level', 2),
+]
+
+
+class ChannelPool:
+    """Round-robin pool of gRPC channels, each its own TCP connection.
+
+    One HTTP/2 connection caps concurrent streams (~100) and suffers head-of-line blocking;
+    spreading calls over several channels gives each its own flow-control window.
+    """
+
+    def __init__(self, target: str = 'localhost:8080', size: int = 4):
+        # A distinct grpc.channel_number keeps gRPC from sharing one subchannel between them
+        self._channels = [
+            grpc.aio.insecure_channel(target, options=[
+                ('grpc.channel_number', i),
+                ('grpc.keepalive_time_ms', 30000),
+                # Accept image-sized responses, and don't hold a retry copy of every unary response
+                ('grpc.max_receive_message_length', 16 * 1024 * 1024),
+                ('grpc.per_rpc_retry_buffer_size', 0),
+                *COMPRESSION_OPTIONS,
+            ], compression=grpc.Compression.Gzip)
+            for i in range(size)
+        ]
+        # One stub per channel, built once; a stub creates a multicallable per RPC method
+        self._stubs = [imageassistant_pb2_grpc.ImageAssistantServiceStub(channel) for channel in self._channels]
+        # stub() returns the stub bound to the next channel in the pool
+        self.stub = itertools.cycle(self._stubs).__next__
+
+    async def warm_up(self, timeout: float = 5.0) -> bool:
+        """Connect every channel and send a cheap Check on each.
+
+        The TCP handshake and HTTP/2 preface/SETTINGS exchange then happen here,
+        not inside the first large VisualizeProduct call on each connection.
+        Returns False if the server isn't reachable and healthy within `timeout`.
+        """
+        async def connect_and_check():
+            await asyncio.gather(*(channel.channel_ready() for channel in self._channels))
+            await asyncio.gather(*(
+                stub.Check(imageassistant_pb2.HealthCheckRequest())
+                for stub in self._stubs
+            ))
+
+        try:
+            await asyncio.wait_for(connect_and_check(), timeout)
+            return True
+        except (grpc.aio.AioRpcError, asyncio.TimeoutError):
+            return False
+
+    async def close(self):
+        """Close every channel in the pool."""
+        for channel in self._channels:
+            await channel.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
@@ -0,0 +1,24 @@
+import functools
+from typing import Optional
+
+import vertexai
+from google import genai
+from google.cloud import storage
+
+
+@functools.lru_cache(maxsize=None)
+def init_vertexai(project: str, location: str) -> None:
+    """Initialize the Vertex AI SDK once per process for a project/location."""
+    vertexai.init(project=project, location=location)
+
+
+@functools.lru_cache(maxsize=None)
+def get_genai_client(project: str, location: str) -> genai.Client:
+    """Shared Vertex GenAI client per project/location (one credential refresh, one connection pool)."""
+    return genai.Client(vertexai=True, project=project, location=location)
+
+
+@functools.lru_cache(maxsize=None)
+def get_storage_client(project: Optional[str] = None) -> storage.Client:
+    """Shared GCS client for the process."""
+    return storage.Client(project=project)
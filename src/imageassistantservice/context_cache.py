@@ -0,0 +1,44 @@
+"""Vertex AI context caches for base scenes reused across local visualization tests."""
+
+import os
+from typing import Dict, Optional
+
+from google.genai import types
+
+from clients import get_genai_client
+from image_prefetch import prefetch
+from image_utils import get_image_mime_type
+
+# Gemini image model used by ProductVisualizerGemini; caches are bound to one model
+CACHE_MODEL = "gemini-2.5-flash-image-preview"
+CACHE_TTL = "600s"
+
+# Base image URL -> cached content resource name
+_cache_names: Dict[str, str] = {}
+
+
+async def ensure_cached_base(image_url: str) -> Optional[str]:
+    """Create (once) a context cache holding the base scene image and return its name.
+
+    Returns None when caching is unavailable, e.g. the image is below the model's minimum
+    cacheable token count, so callers fall back to sending the image inline.
+    """
+    if image_url in _cache_names:
+        return _cache_names[image_url]
+    try:
+        image_bytes = (await prefetch([image_url]))[image_url]
+        client = get_genai_client(os.getenv("GOOGLE_CLOUD_PROJECT"), "global")
+        cache = await client.aio.caches.create(
+            model=CACHE_MODEL,
+            config=types.CreateCachedContentConfig(
+                contents=[types.Content(role="user", parts=[
+                    types.Part.from_bytes(data=image_bytes, mime_type=get_image_mime_type(image_bytes)),
+                ])],
+                ttl=CACHE_TTL,
+            ),
+        )
+    except Exception as e:
+        print(f"   ⚠️  Context cache unavailable, sending base image inline: {str(e)}")
+        return None
+    _cache_names[image_url] = cache.name
+    return cache.name
@@ -4,9 +4,11 @@ from typing import List, Optional, Dict, Any
 import asyncio
 import re
 
+import aiohttp
+
 from google.cloud import vision
-from google.cloud import storage
 
+from clients import get_storage_client
 from models import (
     DetectedObject, BoundingBox, AnalyzeImageRequest, AnalyzeImageResponse
 )
@@ -33,7 +35,7 @@ class ImageAnalyzer:
             self.vision_client = vision.ImageAnnotatorClient()
             
             # Initialize Storage client
-            self.storage_client = storage.Client(project=self.project_id)
+            self.storage_client = get_storage_client(self.project_id)
             
             logger.info(f"✅ Initialized clients for project: {self.project_id}")
                 
@@ -69,7 +71,6 @@ class ImageAnalyzer:
             # In production, consider uploading to GCS first
             logger.warning(f"Non-GCS URL detected: {image_url}. Consider using GCS for better performance.")
             
-            import aiohttp
             async with aiohttp.ClientSession() as session:
                 async with session.get(image_url) as response:
                     if response.status == 200:
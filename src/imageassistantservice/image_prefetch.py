@@ -0,0 +1,66 @@
+"""Prefetch remote test images once and stage them in GCS for the local test scripts."""
+
+import os
+import asyncio
+import hashlib
+from datetime import timedelta
+from typing import Dict, Iterable
+
+import aiohttp
+
+from clients import get_storage_client
+from image_utils import get_image_mime_type
+
+# Downloaded image bytes keyed by source URL
+IMAGE_CACHE: Dict[str, bytes] = {}
+
+# Source URL -> signed URL of the staged GCS copy
+STAGED_URLS: Dict[str, str] = {}
+
+
+async def _get(session: aiohttp.ClientSession, url: str) -> bytes:
+    async with session.get(url) as response:
+        response.raise_for_status()
+        return await response.read()
+
+
+async def prefetch(urls: Iterable[str]) -> Dict[str, bytes]:
+    """Download every URL not already cached, concurrently over one session."""
+    missing = [url for url in dict.fromkeys(urls) if url not in IMAGE_CACHE]
+    if missing:
+        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30)) as session:
+            images = await asyncio.gather(*(_get(session, url) for url in missing))
+        IMAGE_CACHE.update(zip(missing, images))
+    return IMAGE_CACHE
+
+
+def _stage(url: str, image_bytes: bytes) -> str:
+    """Upload the bytes once per content hash and return a 1h V4 signed URL for the copy."""
+    bucket = get_storage_client(os.getenv("GOOGLE_CLOUD_PROJECT")).bucket(os.environ["GCS_RENDERS_BUCKET"])
+    blob = bucket.blob(f"test_inputs/{hashlib.sha256(image_bytes).hexdigest()}")
+    if not blob.exists():
+        blob.upload_from_string(image_bytes, content_type=get_image_mime_type(image_bytes))
+    return blob.generate_signed_url(version="v4", expiration=timedelta(hours=1), method="GET")
+
+
+async def stage_test_images(urls: Iterable[str]) -> Dict[str, str]:
+    """Prefetch the URLs and stage them in GCS so the service reads them from the bucket.
+
+    Falls back to the original URLs when staging is not possible (e.g. no bucket configured).
+    """
+    urls = list(dict.fromkeys(urls))
+    try:
+        await prefetch(urls)
+        pending = [url for url in urls if url not in STAGED_URLS]
+        signed_urls = await asyncio.gather(
+            *(asyncio.to_thread(_stage, url, IMAGE_CACHE[url]) for url in pending)
+        )
+        STAGED_URLS.update(zip(pending, signed_urls))
+    except Exception as e:
+        print(f"   ⚠️  Could not stage test images, using original URLs: {str(e)}")
+    return STAGED_URLS
+
+
+def staged(url: str) -> str:
+    """Staged copy of a test image URL, or the URL itself if it was not staged."""
+    return STAGED_URLS.get(url, url)
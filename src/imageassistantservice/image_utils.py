@@ -0,0 +1,73 @@
+import io
+import struct
+from typing import Tuple
+
+# JPEG start-of-frame markers carry the image size (C4, C8 and CC are DHT/JPG/DAC, not frames)
+_JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+def _jpeg_dimensions(data: bytes) -> Tuple[int, int]:
+    """Walk JPEG segment headers up to the first SOF marker."""
+    i = 2  # skip SOI
+    length = len(data)
+    while i + 9 <= length:
+        if data[i] != 0xFF:
+            break
+        marker = data[i + 1]
+        if marker == 0xFF:  # fill byte
+            i += 1
+            continue
+        if marker in _JPEG_SOF_MARKERS:
+            height, width = struct.unpack(">HH", data[i + 5:i + 9])
+            return width, height
+        if marker == 0x01 or 0xD0 <= marker <= 0xD9:  # standalone markers have no length
+            i += 2
+            continue
+        segment_length = struct.unpack(">H", data[i + 2:i + 4])[0]
+        i += 2 + segment_length
+    raise ValueError("No JPEG frame header found")
+
+
+def _webp_dimensions(data: bytes) -> Tuple[int, int]:
+    """Read the size from a VP8X, VP8 or VP8L chunk header."""
+    chunk = data[12:16]
+    if chunk == b'VP8X':
+        width = 1 + int.from_bytes(data[24:27], 'little')
+        height = 1 + int.from_bytes(data[27:30], 'little')
+        return width, height
+    if chunk == b'VP8 ':
+        width, height = struct.unpack("<HH", data[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b'VP8L':
+        bits = int.from_bytes(data[21:25], 'little')
+        return 1 + (bits & 0x3FFF), 1 + ((bits >> 14) & 0x3FFF)
+    raise ValueError("Unknown WebP chunk")
+
+
+def get_image_mime_type(image_bytes: bytes) -> str:
+    """Determine MIME type from image header bytes, defaulting to JPEG."""
+    if image_bytes.startswith(b'\x89PNG\r\n\x1a\n'):
+        return 'image/png'
+    if image_bytes[:6] in (b'GIF87a', b'GIF89a'):
+        return 'image/gif'
+    if image_bytes.startswith(b'RIFF') and image_bytes[8:12] == b'WEBP':
+        return 'image/webp'
+    return 'image/jpeg'
+
+
+def get_image_dimensions(image_bytes: bytes) -> Tuple[int, int]:
+    """Return (width, height) by parsing only the image header.
+
+    Handles JPEG, PNG, GIF and WebP without decoding pixels; other formats fall back to PIL.
+    """
+    if image_bytes.startswith(b'\xff\xd8'):
+        return _jpeg_dimensions(image_bytes)
+    if image_bytes.startswith(b'\x89PNG\r\n\x1a\n') and image_bytes[12:16] == b'IHDR':
+        return struct.unpack(">II", image_bytes[16:24])
+    if image_bytes[:6] in (b'GIF87a', b'GIF89a'):
+        return struct.unpack("<HH", image_bytes[6:10])
+    if image_bytes.startswith(b'RIFF') and image_bytes[8:12] == b'WEBP':
+        return _webp_dimensions(image_bytes)
+
+    from PIL import Image
+    return Image.open(io.BytesIO(image_bytes)).size
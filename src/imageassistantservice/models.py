@@ -50,6 +50,7 @@ class VisualizeProductRequest(BaseModel):
     product_image_url: str = Field(..., description="Product image URL")
     placement: Optional[ProductPlacement] = Field(None, description="Product placement configuration")
     prompt: Optional[str] = Field(None, description="Additional prompt for visualization")
+    cached_content_name: Optional[str] = Field(None, description="Vertex AI cached content holding the base scene image")
 
 class VisualizeProductResponse(BaseModel):
     """Model for product visualization response."""
@@ -3,15 +3,13 @@ import logging
 import asyncio
 import time
 import json
-import uuid
+import hashlib
 from typing import Optional
 from datetime import datetime, timedelta
-import vertexai
 from vertexai.preview.vision_models import ImageGenerationModel
-from google import genai
-from google.cloud import storage
 from google.genai.types import HttpOptions
 
+from clients import get_genai_client, get_storage_client, init_vertexai
 from models import (
     AnalyzeImageResponse, VisualizeProductRequest, VisualizeProductResponse, 
     ProductPlacement, RenderMetadata, Position
@@ -33,18 +31,18 @@ class ProductVisualizer:
         # Initialize Vertex AI
         if self.project_id:
             try:
-                vertexai.init(project=self.project_id, location=self.location)
+                init_vertexai(self.project_id, self.location)
                 
                 # Initialize Imagen model for image generation
                 self.imagen_model = ImageGenerationModel.from_pretrained("imagen-3.0-generate-002")
                 logger.info("✅ Initialized Vertex AI Imagen model")
                 
                 # Initialize Gemini for placement inference
-                self.gemini_client = genai.Client(vertexai=True, project=self.project_id, location=self.location)
+                self.gemini_client = get_genai_client(self.project_id, self.location)
                 logger.info("✅ Initialized Gemini client for placement inference")
                 
                 # Initialize GCS client for render storage
-                self.storage_client = storage.Client()
+                self.storage_client = get_storage_client(self.project_id)
                 logger.info("✅ Initialized GCS client for render storage")
                 
             except Exception as e:
@@ -138,18 +136,18 @@ class ProductVisualizer:
             raise Exception("GCS storage not configured. Please ensure GCS_RENDERS_BUCKET is set.")
         
         try:
-            # Generate unique filename
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            unique_id = str(uuid.uuid4())[:8]
-            filename = f"renders/{timestamp}_{unique_id}.jpg"
+            # Content-addressed filename: identical renders map to the same blob and are uploaded once
+            content_hash = hashlib.blake2b(image_data, digest_size=12).hexdigest()
+            filename = f"renders/{content_hash}.jpg"
             
             # Get bucket and create blob
             bucket = self.storage_client.bucket(self.renders_bucket)
             blob = bucket.blob(filename)
             
-            # Upload image data
-            blob.upload_from_string(image_data, content_type='image/jpeg')
-            logger.info(f"✅ Uploaded render to GCS: gs://{self.renders_bucket}/{filename}")
+            # Upload image data unless the same render is already stored
+            if not blob.exists():
+                blob.upload_from_string(image_data, content_type='image/jpeg')
+                logger.info(f"✅ Uploaded render to GCS: gs://{self.renders_bucket}/{filename}")
             
             # Generate signed URL (valid for 1 hour)
             signed_url = blob.generate_signed_url(
@@ -3,19 +3,17 @@ import logging
 import asyncio
 import time
 import json
-import uuid
+import hashlib
 import mimetypes
 from typing import Optional
-from datetime import datetime, timedelta
-import vertexai
-from google.cloud import storage
+from datetime import timedelta
 
-from google import genai
 from google.genai import types
-import requests
+import aiohttp
 from PIL import Image
 import io
 
+from clients import get_genai_client, get_storage_client, init_vertexai
 from models import (
     VisualizeProductRequest, VisualizeProductResponse, 
     ProductPlacement, RenderMetadata, Position
@@ -26,13 +24,21 @@ logger = logging.getLogger(__name__)
 class ProductVisualizerGemini:
     """Service for visualizing products in user photos using Gemini 2.5 Flash Image Preview."""
     
-    def __init__(self):
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None):
         self.project_id = os.getenv("GOOGLE_CLOUD_PROJECT")
         self.location = os.getenv("GOOGLE_CLOUD_REGION", "us-central1")
         self.renders_bucket = os.getenv("GCS_RENDERS_BUCKET")
         self.storage_client = None
         self.gemini_client = None
         
+        # Keep-alive HTTP session for image downloads; callers may inject one to share its connection pool,
+        # in which case they also close it
+        self._http_session = session
+        self._owns_http_session = session is None
+        
+        # In-flight render uploads; held so tasks aren't garbage collected mid-upload
+        self._pending_uploads: set[asyncio.Task] = set()
+        
         # Gemini model configuration for image generation
         self.gemini_model = "gemini-2.5-flash-image-preview"
         
@@ -40,18 +46,17 @@ class ProductVisualizerGemini:
         if self.project_id:
             try:
                 # Initialize Vertex AI
-                vertexai.init(project=self.project_id, location=self.location)
+                init_vertexai(self.project_id, self.location)
                 
                 # Initialize GenAI client for Gemini image generation
-                self.gemini_client = genai.Client(
-                    vertexai=True,
-                    project=self.project_id,
-                    location="global"  # Gemini models are typically in global location
+                self.gemini_client = get_genai_client(
+                    self.project_id,
+                    "global"  # Gemini models are typically in global location
                 )
                 logger.info("✅ Initialized Gemini 2.5 Flash Image Preview client")
                 
                 # Initialize GCS client for render storage
-                self.storage_client = storage.Client()
+                self.storage_client = get_storage_client(self.project_id)
                 logger.info("✅ Initialized GCS client for render storage")
                 
                 logger.info(f"✅ Initialized Gemini model: {self.gemini_model}")
@@ -75,28 +80,35 @@ class ProductVisualizerGemini:
             return image_bytes, 'image/jpeg'
 
     async def _upload_to_gcs_and_get_signed_url(self, image_data: bytes) -> str:
-        """Upload generated image to GCS renders bucket and return a signed URL."""
+        """Upload a generated image to the renders bucket and return its signed URL.
+
+        V4 URLs can be signed before the object exists, so signing overlaps the upload; the URL
+        is only returned once the upload has succeeded, so it always resolves.
+        """
         if not self.storage_client or not self.renders_bucket:
             raise Exception("GCS storage not configured. Please ensure GCS_RENDERS_BUCKET is set.")
         
         try:
-            # Generate unique filename
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            unique_id = str(uuid.uuid4())[:8]
-            filename = f"gemini_renders/{timestamp}_{unique_id}.jpg"
-            
-            # Get bucket and create blob
-            bucket = self.storage_client.bucket(self.renders_bucket)
-            blob = bucket.blob(filename)
-            
-            # Upload image data
-            blob.upload_from_string(image_data, content_type='image/jpeg')
-            logger.info(f"✅ Uploaded Gemini render to GCS: gs://{self.renders_bucket}/{filename}")
-            
-            # Generate signed URL (valid for 1 hour)
-            signed_url = blob.generate_signed_url(
-                expiration=datetime.utcnow() + timedelta(hours=1),
-                method='GET'
+            # Content-addressed filename: identical renders map to the same blob and are uploaded once
+            content_hash = hashlib.blake2b(image_data, digest_size=12).hexdigest()
+            filename = f"gemini_renders/{content_hash}.jpg"
+            
+            blob = self.storage_client.bucket(self.renders_bucket).blob(filename)
+            
+            # Tracked so drain_uploads() can still finish it if the caller is cancelled mid-upload
+            upload_task = asyncio.create_task(self._upload_render(blob, image_data))
+            self._pending_uploads.add(upload_task)
+            upload_task.add_done_callback(self._pending_uploads.discard)
+            
+            # Generate V4 signed URL (valid for 1 hour); signing may call IAM, so keep it off the loop
+            signed_url, _ = await asyncio.gather(
+                asyncio.to_thread(
+                    blob.generate_signed_url,
+                    version="v4",
+                    expiration=timedelta(hours=1),
+                    method='GET'
+                ),
+                asyncio.shield(upload_task)
             )
             
             return signed_url
@@ -105,16 +117,42 @@ class ProductVisualizerGemini:
             logger.error(f"Failed to upload to GCS: {str(e)}")
             raise Exception(f"Failed to upload generated image to storage: {str(e)}")
 
+    async def _upload_render(self, blob, image_data: bytes) -> None:
+        """Upload render bytes to GCS, skipping blobs that already hold these bytes."""
+        if await asyncio.to_thread(blob.exists):
+            return
+        await asyncio.to_thread(blob.upload_from_string, image_data, content_type='image/jpeg')
+        logger.info("✅ Uploaded Gemini render to GCS: gs://%s/%s", self.renders_bucket, blob.name)
+
+    async def drain_uploads(self) -> None:
+        """Wait for in-flight uploads to finish (called on shutdown)."""
+        if self._pending_uploads:
+            logger.info("Waiting for %d pending render uploads", len(self._pending_uploads))
+            await asyncio.gather(*self._pending_uploads, return_exceptions=True)
+
+    def _get_http_session(self) -> aiohttp.ClientSession:
+        """Return the shared keep-alive HTTP session, creating it on first use inside the event loop."""
+        if self._http_session is None or self._http_session.closed:
+            self._http_session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=30),
+                connector=aiohttp.TCPConnector(limit=32)
+            )
+            self._owns_http_session = True
+        return self._http_session
+
+    async def aclose(self) -> None:
+        """Finish pending uploads and close the HTTP session, unless it was injected."""
+        await self.drain_uploads()
+        if self._http_session is not None and self._owns_http_session:
+            session, self._http_session = self._http_session, None
+            await session.close()
+
     async def _download_image(self, image_url: str) -> bytes:
         """Download image from URL."""
         try:
-            def _download():
-                response = requests.get(image_url, timeout=30)
+            async with self._get_http_session().get(image_url) as response:
                 response.raise_for_status()
-                return response.content
-            
-            loop = asyncio.get_event_loop()
-            return await loop.run_in_executor(None, _download)
+                return await response.read()
         except Exception as e:
             logger.error(f"Failed to download image from {image_url}: {str(e)}")
             raise Exception(f"Failed to download image: {str(e)}")
@@ -283,8 +321,12 @@ class ProductVisualizerGemini:
         return comprehensive_prompt
 
     async def _generate_with_gemini_image(self, base_image_url: str, product_image_url: str, 
-                                        prompt: str) -> str:
-        """Generate product visualization using Gemini 2.5 Flash Image Preview."""
+                                        prompt: str, cached_content_name: Optional[str] = None) -> str:
+        """Generate product visualization using Gemini 2.5 Flash Image Preview.
+
+        With cached_content_name, the base scene comes from that Vertex AI context cache
+        instead of being sent (and re-tokenized) with every request.
+        """
         if not self.gemini_client:
             raise Exception("Gemini client not available. Please ensure Vertex AI is properly configured.")
         
@@ -305,19 +347,16 @@ class ProductVisualizerGemini:
             product_bytes, product_mime = self._load_image_bytes_from_data(product_image_bytes)
             
             # Create multimodal contents for image generation
-            contents = [
-                types.Content(
-                    role="user",
-                    parts=[
-                        # Provide the base scene as first image
-                        types.Part.from_bytes(data=base_bytes, mime_type=base_mime),
-                        # Provide the product as second image
-                        types.Part.from_bytes(data=product_bytes, mime_type=product_mime),
-                        # Provide the comprehensive placement prompt
-                        types.Part.from_text(text=comprehensive_prompt),
-                    ],
-                ),
+            parts = [
+                # Provide the product as second image
+                types.Part.from_bytes(data=product_bytes, mime_type=product_mime),
+                # Provide the comprehensive placement prompt
+                types.Part.from_text(text=comprehensive_prompt),
             ]
+            if not cached_content_name:
+                # Provide the base scene as first image (otherwise it is already in the cache)
+                parts.insert(0, types.Part.from_bytes(data=base_bytes, mime_type=base_mime))
+            contents = [types.Content(role="user", parts=parts)]
             
             # Configure for image generation
             generate_content_config = types.GenerateContentConfig(
@@ -325,6 +364,7 @@ class ProductVisualizerGemini:
                     "IMAGE",
                     "TEXT",
                 ],
+                cached_content=cached_content_name,
             )
             
             # Generate the composite image
@@ -381,7 +421,8 @@ class ProductVisualizerGemini:
             render_url = await self._generate_with_gemini_image(
                 request.base_image_url,
                 request.product_image_url,
-                request.prompt
+                request.prompt,
+                request.cached_content_name
             )
             
             end_time = time.time()
@@ -3,24 +3,38 @@ import logging
 import asyncio
 import time
 import json
-import uuid
+import hashlib
+import base64
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
-from datetime import datetime, timedelta
-import vertexai
-from google.cloud import storage
+from datetime import timedelta
+from google.oauth2 import service_account
 
-from google import genai
 from google.genai.types import (
     RawReferenceImage,
     MaskReferenceImage,
     MaskReferenceConfig,
     EditImageConfig,
     Image as GenAIImage,
+    GenerateContentConfig,
+    Part,
 )
-import requests
+import httpx
 from PIL import Image, ImageDraw
 import io
 
+# libjpeg-turbo decodes/encodes JPEGs with SIMD, releases the GIL and can downscale during decode.
+# Optional: fall back to PIL when PyTurboJPEG or the native libturbojpeg is not installed.
+try:
+    import numpy as np
+    from turbojpeg import TurboJPEG, TJPF_RGB
+    _turbo_jpeg = TurboJPEG()
+except Exception:
+    _turbo_jpeg = None
+
+from clients import get_genai_client, get_storage_client, init_vertexai
+from image_utils import get_image_mime_type
 from models import (
     VisualizeProductRequest, VisualizeProductResponse, 
     ProductPlacement, RenderMetadata, Position
@@ -28,6 +42,142 @@ from models import (
 
 logger = logging.getLogger(__name__)
 
+# Longest edge Imagen Editing works at internally; larger base images are downscaled before upload
+IMAGEN_MAX_EDGE = int(os.getenv("IMAGEN_MAX_EDGE", "1024"))
+
+_DEFAULT_PLACEMENT_CONTEXT = "Product placement for realistic visualization"
+
+# Static parts of the placement prompt, built once at import
+_PLACEMENT_PROMPT_PREFIX = """
+            You are an expert in product placement and 3D spatial reasoning. Analyze these two images and determine the optimal placement for the product in the base scene.
+
+            Image 1: Base scene
+            Image 2: Product
+            Context: """
+
+_PLACEMENT_PROMPT_SUFFIX = """
+            Consider:
+            1. Scene depth and perspective
+            2. Available surfaces (tables, floors, counters)
+            3. Lighting consistency
+            4. Realistic scale proportions relative to base image size
+            5. Occlusion and shadows
+            6. Visual balance and composition
+
+            Return a JSON response with this exact structure:
+            {
+                "position": {"x": 0.0, "y": 0.0},
+                "scale": 0.0,
+                "rotation": 0.0,
+                "reasoning": "explanation of placement choice including scale rationale",
+                "confidence": 0.0
+            }
+
+            Where:
+            - position.x, position.y: normalized coordinates (0.0-1.0) for placement center
+            - scale: relative size (0.1-1.5) - consider the product should be realistic relative to the scene
+            - rotation: rotation angle in degrees (-180 to 180)
+            - reasoning: brief explanation of the placement logic and scale choice
+            - confidence: confidence score (0.0-1.0)
+
+            IMPORTANT: Choose scale carefully - consider how large the product should realistically appear in the scene.
+            """
+
+# Structured-output config for placement inference, shared by every request
+_PLACEMENT_CONFIG = GenerateContentConfig(
+    response_mime_type="application/json",
+    response_schema={
+        "type": "OBJECT",
+        "properties": {
+            "position": {
+                "type": "OBJECT",
+                "properties": {"x": {"type": "NUMBER"}, "y": {"type": "NUMBER"}},
+                "required": ["x", "y"],
+            },
+            "scale": {"type": "NUMBER"},
+            "rotation": {"type": "NUMBER"},
+            "reasoning": {"type": "STRING"},
+            "confidence": {"type": "NUMBER"},
+        },
+        "required": ["position", "scale"],
+    },
+)
+
+class _UpstreamWorkerPool:
+    """Fixed set of worker tasks that own all blocking calls to one upstream model.
+
+    Callers enqueue a callable and await its result. The workers run calls on a dedicated
+    executor whose size matches the model's quota, so concurrent requests share the same
+    long-lived threads (and the client's warm connections) instead of fanning out.
+    """
+
+    def __init__(self, name: str, concurrency: int):
+        self.name = name
+        self.concurrency = max(1, concurrency)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: list[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _ensure_started(self) -> None:
+        """Start the executor and worker tasks on first use in the running event loop.
+
+        The queue and workers belong to one loop; used from a new loop (e.g. another
+        asyncio.run), the pool starts fresh ones there.
+        """
+        loop = asyncio.get_running_loop()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix=self.name)
+        if self._queue is None or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._workers = [asyncio.create_task(self._worker(self._queue)) for _ in range(self.concurrency)]
+
+    async def aclose(self) -> None:
+        """Stop the worker tasks and shut down the executor; the pool restarts on next use."""
+        workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.cancel()
+        if self._loop is asyncio.get_running_loop():
+            await asyncio.gather(*workers, return_exceptions=True)
+            # Calls still queued will never run; fail their callers instead of leaving them waiting
+            while not self._queue.empty():
+                _, future = self._queue.get_nowait()
+                future.cancel()
+        self._queue = None
+        self._loop = None
+        if self._executor is not None:
+            executor, self._executor = self._executor, None
+            # Threads still running a call finish it in the background
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _worker(self, queue: asyncio.Queue) -> None:
+        """Pull queued calls and run them one at a time on the pool's executor."""
+        loop = asyncio.get_running_loop()
+        while True:
+            call, future = await queue.get()
+            try:
+                if not future.cancelled():
+                    result = await loop.run_in_executor(self._executor, call)
+                    if not future.cancelled():
+                        future.set_result(result)
+            except asyncio.CancelledError:
+                # The pool is closing; the caller must not wait for a result that will never come
+                future.cancel()
+                raise
+            except Exception as e:
+                if not future.cancelled():
+                    future.set_exception(e)
+            finally:
+                queue.task_done()
+
+    async def run(self, call):
+        """Queue a blocking call for the pool and wait for its result."""
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((call, future))
+        return await future
+
 class ProductVisualizerRecontext:
     """Service for visualizing products in user photos using Vertex AI Imagen 3.0 Editing & Customization."""
     
@@ -36,20 +186,36 @@ class ProductVisualizerRecontext:
         self.location = os.getenv("GOOGLE_CLOUD_REGION", "us-central1")
         self.renders_bucket = os.getenv("GCS_RENDERS_BUCKET")
         self.storage_client = None
+        self._signing_credentials = None
         self.genai_client = None
         self.gemini_client = None
         
+        # Shared async HTTP/2 client so image downloads multiplex over pooled connections;
+        # created on first use so it binds to the running event loop
+        self._http: Optional[httpx.AsyncClient] = None
+        
+        # Completed renders keyed by request hash -> GCS blob path (signed URLs expire, blobs don't)
+        self._render_cache: dict[str, str] = {}
+        self._render_cache_size = int(os.getenv("RENDER_CACHE_SIZE", "256"))
+        
+        # In-flight render uploads; held so tasks aren't garbage collected mid-upload
+        self._pending_uploads: set[asyncio.Task] = set()
+        
         # Imagen 3.0 Editing & Customization model configuration
         self.imagen_edit_model = "imagen-3.0-capability-001"
         
+        # Imagen and Gemini calls are each served by a fixed pool of workers sized to their quota
+        self._imagen_pool = _UpstreamWorkerPool("imagen", int(os.getenv("IMAGEN_MAX_CONCURRENCY", "2")))
+        self._gemini_pool = _UpstreamWorkerPool("gemini", int(os.getenv("GEMINI_MAX_CONCURRENCY", "4")))
+        
         # Initialize services
         if self.project_id:
             try:
                 # Initialize Vertex AI
-                vertexai.init(project=self.project_id, location=self.location)
+                init_vertexai(self.project_id, self.location)
                 
                 # Initialize GenAI client for Imagen editing (using Vertex AI)
-                self.genai_client = genai.Client(vertexai=True, project=self.project_id, location=self.location)
+                self.genai_client = get_genai_client(self.project_id, self.location)
                 logger.info("✅ Initialized GenAI client for Imagen editing")
                 
                 # Use same client for Gemini placement inference
@@ -57,128 +223,145 @@ class ProductVisualizerRecontext:
                 logger.info("✅ Initialized Gemini client for placement inference")
                 
                 # Initialize GCS client for render storage
-                self.storage_client = storage.Client()
+                self.storage_client = get_storage_client(self.project_id)
                 logger.info("✅ Initialized GCS client for render storage")
                 
+                # Load the service-account key once so signed URLs are generated locally
+                self._signing_credentials = self._load_signing_credentials()
+                
                 logger.info(f"✅ Initialized Imagen 3.0 Editing model: {self.imagen_edit_model}")
                 
             except Exception as e:
                 logger.error(f"❌ Failed to initialize Vertex AI Imagen Editing services: {str(e)}")
     
-    async def _upload_to_gcs_and_get_signed_url(self, image_data: bytes) -> str:
-        """Upload generated image to GCS renders bucket and return a signed URL."""
+    def _load_signing_credentials(self):
+        """Load service-account credentials from GOOGLE_APPLICATION_CREDENTIALS, if it is a key file.
+
+        With a private key on hand, V4 URLs are signed in-process instead of via the IAM signBlob API.
+        """
+        key_path = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
+        if not key_path or not os.path.isfile(key_path):
+            return None
+        try:
+            credentials = service_account.Credentials.from_service_account_file(key_path)
+            logger.info("✅ Loaded service-account key for local URL signing")
+            return credentials
+        except Exception as e:
+            logger.warning(f"Could not load signing key from {key_path}, falling back to default signing: {str(e)}")
+            return None
+
+    def _generate_signed_url(self, blob_name: str) -> str:
+        """Generate a V4 signed URL (valid for 1 hour) for a blob in the renders bucket."""
+        bucket = self.storage_client.bucket(self.renders_bucket)
+        blob = bucket.blob(blob_name)
+        return blob.generate_signed_url(
+            version="v4",
+            expiration=timedelta(hours=1),
+            method='GET',
+            credentials=self._signing_credentials
+        )
+
+    async def _upload_to_gcs_and_get_signed_url(self, image_data: bytes) -> tuple[str, str]:
+        """Upload a generated image to the renders bucket and return (blob path, signed URL).
+
+        V4 URLs can be signed before the object exists, so signing overlaps the upload; the URL
+        is only returned once the upload has succeeded, so it always resolves.
+        """
         if not self.storage_client or not self.renders_bucket:
             raise Exception("GCS storage not configured. Please ensure GCS_RENDERS_BUCKET is set.")
         
         try:
-            # Generate unique filename
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            unique_id = str(uuid.uuid4())[:8]
-            filename = f"recontext_renders/{timestamp}_{unique_id}.jpg"
-            
-            # Get bucket and create blob
-            bucket = self.storage_client.bucket(self.renders_bucket)
-            blob = bucket.blob(filename)
+            # Generate unique filename (hex nanosecond timestamp + random suffix)
+            filename = f"recontext_renders/{time.time_ns():x}_{os.urandom(4).hex()}.jpg"
             
-            # Upload image data
-            blob.upload_from_string(image_data, content_type='image/jpeg')
-            logger.info(f"✅ Uploaded Product Recontext render to GCS: gs://{self.renders_bucket}/{filename}")
+            # Tracked so drain_uploads() can still finish it if the caller is cancelled mid-upload
+            upload_task = asyncio.create_task(self._upload_render(filename, image_data))
+            self._pending_uploads.add(upload_task)
+            upload_task.add_done_callback(self._pending_uploads.discard)
             
-            # Generate signed URL (valid for 1 hour)
-            signed_url = blob.generate_signed_url(
-                expiration=datetime.utcnow() + timedelta(hours=1),
-                method='GET'
-            )
+            # Signing is local with a service-account key; otherwise it is an IAM call, so keep it off the loop
+            if self._signing_credentials:
+                signed_url = self._generate_signed_url(filename)
+            else:
+                signed_url = await asyncio.to_thread(self._generate_signed_url, filename)
             
-            return signed_url
+            await asyncio.shield(upload_task)
+            return filename, signed_url
             
         except Exception as e:
             logger.error(f"Failed to upload to GCS: {str(e)}")
             raise Exception(f"Failed to upload generated image to storage: {str(e)}")
+
+    async def _upload_render(self, blob_name: str, image_data: bytes) -> None:
+        """Upload render bytes to GCS."""
+        blob = self.storage_client.bucket(self.renders_bucket).blob(blob_name)
+        await asyncio.to_thread(blob.upload_from_string, image_data, content_type='image/jpeg')
+        logger.info(f"✅ Uploaded Product Recontext render to GCS: gs://{self.renders_bucket}/{blob_name}")
+
+    async def drain_uploads(self) -> None:
+        """Wait for in-flight uploads to finish (called on shutdown)."""
+        if self._pending_uploads:
+            logger.info("Waiting for %d pending render uploads", len(self._pending_uploads))
+            await asyncio.gather(*self._pending_uploads, return_exceptions=True)
+
+    def _render_cache_key(self, request: VisualizeProductRequest, remove_background: bool) -> str:
+        """Hash the inputs that determine a render."""
+        raw = f"{request.base_image_url}|{request.product_image_url}|{request.prompt or ''}|{remove_background}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _cache_render(self, cache_key: str, blob_name: str) -> None:
+        """Remember the blob path of a completed render, evicting the oldest entry when full."""
+        if len(self._render_cache) >= self._render_cache_size:
+            self._render_cache.pop(next(iter(self._render_cache)))
+        self._render_cache[cache_key] = blob_name
     
-    async def _infer_placement_with_gemini(self, base_image_url: str, product_image_url: str, 
+    async def _infer_placement_with_gemini(self, base_image_bytes: bytes, product_image_bytes: bytes, 
                                          context: Optional[str] = None) -> ProductPlacement:
         """Use Gemini to intelligently infer product placement for mask generation."""
         if not self.gemini_client:
             raise Exception("Gemini client not available. Please ensure Vertex AI is properly configured.")
         
         try:
-            # Create a comprehensive prompt for placement analysis
-            # Download both images to analyze dimensions
-            base_image_bytes = await self._download_image(base_image_url)
-            product_image_bytes = await self._download_image(product_image_url)
-            
             # Get image dimensions
-            from PIL import Image
             base_image = Image.open(io.BytesIO(base_image_bytes))
             product_image = Image.open(io.BytesIO(product_image_bytes))
             
             base_width, base_height = base_image.size
             product_width, product_height = product_image.size
             
-            placement_prompt = f"""
-            You are an expert in product placement and 3D spatial reasoning. Analyze these two images and determine the optimal placement for the product in the base scene.
-
-            Base scene image: {base_image_url}
-            Product image: {product_image_url}
-            Context: {context or "Product placement for realistic visualization"}
+            # Only the context and dimensions vary per request; the rest of the prompt is prebuilt
+            placement_prompt = "".join((
+                _PLACEMENT_PROMPT_PREFIX,
+                context or _DEFAULT_PLACEMENT_CONTEXT,
+                f"""
             
             IMAGE DIMENSIONS:
             - Base scene: {base_width}x{base_height} pixels
             - Product: {product_width}x{product_height} pixels
             - Product aspect ratio: {product_width/product_height:.2f}
+""",
+                _PLACEMENT_PROMPT_SUFFIX,
+            ))
 
-            Consider:
-            1. Scene depth and perspective
-            2. Available surfaces (tables, floors, counters)
-            3. Lighting consistency
-            4. Realistic scale proportions relative to base image size
-            5. Occlusion and shadows
-            6. Visual balance and composition
-
-            Return a JSON response with this exact structure:
-            {{
-                "position": {{"x": 0.0, "y": 0.0}},
-                "scale": 0.0,
-                "rotation": 0.0,
-                "reasoning": "explanation of placement choice including scale rationale",
-                "confidence": 0.0
-            }}
-
-            Where:
-            - position.x, position.y: normalized coordinates (0.0-1.0) for placement center
-            - scale: relative size (0.1-1.5) - consider the product should be realistic relative to the scene
-            - rotation: rotation angle in degrees (-180 to 180)
-            - reasoning: brief explanation of the placement logic and scale choice
-            - confidence: confidence score (0.0-1.0)
-
-            IMPORTANT: Choose scale carefully - consider how large the product should realistically appear in the scene.
-            """
+            # Send the actual pixels so Gemini can see the scene and product
+            contents = [
+                Part.from_bytes(data=base_image_bytes, mime_type=get_image_mime_type(base_image_bytes)),
+                Part.from_bytes(data=product_image_bytes, mime_type=get_image_mime_type(product_image_bytes)),
+                placement_prompt,
+            ]
 
             # Call Gemini for placement analysis
             def _call_gemini():
                 return self.gemini_client.models.generate_content(
                     model="gemini-2.5-flash",
-                    contents=placement_prompt
+                    contents=contents,
+                    config=_PLACEMENT_CONFIG
                 )
 
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(None, _call_gemini)
-            
-            # Parse the response
-            text = response.text.strip()
+            response = await self._gemini_pool.run(_call_gemini)
             
-            # Clean markdown formatting
-            if text.startswith("```json"):
-                text = text[7:]
-            elif text.startswith("```"):
-                text = text[3:]
-            if text.endswith("```"):
-                text = text[:-3]
-            text = text.strip()
-            
-            print("============== TEXT: ", text)
-            placement_data = json.loads(text)
+            # Structured output returns bare JSON, no markdown fences to strip
+            placement_data = json.loads(response.text)
             
             logger.info(f"Gemini placement reasoning: {placement_data.get('reasoning', 'N/A')}")
             logger.info(f"Gemini confidence: {placement_data.get('confidence', 0.0)}")
@@ -196,21 +379,37 @@ class ProductVisualizerRecontext:
             logger.error(f"Gemini placement inference failed: {str(e)}")
             raise Exception(f"Failed to infer placement with Gemini: {str(e)}")
 
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP/2 client, creating it on first use inside the event loop."""
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                http2=True,
+                timeout=30.0,
+                follow_redirects=True,
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=64)
+            )
+        return self._http
+
+    async def aclose(self) -> None:
+        """Finish pending uploads, stop the upstream worker pools and close the HTTP client."""
+        await self.drain_uploads()
+        await asyncio.gather(self._imagen_pool.aclose(), self._gemini_pool.aclose())
+        if self._http is not None:
+            http, self._http = self._http, None
+            await http.aclose()
+
     async def _download_image(self, image_url: str) -> bytes:
         """Download image from URL."""
         try:
-            def _download():
-                response = requests.get(image_url, timeout=30)
-                response.raise_for_status()
-                return response.content
-            
-            loop = asyncio.get_event_loop()
-            return await loop.run_in_executor(None, _download)
+            response = await self._get_http_client().get(image_url)
+            response.raise_for_status()
+            return response.content
         except Exception as e:
             logger.error(f"Failed to download image from {image_url}: {str(e)}")
             raise Exception(f"Failed to download image: {str(e)}")
 
-    async def _remove_product_background(self, product_image_url: str, prompt: Optional[str] = None) -> bytes:
+    async def _remove_product_background(self, product_image_url: str, prompt: Optional[str] = None,
+                                         product_image_bytes: Optional[bytes] = None) -> bytes:
         """Remove background from product image using Imagen 3.0 inpainting removal with automatic mask detection."""
         if not self.genai_client:
             raise Exception("GenAI client not available. Please ensure Vertex AI is properly configured.")
@@ -218,11 +417,11 @@ class ProductVisualizerRecontext:
         try:
             logger.info("Removing background from product image using Imagen 3.0 inpainting...")
             
-            # Download product image
-            product_image_bytes = await self._download_image(product_image_url)
+            # Download product image unless the caller already has it
+            if product_image_bytes is None:
+                product_image_bytes = await self._download_image(product_image_url)
             
             # Save product image to temporary file for SDK
-            import tempfile
             with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as product_temp:
                 product_temp.write(product_image_bytes)
                 product_temp_path = product_temp.name
@@ -257,8 +456,7 @@ class ProductVisualizerRecontext:
                         ),
                     )
                 
-                loop = asyncio.get_event_loop()
-                response = await loop.run_in_executor(None, _call_imagen_removal)
+                response = await self._imagen_pool.run(_call_imagen_removal)
                 
                 # Extract the processed image data
                 if not response.generated_images or len(response.generated_images) == 0:
@@ -288,23 +486,19 @@ class ProductVisualizerRecontext:
         
         try:
             # Generate unique filename for cleaned product
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            unique_id = str(uuid.uuid4())[:8]
-            filename = f"cleaned_products/{timestamp}_{unique_id}.jpg"
+            filename = f"cleaned_products/{time.time_ns():x}_{os.urandom(4).hex()}.jpg"
             
             # Get bucket and create blob
             bucket = self.storage_client.bucket(self.renders_bucket)
             blob = bucket.blob(filename)
             
-            # Upload cleaned image data
-            blob.upload_from_string(cleaned_image_bytes, content_type='image/jpeg')
-            logger.info(f"✅ Uploaded cleaned product to GCS: gs://{self.renders_bucket}/{filename}")
+            # Upload and sign in a worker thread so the blocking GCS calls don't stall the event loop
+            def _upload_and_sign():
+                blob.upload_from_string(cleaned_image_bytes, content_type='image/jpeg')
+                return self._generate_signed_url(filename)
             
-            # Generate signed URL (valid for 1 hour)
-            signed_url = blob.generate_signed_url(
-                expiration=datetime.utcnow() + timedelta(hours=1),
-                method='GET'
-            )
+            signed_url = await asyncio.to_thread(_upload_and_sign)
+            logger.info(f"✅ Uploaded cleaned product to GCS: gs://{self.renders_bucket}/{filename}")
             
             return signed_url
             
@@ -341,7 +535,6 @@ class ProductVisualizerRecontext:
         
         try:
             # Save product image to temp file for Gemini analysis
-            import tempfile
             with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as temp_file:
                 temp_file.write(product_image_bytes)
                 temp_file_path = temp_file.name
@@ -372,8 +565,7 @@ class ProductVisualizerRecontext:
                         ]
                     )
                 
-                loop = asyncio.get_event_loop()
-                response = await loop.run_in_executor(None, _analyze_product)
+                response = await self._gemini_pool.run(_analyze_product)
                 
                 description = response.text.strip()
                 logger.info(f"Generated detailed product description: {description[:100]}...")
@@ -410,7 +602,6 @@ class ProductVisualizerRecontext:
             downsample_bytes.seek(0)
             
             # Convert to base64
-            import base64
             base64_data = base64.b64encode(downsample_bytes.getvalue()).decode('utf-8')
             
             logger.info(f"Created 64x64 downsampled reference ({len(base64_data)} base64 chars)")
@@ -420,13 +611,48 @@ class ProductVisualizerRecontext:
             logger.error(f"Failed to create downsampled reference: {str(e)}")
             raise Exception(f"Failed to create downsampled product reference: {str(e)}")
 
-    async def _create_mask(self, base_image_bytes: bytes, placement: ProductPlacement, 
+    def _resize_for_imagen(self, base_image_bytes: bytes) -> tuple[bytes, tuple[int, int]]:
+        """Shrink the base image to Imagen's native edge length; returns (JPEG bytes, size)."""
+        if _turbo_jpeg and base_image_bytes.startswith(b'\xff\xd8\xff'):
+            return self._resize_jpeg_with_turbojpeg(base_image_bytes)
+        
+        base_image = Image.open(io.BytesIO(base_image_bytes))
+        if max(base_image.size) <= IMAGEN_MAX_EDGE:
+            return base_image_bytes, base_image.size
+        
+        base_image.thumbnail((IMAGEN_MAX_EDGE, IMAGEN_MAX_EDGE), Image.Resampling.LANCZOS)
+        if base_image.mode != 'RGB':
+            base_image = base_image.convert('RGB')
+        
+        resized = io.BytesIO()
+        base_image.save(resized, format='JPEG', quality=90)
+        return resized.getvalue(), base_image.size
+
+    def _resize_jpeg_with_turbojpeg(self, base_image_bytes: bytes) -> tuple[bytes, tuple[int, int]]:
+        """libjpeg-turbo variant of _resize_for_imagen for JPEG input."""
+        width, height = _turbo_jpeg.decode_header(base_image_bytes)[:2]
+        longest = max(width, height)
+        if longest <= IMAGEN_MAX_EDGE:
+            return base_image_bytes, (width, height)
+        
+        # Let the decoder do most of the downscale via DCT scaling, staying at or above the target edge
+        scaling_factor = min(
+            (factor for factor in _turbo_jpeg.scaling_factors
+             if longest * factor[0] // factor[1] >= IMAGEN_MAX_EDGE),
+            key=lambda factor: factor[0] / factor[1]
+        )
+        pixels = _turbo_jpeg.decode(base_image_bytes, pixel_format=TJPF_RGB, scaling_factor=scaling_factor)
+        
+        base_image = Image.fromarray(pixels)
+        base_image.thumbnail((IMAGEN_MAX_EDGE, IMAGEN_MAX_EDGE), Image.Resampling.LANCZOS)
+        resized = _turbo_jpeg.encode(np.asarray(base_image), quality=90, pixel_format=TJPF_RGB)
+        return resized, base_image.size
+
+    async def _create_mask(self, base_size: tuple[int, int], placement: ProductPlacement, 
                           product_image_bytes: bytes) -> bytes:
         """Create a mask for the product placement area."""
         try:
-            # Load base image to get dimensions
-            base_image = Image.open(io.BytesIO(base_image_bytes))
-            width, height = base_image.size
+            width, height = base_size
             
             # Load product image to get aspect ratio
             product_image = Image.open(io.BytesIO(product_image_bytes))
@@ -469,19 +695,21 @@ class ProductVisualizerRecontext:
             logger.error(f"Failed to create mask: {str(e)}")
             raise Exception(f"Failed to create mask: {str(e)}")
 
-    async def _generate_with_imagen_editing(self, base_image_url: str, product_image_url: str, 
-                                          placement: ProductPlacement, prompt: str) -> str:
-        """Generate product visualization using Vertex AI Imagen 3.0 Editing & Customization via Python SDK."""
+    async def _generate_with_imagen_editing(self, base_image_bytes: bytes, product_image_bytes: bytes, 
+                                          placement: ProductPlacement, prompt: str) -> tuple[str, str]:
+        """Generate product visualization using Vertex AI Imagen 3.0 Editing & Customization via Python SDK.
+
+        Returns the (blob path, signed URL) of the uploaded render.
+        """
         if not self.genai_client or not self.project_id:
             raise Exception("GenAI client not available. Please ensure Vertex AI is properly configured.")
         
         try:
-            # Download images
-            base_image_bytes = await self._download_image(base_image_url)
-            product_image_bytes = await self._download_image(product_image_url)
+            # Imagen edits at ~1024px anyway; resizing first cuts upload size and preprocessing
+            base_image_bytes, base_size = await asyncio.to_thread(self._resize_for_imagen, base_image_bytes)
             
-            # Create mask based on placement
-            mask_bytes = await self._create_mask(base_image_bytes, placement, product_image_bytes)
+            # Create mask based on placement, at the resized base dimensions
+            mask_bytes = await self._create_mask(base_size, placement, product_image_bytes)
             
             # Create comprehensive prompt for Imagen editing
             editing_prompt = f"""
@@ -496,7 +724,6 @@ Ensure the product looks naturally placed while keeping the rest of the image un
             
             # Create reference images using the Python SDK
             # First, save images to temporary files since SDK expects file paths
-            import tempfile
             
             # Save base image to temp file
             with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as base_temp:
@@ -561,8 +788,7 @@ Ensure the product looks naturally placed while keeping the rest of the image un
                         ),
                     )
                 
-                loop = asyncio.get_event_loop()
-                response = await loop.run_in_executor(None, _call_imagen)
+                response = await self._imagen_pool.run(_call_imagen)
                 
                 # Extract generated image data
                 if not response.generated_images or len(response.generated_images) == 0:
@@ -574,13 +800,12 @@ Ensure the product looks naturally placed while keeping the rest of the image un
                 logger.info(f"Generated image using {len(image_data)} bytes")
                 
                 # Upload to GCS and get signed URL
-                render_url = await self._upload_to_gcs_and_get_signed_url(image_data)
+                blob_name, render_url = await self._upload_to_gcs_and_get_signed_url(image_data)
                 logger.info(f"Generated and uploaded image with Imagen Editing: {render_url}")
-                return render_url
+                return blob_name, render_url
                 
             finally:
                 # Clean up temporary files
-                import os
                 try:
                     os.unlink(base_temp_path)
                     os.unlink(mask_temp_path)
@@ -597,37 +822,54 @@ Ensure the product looks naturally placed while keeping the rest of the image un
         try:
             start_time = time.time()
             
+            # Identical inputs reuse the stored render with a freshly signed URL
+            cache_key = self._render_cache_key(request, remove_background)
+            cached_blob = self._render_cache.get(cache_key)
+            if cached_blob and self.storage_client and self.renders_bucket:
+                render_url = await asyncio.to_thread(self._generate_signed_url, cached_blob)
+                latency_ms = int((time.time() - start_time) * 1000)
+                logger.info(f"Render cache hit for gs://{self.renders_bucket}/{cached_blob}")
+                return VisualizeProductResponse(
+                    render_url=render_url,
+                    metadata=RenderMetadata(latency_ms=latency_ms, seed=None)
+                )
+            
+            # Download both images once, in parallel; every later step reuses these bytes
+            base_image_bytes, product_image_bytes = await asyncio.gather(
+                self._download_image(request.base_image_url),
+                self._download_image(request.product_image_url),
+            )
+            
             # Step 1: Optionally remove background from product image
-            product_image_url = request.product_image_url
             if remove_background:
                 logger.info("Removing background from product image...")
                 try:
-                    cleaned_product_bytes = await self._remove_product_background(
+                    product_image_bytes = await self._remove_product_background(
                         request.product_image_url,
-                        "Remove the background, keep only the main product/object"
+                        "Remove the background, keep only the main product/object",
+                        product_image_bytes=product_image_bytes
                     )
-                    product_image_url = await self._create_cleaned_product_url(cleaned_product_bytes)
-                    logger.info(f"✅ Background removed, using cleaned product: {product_image_url}")
+                    logger.info("✅ Background removed, using cleaned product image")
                 except Exception as e:
                     logger.warning(f"Background removal failed, using original product image: {str(e)}")
-                    product_image_url = request.product_image_url
             
             # Step 2: Use Gemini to infer optimal placement for mask generation
             logger.info("Inferring optimal placement using Gemini...")
             placement = await self._infer_placement_with_gemini(
-                request.base_image_url,
-                product_image_url,  # Use cleaned product URL if available
+                base_image_bytes,
+                product_image_bytes,  # Cleaned product bytes if available
                 request.prompt
             )
             
             # Step 3: Generate the visualization using Imagen 3.0 Editing
             logger.info("Generating visualization with Vertex AI Imagen 3.0 Editing...")
-            render_url = await self._generate_with_imagen_editing(
-                request.base_image_url,
-                product_image_url,  # Use cleaned product URL if available
+            blob_name, render_url = await self._generate_with_imagen_editing(
+                base_image_bytes,
+                product_image_bytes,  # Cleaned product bytes if available
                 placement,
                 request.prompt
             )
+            self._cache_render(cache_key, blob_name)
             
             end_time = time.time()
             latency_ms = int((end_time - start_time) * 1000)
@@ -2,14 +2,22 @@ import os
 import logging
 import asyncio
 import time
-import uuid
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
-from datetime import datetime, timedelta
-import vertexai
+from datetime import timedelta
+import aiohttp
+from asyncio_throttle import Throttler
+from cachetools import TTLCache
 from vertexai.preview.vision_models import Image as VertexImage, ImageGenerationModel
-from google.cloud import storage
-from google import genai
+import google.auth
+from google.auth.transport.requests import Request as AuthRequest
+from google.oauth2 import service_account
+from google.genai.types import Part
 
+from clients import get_genai_client, get_storage_client, init_vertexai
+from image_utils import get_image_dimensions, get_image_mime_type
+from retry_policy import upstream_retry
 from models import (
     VisualizeProductRequest, VisualizeProductResponse, 
     ProductPlacement, RenderMetadata, Position
@@ -17,6 +25,17 @@ from models import (
 
 logger = logging.getLogger(__name__)
 
+# Signed URLs by blob name; TTL (50 min) stays below the 1h signing expiry so cached URLs are always valid
+_signed_url_cache = TTLCache(maxsize=10000, ttl=50 * 60)
+
+# Dedicated pool for blocking GCS upload/sign calls so they never run on the event loop
+_UPLOAD_POOL = ThreadPoolExecutor(max_workers=16, thread_name_prefix="gcs-upload")
+
+# Dedicated pool for the synchronous Imagen SDK, sized to Imagen concurrency quota
+_IMAGEN_POOL = ThreadPoolExecutor(
+    max_workers=int(os.getenv("IMAGEN_MAX_CONCURRENCY", "4")), thread_name_prefix="imagen"
+)
+
 class ProductVisualizerSimple:
     """Service for visualizing products using Vertex AI Imagen 3 direct product placement."""
     
@@ -25,25 +44,41 @@ class ProductVisualizerSimple:
         self.location = os.getenv("GOOGLE_CLOUD_REGION", "us-central1")
         self.renders_bucket = os.getenv("GCS_RENDERS_BUCKET")
         self.storage_client = None
+        self.renders_bucket_obj = None
+        self._signing_credentials = None
         self.imagen_model = None
         self.gemini_client = None
+        self._http_session: Optional[aiohttp.ClientSession] = None
+        
+        # Per-model request rate limits (requests per minute) to stay under quota instead of hitting 429s
+        self._imagen_limiter = Throttler(rate_limit=int(os.getenv("IMAGEN_RPM", "60")), period=60)
+        self._gemini_limiter = Throttler(rate_limit=int(os.getenv("GEMINI_RPM", "300")), period=60)
+        
+        # Gemini placement prompts keyed by a hash of their inputs (6h TTL)
+        self._placement_prompt_cache = TTLCache(maxsize=1024, ttl=6 * 60 * 60)
+        
+        # gs:// URIs of images already staged for Gemini, keyed by content hash
+        self._input_file_cache = TTLCache(maxsize=4096, ttl=60 * 60)
         
         # Initialize services
         if self.project_id:
             try:
                 # Initialize Vertex AI
-                vertexai.init(project=self.project_id, location=self.location)
+                init_vertexai(self.project_id, self.location)
                 
                 # Initialize Imagen model for product placement
                 self.imagen_model = ImageGenerationModel.from_pretrained("imagegeneration@006")
                 logger.info("✅ Initialized Imagen model for product placement")
                 
                 # Initialize Gemini for placement analysis
-                self.gemini_client = genai.Client(vertexai=True, project=self.project_id, location=self.location)
+                self.gemini_client = get_genai_client(self.project_id, self.location)
                 logger.info("✅ Initialized Gemini client for placement analysis")
                 
                 # Initialize GCS client for render storage
-                self.storage_client = storage.Client()
+                self.storage_client = get_storage_client(self.project_id)
+                if self.renders_bucket:
+                    self.renders_bucket_obj = self.storage_client.bucket(self.renders_bucket)
+                self._signing_credentials = google.auth.default()[0]
                 logger.info("✅ Initialized GCS client for render storage")
                 
             except Exception as e:
@@ -51,28 +86,29 @@ class ProductVisualizerSimple:
     
     async def _upload_to_gcs_and_get_signed_url(self, image_data: bytes) -> str:
         """Upload generated image to GCS renders bucket and return a signed URL."""
-        if not self.storage_client or not self.renders_bucket:
+        if not self.renders_bucket_obj:
             raise Exception("GCS storage not configured. Please ensure GCS_RENDERS_BUCKET is set.")
         
         try:
-            # Generate unique filename
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            unique_id = str(uuid.uuid4())[:8]
-            filename = f"simple_renders/{timestamp}_{unique_id}.jpg"
+            # Content-addressed filename: identical renders map to the same blob and are uploaded once
+            content_hash = hashlib.blake2b(image_data, digest_size=12).hexdigest()
+            filename = f"simple_renders/{content_hash}.jpg"
             
-            # Get bucket and create blob
-            bucket = self.storage_client.bucket(self.renders_bucket)
-            blob = bucket.blob(filename)
+            # Signed earlier in this process, so the blob is already uploaded
+            signed_url = _signed_url_cache.get(filename)
+            if signed_url:
+                return signed_url
             
-            # Upload image data
-            blob.upload_from_string(image_data, content_type='image/jpeg')
-            logger.info(f"✅ Uploaded simple render to GCS: gs://{self.renders_bucket}/{filename}")
+            def _sync_upload():
+                blob = self.renders_bucket_obj.blob(filename)
+                
+                # Upload image data unless another instance already stored the same bytes
+                if not blob.exists():
+                    blob.upload_from_string(image_data, content_type='image/jpeg')
+                return self._get_signed_url(blob)
             
-            # Generate signed URL (valid for 1 hour)
-            signed_url = blob.generate_signed_url(
-                expiration=datetime.utcnow() + timedelta(hours=1),
-                method='GET'
-            )
+            signed_url = await asyncio.get_running_loop().run_in_executor(_UPLOAD_POOL, _sync_upload)
+            logger.info("✅ Uploaded simple render to GCS: gs://%s/%s", self.renders_bucket, filename)
             
             return signed_url
             
@@ -80,22 +116,90 @@ class ProductVisualizerSimple:
             logger.error(f"Failed to upload to GCS: {str(e)}")
             raise Exception(f"Failed to upload generated image to storage: {str(e)}")
     
+    def _get_signed_url(self, blob) -> str:
+        """Return a V4 signed URL (valid for 1 hour) for a blob, reusing a recently signed one."""
+        signed_url = _signed_url_cache.get(blob.name)
+        if signed_url is None:
+            signed_url = blob.generate_signed_url(
+                version="v4",
+                expiration=timedelta(hours=1),
+                method='GET',
+                **self._signing_kwargs()
+            )
+            _signed_url_cache[blob.name] = signed_url
+        return signed_url
+    
+    def _signing_kwargs(self) -> dict:
+        """Signing arguments for V4 URLs without a per-call metadata-server lookup.
+
+        Key-file credentials sign in-process; token-only credentials (GCE/Cloud Run) pass the
+        service-account email and a cached access token so the library goes straight to IAM signBlob.
+        """
+        credentials = self._signing_credentials
+        if isinstance(credentials, service_account.Credentials):
+            return {"credentials": credentials}
+        if not getattr(credentials, "service_account_email", None):
+            return {}
+        if not credentials.valid:
+            credentials.refresh(AuthRequest())
+        return {
+            "service_account_email": credentials.service_account_email,
+            "access_token": credentials.token,
+        }
+    
+    def _get_http_session(self) -> aiohttp.ClientSession:
+        """Return the shared keep-alive HTTP session, creating it on first use inside the event loop."""
+        if self._http_session is None or self._http_session.closed:
+            self._http_session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=30),
+                connector=aiohttp.TCPConnector(limit=32)
+            )
+        return self._http_session
+    
     async def _download_image(self, image_url: str) -> bytes:
         """Download image from URL."""
-        try:
-            import requests
-            def _download():
-                response = requests.get(image_url, timeout=30)
+        @upstream_retry
+        async def _fetch():
+            async with self._get_http_session().get(image_url) as response:
                 response.raise_for_status()
-                return response.content
-            
-            loop = asyncio.get_event_loop()
-            return await loop.run_in_executor(None, _download)
+                return await response.read()
+        
+        try:
+            return await _fetch()
         except Exception as e:
             logger.error(f"Failed to download image from {image_url}: {str(e)}")
             raise Exception(f"Failed to download image: {str(e)}")
 
-    async def _create_placement_prompt(self, base_image_url: str, product_image_url: str, 
+    async def _get_or_upload_file(self, image_bytes: bytes, mime_type: str) -> str:
+        """Upload image bytes to GCS once per content hash and return the gs:// URI for Gemini."""
+        content_hash = hashlib.sha256(image_bytes).hexdigest()
+        file_uri = self._input_file_cache.get(content_hash)
+        if file_uri:
+            return file_uri
+        
+        blob_name = f"gemini_inputs/{content_hash}"
+        
+        def _sync_upload():
+            blob = self.renders_bucket_obj.blob(blob_name)
+            blob.upload_from_string(image_bytes, content_type=mime_type)
+        
+        await asyncio.get_running_loop().run_in_executor(_UPLOAD_POOL, _sync_upload)
+        file_uri = f"gs://{self.renders_bucket}/{blob_name}"
+        self._input_file_cache[content_hash] = file_uri
+        return file_uri
+    
+    async def _get_image_part(self, image_bytes: bytes) -> Part:
+        """Reference the image by a reusable GCS URI, falling back to inline bytes if storage is unavailable."""
+        mime_type = get_image_mime_type(image_bytes)
+        if self.renders_bucket_obj:
+            try:
+                file_uri = await self._get_or_upload_file(image_bytes, mime_type)
+                return Part.from_uri(file_uri=file_uri, mime_type=mime_type)
+            except Exception as e:
+                logger.warning(f"Failed to stage image in GCS, sending inline: {str(e)}")
+        return Part.from_bytes(data=image_bytes, mime_type=mime_type)
+
+    async def _create_placement_prompt(self, base_image_bytes: bytes, product_image_bytes: bytes, 
                                      context: Optional[str] = None,
                                      base_dimensions: tuple = None, product_dimensions: tuple = None) -> str:
         """Use Gemini to create an intelligent placement prompt."""
@@ -103,6 +207,15 @@ class ProductVisualizerSimple:
             logger.warning("Gemini client not available, using generic prompt")
             return "Place the product naturally in the scene with realistic lighting and shadows."
         
+        cache_hash = hashlib.sha256(base_image_bytes)
+        cache_hash.update(product_image_bytes)
+        cache_hash.update(f"|{context or ''}|{base_dimensions}|{product_dimensions}".encode("utf-8"))
+        cache_key = cache_hash.hexdigest()
+        cached_prompt = self._placement_prompt_cache.get(cache_key)
+        if cached_prompt:
+            logger.info("Using cached placement prompt")
+            return cached_prompt
+        
         try:
             # Prepare dimension information
             dimension_info = ""
@@ -123,8 +236,8 @@ class ProductVisualizerSimple:
             analysis_prompt = f"""
             You are an expert in product placement and scene composition. Analyze these images and create a detailed prompt for placing the product realistically in the base scene.
 
-            Base scene: {base_image_url}
-            Product: {product_image_url}
+            Image 1: Base scene
+            Image 2: Product
             Context: {context or "Product placement for realistic visualization"}
             {dimension_info}
 
@@ -144,34 +257,40 @@ class ProductVisualizerSimple:
             Return only the placement prompt text, no additional formatting.
             """
 
-            def _call_gemini():
-                return self.gemini_client.models.generate_content(
+            # One multimodal call with both images, so Gemini actually sees the pixels
+            base_part, product_part = await asyncio.gather(
+                self._get_image_part(base_image_bytes),
+                self._get_image_part(product_image_bytes)
+            )
+            contents = [base_part, product_part, analysis_prompt]
+
+            @upstream_retry
+            async def _call_gemini():
+                return await self.gemini_client.aio.models.generate_content(
                     model="gemini-2.5-flash",
-                    contents=analysis_prompt
+                    contents=contents
                 )
 
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(None, _call_gemini)
+            async with self._gemini_limiter:
+                response = await _call_gemini()
             
             placement_prompt = response.text.strip()
-            logger.info(f"Generated intelligent placement prompt: {placement_prompt[:100]}...")
+            logger.info("Generated intelligent placement prompt: %.100s...", placement_prompt)
+            self._placement_prompt_cache[cache_key] = placement_prompt
             return placement_prompt
             
         except Exception as e:
             logger.warning(f"Gemini prompt generation failed: {str(e)}, using fallback")
             return "Place the product naturally in the scene with realistic lighting, appropriate shadows, and proper scale to match the environment."
 
-    async def _generate_with_imagen_product_placement(self, base_image_url: str, product_image_url: str, 
+    async def _generate_with_imagen_product_placement(self, base_image_bytes: bytes, product_image_url: str, 
                                                     placement_prompt: str) -> str:
         """Generate product visualization using Imagen 3 with simple prompt-based generation."""
         if not self.imagen_model:
             raise Exception("Imagen model not available. Please ensure Vertex AI is properly configured.")
         
         try:
-            # Download base image
-            base_image_bytes = await self._download_image(base_image_url)
-            
-            # Create Vertex AI Image object for base image
+            # Create Vertex AI Image object for base image (bytes already downloaded by the caller)
             base_vertex_image = VertexImage(base_image_bytes)
             
             # Create comprehensive prompt that includes product description
@@ -190,6 +309,7 @@ class ProductVisualizerSimple:
             """
             
             # Use Imagen 3 for image generation with prompt
+            @upstream_retry
             def _call_imagen():
                 return self.imagen_model.generate_images(
                     prompt=comprehensive_prompt,
@@ -197,8 +317,9 @@ class ProductVisualizerSimple:
                     number_of_images=1
                 )
             
-            loop = asyncio.get_event_loop()
-            images = await loop.run_in_executor(None, _call_imagen)
+            # The Vertex Imagen SDK has no async variant; keep it on its own sized pool
+            async with self._imagen_limiter:
+                images = await asyncio.get_running_loop().run_in_executor(_IMAGEN_POOL, _call_imagen)
             
             # Extract generated image data
             if not images or len(images) == 0:
@@ -207,11 +328,11 @@ class ProductVisualizerSimple:
             generated_image = images[0]
             image_data = generated_image._image_bytes
             
-            logger.info(f"Generated product placement using {len(image_data)} bytes")
+            logger.info("Generated product placement using %d bytes", len(image_data))
             
             # Upload to GCS and get signed URL
             render_url = await self._upload_to_gcs_and_get_signed_url(image_data)
-            logger.info(f"Generated and uploaded image with Imagen: {render_url}")
+            logger.info("Generated and uploaded image with Imagen: %s", render_url)
             return render_url
                 
         except Exception as e:
@@ -225,26 +346,25 @@ class ProductVisualizerSimple:
             
             # Get image dimensions for better prompt generation
             logger.info("Analyzing image dimensions...")
-            base_image_bytes = await self._download_image(request.base_image_url)
-            product_image_bytes = await self._download_image(request.product_image_url)
+            base_image_bytes, product_image_bytes = await asyncio.gather(
+                self._download_image(request.base_image_url),
+                self._download_image(request.product_image_url)
+            )
             
-            from PIL import Image
-            import io
-            base_img = Image.open(io.BytesIO(base_image_bytes))
-            product_img = Image.open(io.BytesIO(product_image_bytes))
-            base_dimensions = base_img.size
-            product_dimensions = product_img.size
+            # Header-only parse; no pixel decode needed just for width/height
+            base_dimensions = get_image_dimensions(base_image_bytes)
+            product_dimensions = get_image_dimensions(product_image_bytes)
             
-            logger.info(f"Base image dimensions: {base_dimensions[0]}x{base_dimensions[1]}")
-            logger.info(f"Product image dimensions: {product_dimensions[0]}x{product_dimensions[1]}")
+            logger.info("Base image dimensions: %dx%d", *base_dimensions)
+            logger.info("Product image dimensions: %dx%d", *product_dimensions)
             
             # Generate intelligent placement prompt using Gemini
             logger.info("Creating intelligent placement prompt...")
             if request.prompt:
                 # Use user's prompt as context for Gemini analysis
                 placement_prompt = await self._create_placement_prompt(
-                    request.base_image_url,
-                    request.product_image_url,
+                    base_image_bytes,
+                    product_image_bytes,
                     request.prompt,
                     base_dimensions,
                     product_dimensions
@@ -256,7 +376,7 @@ class ProductVisualizerSimple:
             # Generate visualization using Imagen 3 product placement
             logger.info("Generating visualization with Imagen 3 product placement...")
             render_url = await self._generate_with_imagen_product_placement(
-                request.base_image_url,
+                base_image_bytes,
                 request.product_image_url,
                 placement_prompt
             )
@@ -269,7 +389,7 @@ class ProductVisualizerSimple:
                 seed=None
             )
             
-            logger.info(f"Imagen 3 product placement completed in {latency_ms}ms")
+            logger.info("Imagen 3 product placement completed in %dms", latency_ms)
             
             return VisualizeProductResponse(
                 render_url=render_url,
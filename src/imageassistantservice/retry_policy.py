@@ -0,0 +1,73 @@
+import asyncio
+import logging
+from typing import Optional
+
+import aiohttp
+from google.api_core import exceptions as api_exceptions
+from google.genai import errors as genai_errors
+from tenacity import (
+    before_sleep_log,
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 5
+MAX_BACKOFF_SECONDS = 30
+
+_RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+_backoff = wait_exponential_jitter(initial=1, max=MAX_BACKOFF_SECONDS)
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    """HTTP status carried by a GenAI or aiohttp error, if any."""
+    if isinstance(exc, genai_errors.APIError):
+        return exc.code
+    if isinstance(exc, aiohttp.ClientResponseError):
+        return exc.status
+    return None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Transient upstream failures: quota, unavailability, timeouts and dropped connections."""
+    if isinstance(exc, (api_exceptions.ResourceExhausted,
+                        api_exceptions.ServiceUnavailable,
+                        api_exceptions.DeadlineExceeded,
+                        aiohttp.ClientConnectionError,
+                        asyncio.TimeoutError)):
+        return True
+    return _status_code(exc) in _RETRYABLE_STATUS_CODES
+
+
+def _retry_after_seconds(exc: BaseException) -> Optional[float]:
+    """Parse a numeric Retry-After header from the failed response, if the server sent one."""
+    headers = getattr(exc, "headers", None) or getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    value = headers.get("Retry-After")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _wait_retry_after_or_backoff(retry_state) -> float:
+    """Honor the server's Retry-After when present, otherwise exponential backoff with jitter."""
+    delay = _retry_after_seconds(retry_state.outcome.exception())
+    if delay is not None:
+        return min(delay, MAX_BACKOFF_SECONDS)
+    return _backoff(retry_state)
+
+
+# Decorator for sync or async upstream calls (Gemini, Imagen, image downloads)
+upstream_retry = retry(
+    stop=stop_after_attempt(MAX_ATTEMPTS),
+    wait=_wait_retry_after_or_backoff,
+    retry=retry_if_exception(is_retryable),
+    before_sleep=before_sleep_log(logger, logging.WARNING),
+    reraise=True,
+)
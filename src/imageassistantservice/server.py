@@ -4,7 +4,11 @@ import os
 import sys
 import logging
 import asyncio
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, urlunsplit, parse_qsl
 
+from cachetools import TTLCache
 from dotenv import load_dotenv
 import grpc
 
@@ -28,6 +32,59 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Serialized successful responses keyed by request fingerprint. Visualize entries carry a
+# 1h signed render URL, so they expire (50 min) before the URL does.
+_analyze_cache = TTLCache(maxsize=50_000, ttl=60 * 60)
+_visualize_cache = TTLCache(maxsize=10_000, ttl=50 * 60)
+
+# Query parameters of GCS/S3/CloudFront signed URLs; they change per signing, not per object
+_SIGNATURE_PARAMS = {
+    "x-goog-algorithm", "x-goog-credential", "x-goog-date", "x-goog-expires",
+    "x-goog-signedheaders", "x-goog-signature", "googleaccessid", "expires", "signature",
+    "x-amz-algorithm", "x-amz-credential", "x-amz-date", "x-amz-expires",
+    "x-amz-signedheaders", "x-amz-signature", "x-amz-security-token", "key-pair-id", "policy",
+}
+
+def _cache_url(url: str) -> str:
+    """Drop signing query parameters so re-signed URLs for the same object share a cache key."""
+    parts = urlsplit(url)
+    if not parts.query:
+        return url
+    query = "&".join(
+        f"{k}={v}" for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in _SIGNATURE_PARAMS
+    )
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, query, ""))
+
+def _request_key(*fields: str) -> bytes:
+    """Compact 128-bit fingerprint of the request fields."""
+    return hashlib.blake2b("|".join(fields).encode("utf-8"), digest_size=16).digest()
+
+class ConcurrencyLimiter(grpc.aio.ServerInterceptor):
+    """Cap the number of in-flight unary RPCs; extra calls wait for a free slot."""
+    
+    def __init__(self, max_concurrent: int):
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+    
+    async def intercept_service(self, continuation, handler_call_details):
+        handler = await continuation(handler_call_details)
+        # Health checks must stay responsive under load
+        if (handler is None or handler.unary_unary is None
+                or handler_call_details.method.endswith("/Check")):
+            return handler
+        
+        behavior = handler.unary_unary
+        
+        async def limited(request, context):
+            async with self._semaphore:
+                return await behavior(request, context)
+        
+        return grpc.unary_unary_rpc_method_handler(
+            limited,
+            request_deserializer=handler.request_deserializer,
+            response_serializer=handler.response_serializer
+        )
+
 class ImageAssistantServicer(imageassistant_pb2_grpc.ImageAssistantServiceServicer):
     """gRPC servicer for image assistant operations."""
     
@@ -41,28 +98,13 @@ class ImageAssistantServicer(imageassistant_pb2_grpc.ImageAssistantServiceServic
             context.set_code(code)
             context.set_details(details)
     
-    def _convert_to_proto_objects(self, objects):
-        """Convert Pydantic objects to protobuf objects."""
-        proto_objects = []
-        for obj in objects:
-            proto_box = imageassistant_pb2.BoundingBox(
-                x=obj.box.x,
-                y=obj.box.y,
-                w=obj.box.w,
-                h=obj.box.h
-            )
-            proto_obj = imageassistant_pb2.DetectedObject(
-                label=obj.label,
-                confidence=obj.confidence,
-                box=proto_box
-            )
-            proto_objects.append(proto_obj)
-        return proto_objects
-    
-
-    
     async def AnalyzeImage(self, request, context):
         """Analyze image for objects, scene type, styles, colors."""
+        cache_key = _request_key(_cache_url(request.image_url), request.context)
+        cached = _analyze_cache.get(cache_key)
+        if cached is not None:
+            return imageassistant_pb2.AnalyzeImageResponse.FromString(cached)
+        
         try:
             # Convert protobuf request to Pydantic model
             analyze_request = AnalyzeImageRequest(
@@ -73,18 +115,26 @@ class ImageAssistantServicer(imageassistant_pb2_grpc.ImageAssistantServiceServic
             # Analyze image
             result = await self.image_analyzer.analyze_image(analyze_request)
             
-            # Convert to protobuf response
-            proto_objects = self._convert_to_proto_objects(result.objects)
-            
-            return imageassistant_pb2.AnalyzeImageResponse(
-                objects=proto_objects,
+            # Build the protobuf response in place (no intermediate message list to copy)
+            response = imageassistant_pb2.AnalyzeImageResponse(
                 scene_type=result.scene_type or "",
-                styles=result.styles or [],
-                colors=result.colors or [],
-                tags=result.tags or [],
                 success=True,
                 message="Image analyzed successfully"
             )
+            response.styles.extend(result.styles or [])
+            response.colors.extend(result.colors or [])
+            response.tags.extend(result.tags or [])
+            for obj in result.objects:
+                proto_obj = response.objects.add()
+                proto_obj.label = obj.label
+                proto_obj.confidence = obj.confidence
+                proto_obj.box.x = obj.box.x
+                proto_obj.box.y = obj.box.y
+                proto_obj.box.w = obj.box.w
+                proto_obj.box.h = obj.box.h
+            
+            _analyze_cache[cache_key] = response.SerializeToString()
+            return response
             
         except Exception as e:
             logger.error(f"Error analyzing image: {str(e)}")
@@ -96,6 +146,13 @@ class ImageAssistantServicer(imageassistant_pb2_grpc.ImageAssistantServiceServic
     
     async def VisualizeProduct(self, request, context):
         """Visualize product in user photo using Gemini 2.5 Flash Image Preview."""
+        cache_key = _request_key(
+            _cache_url(request.base_image_url), _cache_url(request.product_image_url), request.prompt
+        )
+        cached = _visualize_cache.get(cache_key)
+        if cached is not None:
+            return imageassistant_pb2.VisualizeProductResponse.FromString(cached)
+        
         try:
             # Convert protobuf request to Pydantic model
             visualize_request = VisualizeProductRequest(
@@ -108,17 +165,19 @@ class ImageAssistantServicer(imageassistant_pb2_grpc.ImageAssistantServiceServic
             result = await self.product_visualizer.visualize_product(visualize_request)
             
             # Convert to protobuf response
-                proto_metadata = imageassistant_pb2.RenderMetadata(
+            proto_metadata = imageassistant_pb2.RenderMetadata(
                 latency_ms=result.metadata.latency_ms,
                 seed=result.metadata.seed or ""
-                )
+            )
             
-            return imageassistant_pb2.VisualizeProductResponse(
+            response = imageassistant_pb2.VisualizeProductResponse(
                 render_url=result.render_url,
                 metadata=proto_metadata,
                 success=True,
                 message="Product visualization completed successfully"
             )
+            _visualize_cache[cache_key] = response.SerializeToString()
+            return response
             
         except Exception as e:
             logger.error(f"Error visualizing product: {str(e)}")
@@ -136,8 +195,25 @@ class ImageAssistantServicer(imageassistant_pb2_grpc.ImageAssistantServiceServic
 
 def create_grpc_server():
     """Create and configure gRPC server."""
-    # Create server with thread pool
-    server = grpc.aio.server()
+    # Create server, bounding in-flight RPCs so upstream fan-out stays within quota
+    max_inflight = int(os.getenv("MAX_INFLIGHT", "32"))
+    server = grpc.aio.server(
+        migration_thread_pool=ThreadPoolExecutor(max_workers=64),
+        interceptors=[ConcurrencyLimiter(max_concurrent=max_inflight)],
+        options=[
+            # Image payloads can exceed the 4MB default
+            ("grpc.max_send_message_length", 32 * 1024 * 1024),
+            ("grpc.max_receive_message_length", 32 * 1024 * 1024),
+            # Keep idle client connections alive instead of re-handshaking under bursty load
+            ("grpc.keepalive_time_ms", 30000),
+            ("grpc.keepalive_timeout_ms", 10000),
+            ("grpc.http2.max_pings_without_data", 0),
+            ("grpc.keepalive_permit_without_calls", 1),
+            # Accept the clients' keepalive pings on idle connections instead of answering GOAWAY too_many_pings
+            ("grpc.http2.min_ping_interval_without_data_ms", 20000),
+            ("grpc.so_reuseport", 1),
+        ]
+    )
     
     # Add servicer
     image_servicer = ImageAssistantServicer()
@@ -151,16 +227,16 @@ def create_grpc_server():
     
     # Configure server address
     port = os.getenv("PORT", "8080")
-    listen_addr = f"0.0.0.0:{port}"
+    listen_addr = f"[::]:{port}"  # dual-stack: accepts IPv4 and IPv6
     server.add_insecure_port(listen_addr)
     
     logger.info(f"🚀 Starting Image Assistant Service gRPC server on {listen_addr}")
     
-    return server
+    return server, image_servicer
 
 async def serve():
     """Start the gRPC server."""
-    server = create_grpc_server()
+    server, image_servicer = create_grpc_server()
     
     # Start server
     await server.start()
@@ -173,6 +249,8 @@ async def serve():
         pass
     finally:
         await server.stop(grace=5)  # Await this to ensure shutdown is clean
+        # Finish uploads of renders whose requests were cancelled mid-upload, and close the HTTP session
+        await image_servicer.product_visualizer.aclose()
 
 if __name__ == "__main__":
     try:
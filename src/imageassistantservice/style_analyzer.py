@@ -1,11 +1,78 @@
-import os, json, asyncio, logging
-from typing import List, Optional, Dict, Any
-from google import genai
-from google.genai.types import HttpOptions
-import vertexai
+import os, json, logging, hashlib
+from typing import List, Optional, Dict, Any, Literal
+import ahocorasick
+from cachetools import TTLCache
+from google.genai.types import GenerateContentConfig, HttpOptions
+from pydantic import BaseModel
+
+from clients import get_genai_client, init_vertexai
 
 logger = logging.getLogger(__name__)
 
+ALLOWED_STYLES = ("modern", "minimalist", "scandinavian", "boho", "industrial", "vintage")
+ALLOWED_SCENES = ("indoor", "outdoor", "portrait", "product", "general")
+
+
+class StyleResult(BaseModel):
+    """Structured Gemini response for style/scene analysis."""
+    scene_type: Literal[ALLOWED_SCENES]
+    styles: List[Literal[ALLOWED_STYLES]]
+    tags: List[str]
+    confidence: float
+
+
+# Keyword tables for the fallback analysis, in priority order
+SCENE_KEYWORDS = {
+    "indoor": ["room", "furniture", "kitchen", "bedroom", "office", "restaurant", "interior"],
+    "outdoor": ["sky", "tree", "building", "street", "park", "nature", "landscape", "outdoor"],
+    "portrait": ["person", "face", "human", "people", "portrait"],
+    "product": ["product", "item", "object", "merchandise", "bottle", "package"],
+    "food": ["food", "meal", "dish", "restaurant", "kitchen", "eating"],
+    "vehicle": ["car", "truck", "vehicle", "transportation", "road"],
+    "animal": ["animal", "pet", "dog", "cat", "wildlife", "bird"]
+}
+
+STYLE_KEYWORDS = {
+    "modern": ["modern", "contemporary", "sleek", "clean"],
+    "vintage": ["vintage", "retro", "classic", "antique", "old"],
+    "artistic": ["art", "painting", "drawing", "artistic", "creative"],
+    "professional": ["professional", "business", "corporate", "formal"],
+    "casual": ["casual", "informal", "relaxed", "everyday"],
+    "natural": ["natural", "organic", "nature", "wood", "stone"]
+}
+
+
+def _build_automaton(keyword_table: Dict[str, List[str]]) -> ahocorasick.Automaton:
+    """Compile a category -> keywords table into one automaton; each keyword maps to its categories."""
+    categories_by_keyword: Dict[str, set] = {}
+    for category, keywords in keyword_table.items():
+        for keyword in keywords:
+            categories_by_keyword.setdefault(keyword, set()).add(category)
+    automaton = ahocorasick.Automaton()
+    for keyword, categories in categories_by_keyword.items():
+        automaton.add_word(keyword, frozenset(categories))
+    automaton.make_automaton()
+    return automaton
+
+
+def _match_categories(automaton: ahocorasick.Automaton, text: str) -> set:
+    """Categories with at least one keyword occurring in text, found in a single pass."""
+    matched = set()
+    for _, categories in automaton.iter(text):
+        matched |= categories
+    return matched
+
+
+_SCENE_AUTOMATON = _build_automaton(SCENE_KEYWORDS)
+_STYLE_AUTOMATON = _build_automaton(STYLE_KEYWORDS)
+
+
+# Constrained decoding: Gemini returns bare JSON matching StyleResult, parsed by the SDK
+_STYLE_CONFIG = GenerateContentConfig(
+    response_mime_type="application/json",
+    response_schema=StyleResult,
+)
+
 class StyleAnalyzer:
     """LLM-backed style/scene resolver using Google GenAI SDK (Gemini)."""
 
@@ -13,11 +80,12 @@ class StyleAnalyzer:
         # Reads GEMINI_API_KEY from env by default
         self.project_id = os.getenv("GOOGLE_CLOUD_PROJECT")
         self.location = os.getenv("GOOGLE_CLOUD_REGION", "us-central1")
+        # Gemini analyses keyed by a hash of the request payload (6h TTL)
+        self._cache = TTLCache(maxsize=1024, ttl=6 * 60 * 60)
         
         try:
-            vertexai.init(project=self.project_id, location=self.location)
-            client = genai.Client(vertexai=True, project=self.project_id, location=self.location)
-            self.client = client
+            init_vertexai(self.project_id, self.location)
+            self.client = get_genai_client(self.project_id, self.location)
             logger.info("✅ Initialized Google GenAI client for style analysis")
         except Exception as e:
             self.client = None
@@ -38,51 +106,45 @@ class StyleAnalyzer:
         payload = {
             "labels": labels[:20],
             "colors": colors[:5],
-            "context": context or "",
-            "allowed_styles": ["modern","minimalist","scandinavian","boho","industrial","vintage"],
-            "allowed_scenes": ["indoor","outdoor","portrait","product","general"]
+            "context": context or ""
         }
 
-        # Ask Gemini for structured JSON
-        def _call():
-            # Combine system and user messages into a single prompt
+        # Identical signals map to the same analysis; skip the Gemini round trip on a hit
+        cache_key = hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+        cached = self._cache.get(cache_key)
+        if cached:
+            return dict(cached)
+
+        # Ask Gemini for structured JSON (native async client, no executor thread)
+        async def _call():
+            # The response schema carries the allowed values, so the prompt stays short
             prompt = (
                 "You map noisy vision signals to a fixed style taxonomy. "
-                "Return strict JSON with keys: scene_type, styles, tags, confidence (0..1). "
-                "Only use values from allowed lists when applicable.\n\n"
+                "Set confidence between 0 and 1.\n\n"
                 f"Data: {json.dumps(payload)}"
             )
-            return self.client.models.generate_content(
+            return await self.client.aio.models.generate_content(
                 model="gemini-2.5-flash",
-                contents=prompt
+                contents=prompt,
+                config=_STYLE_CONFIG
             )
 
         try:
-            loop = asyncio.get_event_loop()
-            resp = await loop.run_in_executor(None, _call)
-            print("=========== resp ===========", resp)
-            # New SDK returns Pydantic objects; .text will be JSON string here
-            text = getattr(resp, "text", None) or getattr(resp, "candidates", [{}])[0].content.parts[0].text
-            print("=========== text ===========", text)
-            # Clean the response - remove markdown code blocks
-            cleaned_text = text.strip()
-            if cleaned_text.startswith("```json"):
-                cleaned_text = cleaned_text[7:]  # Remove ```json
-            elif cleaned_text.startswith("```"):
-                cleaned_text = cleaned_text[3:]   # Remove ```
-            if cleaned_text.endswith("```"):
-                cleaned_text = cleaned_text[:-3]  # Remove closing ```
-            cleaned_text = cleaned_text.strip()
-
-            data = json.loads(cleaned_text)
-            logger.info("STYLE ANALYSIS DATA FROM GEMINI: ", data)
-            # Basic validation / defaults
-            return {
-                "scene_type": data.get("scene_type", "general"),
-                "styles": data.get("styles", [])[:5],
-                "tags": data.get("tags", [])[:8],
-                "confidence": float(data.get("confidence", 0.7))
+            resp = await _call()
+            # SDK validates the JSON against StyleResult; no fence stripping or json.loads
+            data: StyleResult = resp.parsed
+            if data is None:
+                raise ValueError("Gemini returned no parseable style result")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Style analysis data from Gemini: %s", data.model_dump_json())
+            result = {
+                "scene_type": data.scene_type,
+                "styles": list(data.styles)[:5],
+                "tags": data.tags[:8],
+                "confidence": data.confidence
             }
+            self._cache[cache_key] = result
+            return dict(result)
         except Exception as e:
             logger.error(f"Gemini style analysis failed: {e}")
             return self._fallback_analysis(labels, colors)
@@ -111,39 +173,17 @@ class StyleAnalyzer:
     
     def _detect_scene_type_basic(self, labels: List[str]) -> str:
         """Basic scene type detection using keyword matching."""
-        scene_keywords = {
-            "indoor": ["room", "furniture", "kitchen", "bedroom", "office", "restaurant", "interior"],
-            "outdoor": ["sky", "tree", "building", "street", "park", "nature", "landscape", "outdoor"],
-            "portrait": ["person", "face", "human", "people", "portrait"],
-            "product": ["product", "item", "object", "merchandise", "bottle", "package"],
-            "food": ["food", "meal", "dish", "restaurant", "kitchen", "eating"],
-            "vehicle": ["car", "truck", "vehicle", "transportation", "road"],
-            "animal": ["animal", "pet", "dog", "cat", "wildlife", "bird"]
-        }
-        
-        label_text = " ".join(labels).lower()
-        for scene_type, keywords in scene_keywords.items():
-            if any(keyword in label_text for keyword in keywords):
+        matched = _match_categories(_SCENE_AUTOMATON, " ".join(labels).lower())
+        for scene_type in SCENE_KEYWORDS:
+            if scene_type in matched:
                 return scene_type
         
         return "general"
     
     def _detect_styles_basic(self, labels: List[str]) -> List[str]:
         """Basic style detection using keyword matching."""
-        style_keywords = {
-            "modern": ["modern", "contemporary", "sleek", "clean"],
-            "vintage": ["vintage", "retro", "classic", "antique", "old"],
-            "artistic": ["art", "painting", "drawing", "artistic", "creative"],
-            "professional": ["professional", "business", "corporate", "formal"],
-            "casual": ["casual", "informal", "relaxed", "everyday"],
-            "natural": ["natural", "organic", "nature", "wood", "stone"]
-        }
-        
-        styles = []
-        label_text = " ".join(labels).lower()
-        for style, keywords in style_keywords.items():
-            if any(keyword in label_text for keyword in keywords):
-                styles.append(style)
+        matched = _match_categories(_STYLE_AUTOMATON, " ".join(labels).lower())
+        styles = [style for style in STYLE_KEYWORDS if style in matched]
         
         return styles[:3]  # Limit to top 3 styles
     
@@ -152,20 +192,26 @@ class StyleAnalyzer:
         if not colors:
             return "neutral"
         
-        # Convert hex colors to RGB for analysis
-        color_moods = {
-            "bright": ["#ffff", "#ff0", "#00ff", "#0ff"],  # Bright colors
-            "warm": ["#ff", "#f0", "#ff8", "#ffa"],       # Warm tones
-            "cool": ["#00f", "#0ff", "#008", "#88f"],     # Cool tones
-            "dark": ["#000", "#333", "#666", "#444"],     # Dark colors
-            "peaceful": ["#8f8", "#88f", "#f8f", "#ccc"]  # Soft colors
-        }
-        
-        # Simple heuristic based on first dominant color
-        primary_color = colors[0].lower() if colors else "#ffffff"
+        # Simple heuristic based on first dominant color, compared as integer RGB channels
+        hex_digits = colors[0].strip().lstrip("#")
+        if len(hex_digits) == 3:
+            hex_digits = "".join(digit * 2 for digit in hex_digits)  # expand #abc shorthand
+        try:
+            rgb = int(hex_digits[:6], 16)
+        except ValueError:
+            return "neutral"
+        r, g, b = (rgb >> 16) & 0xFF, (rgb >> 8) & 0xFF, rgb & 0xFF
+        total = r + g + b
         
-        for mood, color_patterns in color_moods.items():
-            if any(pattern in primary_color for pattern in color_patterns):
-                return mood
+        if total < 192:
+            return "dark"
+        if total > 600:
+            return "bright"
+        if r > max(g, b):
+            return "warm"
+        if b > max(r, g):
+            return "cool"
+        if min(r, g, b) >= 128:
+            return "peaceful"  # light, unsaturated tones
         
         return "neutral" 
\ No newline at end of file
@@ -6,118 +6,143 @@ Run this to test the new Gemini multimodal approach for realistic product placem
 """
 
 import os
-import sys
+import types
 import asyncio
+import functools
+
+import aiohttp
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-# Add current directory to path
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# Snapshot the variables these tests read, once per process
+REQUIRED = ("GOOGLE_CLOUD_PROJECT", "GOOGLE_CLOUD_REGION", "GCS_RENDERS_BUCKET", "GOOGLE_APPLICATION_CREDENTIALS")
+ENV = types.MappingProxyType({var: os.environ.get(var) for var in REQUIRED})
 
 from product_visualizer_gemini import ProductVisualizerGemini
 from models import VisualizeProductRequest
+from _test_common import POSTER, ROOM_SCENE, TEST_CASES, TEST_IMAGE_URLS, OutputBuffer, creds_ok, install_uvloop
+from image_prefetch import stage_test_images, staged
+from context_cache import ensure_cached_base
+
+@functools.cache
+def _gemini(session: aiohttp.ClientSession) -> ProductVisualizerGemini:
+    """Visualizer shared by every test; it holds no per-request state, so concurrent cases can use it."""
+    return ProductVisualizerGemini(session)
 
-async def test_gemini_product_visualization():
+async def run_gemini_product_visualization(session):
     """Test product visualization using Gemini 2.5 Flash Image Preview."""
-    print("🎨 Testing Gemini 2.5 Flash Image Preview for Product Placement...")
+    with OutputBuffer() as out:
+        out.p("🎨 Testing Gemini 2.5 Flash Image Preview for Product Placement...")
     
-    visualizer = ProductVisualizerGemini()
+        visualizer = _gemini(session)
     
-    # Test with sample images (using publicly available images)
-    base_image_url = "https://i.pinimg.com/736x/cb/f5/49/cbf549e2dc77cef0c4e9905323744e8a.jpg"  # Room scene
-    product_image_url = "https://postersbase.com/cdn/shop/files/1_ad98f783-e827-49e8-bd31-c46e82bddc80.png?v=1715679997&width=1080"  # Poster
+        # Test with sample images (using publicly available images)
+        base_image_url = ROOM_SCENE
+        product_image_url = POSTER
     
-    request = VisualizeProductRequest(
-        base_image_url=base_image_url,
-        product_image_url=product_image_url,
-        prompt="How would this poster look on the wall in this room?"
-    )
+        request = VisualizeProductRequest(
+            base_image_url=staged(base_image_url),
+            product_image_url=staged(product_image_url),
+            prompt="How would this poster look on the wall in this room?",
+            cached_content_name=await ensure_cached_base(base_image_url)
+        )
     
-    try:
-        print("   🧠 Using Gemini 2.5 Flash Image Preview with multimodal generation...")
-        print(f"   📸 Base scene: {base_image_url}")
-        print(f"   🖼️ Product: {product_image_url}")
+        try:
+            out.p("   🧠 Using Gemini 2.5 Flash Image Preview with multimodal generation...")
+            out.p(f"   📸 Base scene: {base_image_url}")
+            out.p(f"   🖼️ Product: {product_image_url}")
         
-        result = await visualizer.visualize_product(request)
+            result = await visualizer.visualize_product(request)
         
-        print("✅ Gemini Product Visualization successful!")
-        print(f"   Render URL: {result.render_url}")
-        print(f"   Processing time: {result.metadata.latency_ms}ms")
-        print(f"   Seed: {result.metadata.seed}")
+            out.p("✅ Gemini Product Visualization successful!")
+            out.p(f"   Render URL: {result.render_url}")
+            out.p(f"   Processing time: {result.metadata.latency_ms}ms")
+            out.p(f"   Seed: {result.metadata.seed}")
         
-    except Exception as e:
-        print(f"❌ Gemini Product Visualization failed: {str(e)}")
-        raise e
+        except Exception as e:
+            out.p(f"❌ Gemini Product Visualization failed: {str(e)}")
+            raise e
+
+async def _run_case(visualizer, test_case):
+    """Run one visualization case; returns (name, latency_ms, render_url)."""
+    request = VisualizeProductRequest(
+        base_image_url=staged(test_case["base"]),
+        product_image_url=staged(test_case["product"]),
+        prompt=test_case["prompt"],
+        cached_content_name=await ensure_cached_base(test_case["base"])
+    )
+    result = await visualizer.visualize_product(request)
+    return test_case["name"], result.metadata.latency_ms, result.render_url
 
-async def test_different_product_types():
+async def run_different_product_types(session):
     """Test with different product types to verify versatility."""
-    print("\n🔄 Testing Different Product Types...")
+    with OutputBuffer() as out:
+        out.p("\n🔄 Testing Different Product Types...")
     
-    visualizer = ProductVisualizerGemini()
+        visualizer = _gemini(session)
     
-    test_cases = [
-        {
-            "name": "Table Decor",
-            "base": "https://decorcabinets.com/wp-content/uploads/2024/11/37-Entry-Pic-2.jpg",
-            "product": "https://static.athome.com/images/w_1200,h_1200,c_pad,f_auto,fl_lossy,q_auto/v1746793260/p/124379171_E1/providence-blue-white-floral-porcelain-vase-12.jpg",  # Vase
-            "prompt": "Place this decorative vase on the table"
-        }
-    ]
+        # Table decor: the vase-on-entry-table case
+        test_cases = TEST_CASES[:1]
     
-    for i, test_case in enumerate(test_cases):
-        try:
-            print(f"   🧪 Test {i+1}: {test_case['name']}")
-            
-            request = VisualizeProductRequest(
-                base_image_url=test_case["base"],
-                product_image_url=test_case["product"],
-                prompt=test_case["prompt"]
-            )
-            
-            result = await visualizer.visualize_product(request)
-            print("result.render_url", result.render_url)
-            print(f"   ✅ {test_case['name']}: Success ({result.metadata.latency_ms}ms)")
-            
-        except Exception as e:
-            print(f"   ❌ {test_case['name']}: Failed - {str(e)}")
+        # Cases are independent, so run them concurrently on the shared visualizer
+        results = await asyncio.gather(
+            *(_run_case(visualizer, test_case) for test_case in test_cases), return_exceptions=True
+        )
+    
+        # Report in case order once all concurrent cases are done
+        for test_case, result in zip(test_cases, results):
+            out.p(f"   🧪 Test: {test_case['name']}")
+            if isinstance(result, Exception):
+                out.p(f"   ❌ {test_case['name']}: Failed - {str(result)}")
+            else:
+                name, latency_ms, render_url = result
+                out.p("result.render_url", render_url)
+                out.p(f"   ✅ {name}: Success ({latency_ms}ms)")
+
+@functools.lru_cache(maxsize=1)
+def _env_summary() -> str:
+    """Environment check report, formatted once per process."""
+    lines = ["⚙️  Testing Environment Configuration..."]
+    for var in ("GOOGLE_CLOUD_PROJECT", "GOOGLE_CLOUD_REGION", "GCS_RENDERS_BUCKET"):
+        value = ENV[var]
+        lines.append(f"   ✅ {var}: {value}" if value else f"   ❌ {var}: Not set")
+    
+    # Check for service account key
+    key_ok, _ = creds_ok()
+    if key_ok:
+        lines.append("   ✅ Service account key file exists")
+    else:
+        lines.append("   ❌ Service account key file not found or GOOGLE_APPLICATION_CREDENTIALS not set")
+    return "\n".join(lines)
 
 async def main():
     """Main test function."""
     print("🚀 Gemini 2.5 Flash Image Preview Product Visualizer Test")
     print("=" * 80)
     
-    # Environment check
-    print("⚙️  Testing Environment Configuration...")
-    required_vars = ["GOOGLE_CLOUD_PROJECT", "GOOGLE_CLOUD_REGION", "GCS_RENDERS_BUCKET"]
-    
-    for var in required_vars:
-        value = os.getenv(var)
-        if value:
-            if var == "GOOGLE_APPLICATION_CREDENTIALS":
-                print(f"   ✅ {var}: ***masked***")
-            else:
-                print(f"   ✅ {var}: {value}")
-        else:
-            print(f"   ❌ {var}: Not set")
-    
-    # Check for service account key
-    creds_path = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
-    if creds_path and os.path.exists(creds_path):
-        print("   ✅ Service account key file exists")
-    else:
-        print("   ❌ Service account key file not found or GOOGLE_APPLICATION_CREDENTIALS not set")
+    # Environment check; set SKIP_ENV_CHECK=1 to skip it in rerun loops
+    if not os.environ.get("SKIP_ENV_CHECK"):
+        print(_env_summary())
     
     print()
     print("=" * 80)
     
     try:
-        # Test main functionality
-        await test_gemini_product_visualization()
+        # Download the test images once and serve them from GCS for every request
+        await stage_test_images(TEST_IMAGE_URLS)
         
-        # Test different product types
-        await test_different_product_types()
+        # One connection pool for every image download across the test cases
+        async with aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=30),
+            connector=aiohttp.TCPConnector(limit=20, ttl_dns_cache=300, keepalive_timeout=60)
+        ) as session:
+            # Test main functionality
+            await run_gemini_product_visualization(session)
+            
+            # Test different product types
+            await run_different_product_types(session)
         
         print()
         print("=" * 80)
@@ -138,4 +163,5 @@ async def main():
         print("⚠️  Gemini test failed. Check error messages above.")
 
 if __name__ == "__main__":
+    install_uvloop()
     asyncio.run(main()) 
\ No newline at end of file
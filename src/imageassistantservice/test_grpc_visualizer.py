@@ -6,195 +6,183 @@ Tests the VisualizeProduct gRPC endpoint with decorative vase placement.
 """
 
 import os
-import sys
+import types
 import asyncio
-import grpc
+import functools
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-# Add current directory to path
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# Snapshot the variables these tests read, once per process
+REQUIRED = ("GOOGLE_CLOUD_PROJECT", "GOOGLE_CLOUD_REGION", "GCS_RENDERS_BUCKET", "GOOGLE_APPLICATION_CREDENTIALS")
+ENV = types.MappingProxyType({var: os.environ.get(var) for var in REQUIRED})
 
-from genproto import imageassistant_pb2, imageassistant_pb2_grpc
+from genproto import imageassistant_pb2
+from channel_pool import ChannelPool
+from _test_common import HEALTH_REQUEST, TEST_CASES, TEST_IMAGE_URLS, OutputBuffer, creds_ok, install_uvloop
+from image_prefetch import stage_test_images, staged
 
-async def test_grpc_product_visualization():
+@functools.lru_cache(maxsize=1)
+def _visualize_requests():
+    """(name, request) per test case, built once after main() has staged the images."""
+    return tuple(
+        (tc["name"], imageassistant_pb2.VisualizeProductRequest(
+            base_image_url=staged(tc["base"]),
+            product_image_url=staged(tc["product"]),
+            prompt=tc["prompt"]
+        ))
+        for tc in TEST_CASES
+    )
+
+async def run_grpc_product_visualization(pool):
     """Test product visualization using gRPC service."""
-    print("🎨 Testing gRPC Product Visualization Service...")
+    with OutputBuffer() as out:
+        out.p("🎨 Testing gRPC Product Visualization Service...")
     
-    # Test data - decorative vase placement
-    base_image_url = "https://decorcabinets.com/wp-content/uploads/2024/11/37-Entry-Pic-2.jpg"
-    product_image_url = "https://static.athome.com/images/w_1200,h_1200,c_pad,f_auto,fl_lossy,q_auto/v1746793260/p/124379171_E1/providence-blue-white-floral-porcelain-vase-12.jpg"
-    prompt = "Place this decorative vase on the table"
+        # Test data - decorative vase placement
+        case = TEST_CASES[0]
+        base_image_url = case["base"]
+        product_image_url = case["product"]
+        prompt = case["prompt"]
     
-    try:
-        # Connect to gRPC server
-        channel = grpc.aio.insecure_channel('localhost:8080')
-        stub = imageassistant_pb2_grpc.ImageAssistantServiceStub(channel)
-        
-        print("   🔗 Connected to gRPC server")
-        print(f"   📸 Base scene: {base_image_url}")
-        print(f"   🏺 Product (vase): {product_image_url}")
-        print(f"   💬 Prompt: {prompt}")
+        try:
+            out.p("   🔗 Connected to gRPC server")
+            out.p(f"   📸 Base scene: {base_image_url}")
+            out.p(f"   🏺 Product (vase): {product_image_url}")
+            out.p(f"   💬 Prompt: {prompt}")
         
-        # Create request
-        request = imageassistant_pb2.VisualizeProductRequest(
-            base_image_url=base_image_url,
-            product_image_url=product_image_url,
-            prompt=prompt
-        )
+            # Create request
+            request = imageassistant_pb2.VisualizeProductRequest(
+                base_image_url=staged(base_image_url),
+                product_image_url=staged(product_image_url),
+                prompt=prompt
+            )
         
-        print("   🚀 Sending visualization request...")
+            out.p("   🚀 Sending visualization request...")
         
-        # Call the service
-        response = await stub.VisualizeProduct(request)
+            # Call the service
+            response = await pool.stub().VisualizeProduct(request)
         
-        if response.success:
-            print("✅ gRPC Product Visualization successful!")
-            print(f"   Render URL: {response.render_url}")
-            print(f"   Processing time: {response.metadata.latency_ms}ms")
-            print(f"   Seed: {response.metadata.seed}")
-            print(f"   Message: {response.message}")
-        else:
-            print(f"❌ gRPC Product Visualization failed: {response.message}")
-            return False
+            if response.success:
+                out.p("✅ gRPC Product Visualization successful!")
+                out.p(f"   Render URL: {response.render_url}")
+                out.p(f"   Processing time: {response.metadata.latency_ms}ms")
+                out.p(f"   Seed: {response.metadata.seed}")
+                out.p(f"   Message: {response.message}")
+            else:
+                out.p(f"❌ gRPC Product Visualization failed: {response.message}")
+                return False
         
-        # Close the channel
-        await channel.close()
-        return True
+            return True
         
-    except Exception as e:
-        print(f"❌ gRPC Product Visualization failed: {str(e)}")
-        return False
+        except Exception as e:
+            out.p(f"❌ gRPC Product Visualization failed: {str(e)}")
+            return False
 
-async def test_grpc_health_check():
+async def run_grpc_health_check(pool):
     """Test the health check endpoint."""
-    print("\n🏥 Testing gRPC Health Check...")
+    with OutputBuffer() as out:
+        out.p("\n🏥 Testing gRPC Health Check...")
     
-    try:
-        # Connect to gRPC server
-        channel = grpc.aio.insecure_channel('localhost:8080')
-        stub = imageassistant_pb2_grpc.ImageAssistantServiceStub(channel)
+        try:
+            # Call the service
+            response = await pool.stub().Check(HEALTH_REQUEST)
         
-        # Create health check request
-        request = imageassistant_pb2.HealthCheckRequest(
-            service="imageassistant.ImageAssistantService"
-        )
+            if response.status == imageassistant_pb2.HealthCheckResponse.ServingStatus.SERVING:
+                out.p("✅ Health check passed - Service is SERVING")
+            else:
+                out.p(f"❌ Health check failed - Status: {response.status}")
+                return False
         
-        # Call the service
-        response = await stub.Check(request)
+            return True
         
-        if response.status == imageassistant_pb2.HealthCheckResponse.ServingStatus.SERVING:
-            print("✅ Health check passed - Service is SERVING")
-        else:
-            print(f"❌ Health check failed - Status: {response.status}")
+        except Exception as e:
+            out.p(f"❌ Health check failed: {str(e)}")
             return False
-        
-        # Close the channel
-        await channel.close()
-        return True
-        
-    except Exception as e:
-        print(f"❌ Health check failed: {str(e)}")
-        return False
 
-async def test_multiple_visualizations():
+async def _run_case(pool, name, request):
+    """Run one visualization case; returns (name, ok, latency_ms, render URL or error message)."""
+    response = await pool.stub().VisualizeProduct(request)
+    if response.success:
+        return name, True, response.metadata.latency_ms, response.render_url
+    return name, False, response.metadata.latency_ms, response.message
+
+async def run_multiple_visualizations(pool):
     """Test multiple product visualizations with different scenarios."""
-    print("\n🔄 Testing Multiple Product Visualizations...")
+    with OutputBuffer() as out:
+        out.p("\n🔄 Testing Multiple Product Visualizations...")
     
-    test_cases = [
-        {
-            "name": "Decorative Vase",
-            "base": "https://decorcabinets.com/wp-content/uploads/2024/11/37-Entry-Pic-2.jpg",
-            "product": "https://static.athome.com/images/w_1200,h_1200,c_pad,f_auto,fl_lossy,q_auto/v1746793260/p/124379171_E1/providence-blue-white-floral-porcelain-vase-12.jpg",
-            "prompt": "Place this decorative vase on the table"
-        },
-        {
-            "name": "Wall Art",
-            "base": "https://i.pinimg.com/736x/cb/f5/49/cbf549e2dc77cef0c4e9905323744e8a.jpg",
-            "product": "https://postersbase.com/cdn/shop/files/1_ad98f783-e827-49e8-bd31-c46e82bddc80.png?v=1715679997&width=1080",
-            "prompt": "How would this poster look on the wall in this room?"
-        }
-    ]
+        test_cases = _visualize_requests()
     
-    success_count = 0
+        # Cases are independent, so run them concurrently across the pooled channels
+        results = await asyncio.gather(
+            *(_run_case(pool, name, request) for name, request in test_cases), return_exceptions=True
+        )
     
-    for i, test_case in enumerate(test_cases):
-        try:
-            print(f"   🧪 Test {i+1}: {test_case['name']}")
-            
-            # Connect to gRPC server
-            channel = grpc.aio.insecure_channel('localhost:8080')
-            stub = imageassistant_pb2_grpc.ImageAssistantServiceStub(channel)
-            
-            # Create request
-            request = imageassistant_pb2.VisualizeProductRequest(
-                base_image_url=test_case["base"],
-                product_image_url=test_case["product"],
-                prompt=test_case["prompt"]
-            )
-            
-            # Call the service
-            response = await stub.VisualizeProduct(request)
-            
-            if response.success:
-                print(f"   ✅ {test_case['name']}: Success ({response.metadata.latency_ms}ms)")
-                print(f"      Render URL: {response.render_url}")
+        success_count = 0
+        # Report in case order once all concurrent cases are done
+        for (case_name, _), result in zip(test_cases, results):
+            out.p(f"   🧪 Test: {case_name}")
+            if isinstance(result, Exception):
+                out.p(f"   ❌ {case_name}: Failed - {str(result)}")
+                continue
+            name, ok, latency_ms, detail = result
+            if ok:
+                out.p(f"   ✅ {name}: Success ({latency_ms}ms)")
+                out.p(f"      Render URL: {detail}")
                 success_count += 1
             else:
-                print(f"   ❌ {test_case['name']}: Failed - {response.message}")
-            
-            # Close the channel
-            await channel.close()
-            
-        except Exception as e:
-            print(f"   ❌ {test_case['name']}: Failed - {str(e)}")
+                out.p(f"   ❌ {name}: Failed - {detail}")
     
-    print(f"\n   📊 Results: {success_count}/{len(test_cases)} tests passed")
-    return success_count == len(test_cases)
+        out.p(f"\n   📊 Results: {success_count}/{len(test_cases)} tests passed")
+        return success_count == len(test_cases)
+
+@functools.lru_cache(maxsize=1)
+def _env_summary() -> str:
+    """Environment check report, formatted once per process."""
+    lines = ["⚙️  Testing Environment Configuration..."]
+    for var in ("GOOGLE_CLOUD_PROJECT", "GOOGLE_CLOUD_REGION", "GCS_RENDERS_BUCKET"):
+        value = ENV[var]
+        lines.append(f"   ✅ {var}: {value}" if value else f"   ❌ {var}: Not set")
+    
+    # Check for service account key
+    key_ok, _ = creds_ok()
+    if key_ok:
+        lines.append("   ✅ Service account key file exists")
+    else:
+        lines.append("   ❌ Service account key file not found or GOOGLE_APPLICATION_CREDENTIALS not set")
+    return "\n".join(lines)
 
 async def main():
     """Main test function."""
     print("🚀 gRPC Product Visualization Service Test")
     print("=" * 80)
     
-    # Environment check
-    print("⚙️  Testing Environment Configuration...")
-    required_vars = ["GOOGLE_CLOUD_PROJECT", "GOOGLE_CLOUD_REGION", "GCS_RENDERS_BUCKET"]
-    
-    for var in required_vars:
-        value = os.getenv(var)
-        if value:
-            if var == "GOOGLE_APPLICATION_CREDENTIALS":
-                print(f"   ✅ {var}: ***masked***")
-            else:
-                print(f"   ✅ {var}: {value}")
-        else:
-            print(f"   ❌ {var}: Not set")
-    
-    # Check for service account key
-    creds_path = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
-    if creds_path and os.path.exists(creds_path):
-        print("   ✅ Service account key file exists")
-    else:
-        print("   ❌ Service account key file not found or GOOGLE_APPLICATION_CREDENTIALS not set")
+    # Environment check; set SKIP_ENV_CHECK=1 to skip it in rerun loops
+    if not os.environ.get("SKIP_ENV_CHECK"):
+        print(_env_summary())
     
     print()
     print("=" * 80)
     
     try:
-        # Test health check first
-        health_ok = await test_grpc_health_check()
-        if not health_ok:
-            print("❌ Health check failed - server may not be running")
-            return
-        
-        # Test main functionality
-        main_test_ok = await test_grpc_product_visualization()
-        
-        # Test multiple scenarios
-        multiple_tests_ok = await test_multiple_visualizations()
+        # Download the test images once and serve them from GCS for every request
+        await stage_test_images(TEST_IMAGE_URLS)
+        
+        async with ChannelPool('localhost:8080') as pool:
+            # Connect all pooled channels up front so no visualization pays connection setup;
+            # a server that can't be reached in time fails the health check
+            health_ok = await pool.warm_up() and await run_grpc_health_check(pool)
+            if not health_ok:
+                print("❌ Health check failed - server may not be running")
+                return
+            
+            # Test main functionality
+            main_test_ok = await run_grpc_product_visualization(pool)
+            
+            # Test multiple scenarios
+            multiple_tests_ok = await run_multiple_visualizations(pool)
         
         print()
         print("=" * 80)
@@ -221,4 +209,5 @@ async def main():
         print("💡 Make sure the gRPC server is running: python server.py")
 
 if __name__ == "__main__":
+    install_uvloop()
     asyncio.run(main()) 
\ No newline at end of file
@@ -6,130 +6,121 @@ Run this after setting up the service to verify image analysis works via gRPC.
 """
 
 import os
+import types
 import sys
 import asyncio
+import traceback
 import grpc
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-# Add current directory to path
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# Snapshot the variables these tests read, once per process
+REQUIRED = ("GOOGLE_CLOUD_PROJECT", "GOOGLE_CLOUD_REGION", "GOOGLE_APPLICATION_CREDENTIALS", "GCS_BUCKET")
+ENV = types.MappingProxyType({var: os.environ.get(var) for var in REQUIRED})
 
-from genproto import imageassistant_pb2, imageassistant_pb2_grpc
+from genproto import imageassistant_pb2
+from channel_pool import ChannelPool
 from image_analyzer import ImageAnalyzer
 from models import AnalyzeImageRequest
+from _test_common import HEALTH_REQUEST, OutputBuffer, creds_ok, install_uvloop
 
-async def test_grpc_image_analysis():
+async def run_grpc_image_analysis(pool):
     """Test image analysis via gRPC."""
-    print("🔍 Testing gRPC Image Analysis...")
-    
-    try:
-        # Create gRPC channel
-        channel = grpc.aio.insecure_channel('localhost:8080')
-        stub = imageassistant_pb2_grpc.ImageAssistantServiceStub(channel)
+    with OutputBuffer() as out:
+        out.p("🔍 Testing gRPC Image Analysis...")
+        
+        try:
+            # Test with a sample image
+            test_image_url = "https://i.pinimg.com/736x/cb/f5/49/cbf549e2dc77cef0c4e9905323744e8a.jpg"
+            
+            request = imageassistant_pb2.AnalyzeImageRequest(
+                image_url=test_image_url,
+                context="A test image for gRPC analysis"
+            )
+            
+            # Call the gRPC service
+            response = await pool.stub().AnalyzeImage(request)
+            
+            if response.success:
+                out.p(f"✅ gRPC Analysis successful!")
+                out.p(f"   Scene Type: {response.scene_type}")
+                out.p(f"   Objects Found: {len(response.objects)}")
+                for obj in response.objects[:3]:  # Show first 3 objects
+                    out.p(f"     - {obj.label} (confidence: {obj.confidence:.2f})")
+                out.p(f"   Styles: {list(response.styles)}")
+                out.p(f"   Colors: {list(response.colors[:3])}")  # Show first 3 colors
+                out.p(f"   Tags: {list(response.tags[:5])}")  # Show first 5 tags
+                out.p(f"   Message: {response.message}")
+                return True
+            else:
+                out.p(f"❌ gRPC Analysis failed: {response.message}")
+                return False
+                
+        except grpc.aio.AioRpcError as e:
+            out.p(f"❌ gRPC Error: {e.code()} - {e.details()}")
+            return False
+        except Exception as e:
+            out.p(f"❌ Analysis failed: {str(e)}")
+            out.p(traceback.format_exc())
+            return False
+
+async def test_direct_image_analysis():
+    """Test image analysis directly (without gRPC)."""
+    with OutputBuffer() as out:
+        out.p("🔍 Testing Direct Image Analysis...")
+        
+        analyzer = ImageAnalyzer()
         
         # Test with a sample image
         test_image_url = "https://i.pinimg.com/736x/cb/f5/49/cbf549e2dc77cef0c4e9905323744e8a.jpg"
         
-        request = imageassistant_pb2.AnalyzeImageRequest(
+        request = AnalyzeImageRequest(
             image_url=test_image_url,
-            context="A test image for gRPC analysis"
+            context="A test image for direct analysis"
         )
         
-        # Call the gRPC service
-        response = await stub.AnalyzeImage(request)
-        
-        if response.success:
-            print(f"✅ gRPC Analysis successful!")
-            print(f"   Scene Type: {response.scene_type}")
-            print(f"   Objects Found: {len(response.objects)}")
-            for obj in response.objects[:3]:  # Show first 3 objects
-                print(f"     - {obj.label} (confidence: {obj.confidence:.2f})")
-            print(f"   Styles: {list(response.styles)}")
-            print(f"   Colors: {list(response.colors[:3])}")  # Show first 3 colors
-            print(f"   Tags: {list(response.tags[:5])}")  # Show first 5 tags
-            print(f"   Message: {response.message}")
+        try:
+            result = await analyzer.analyze_image(request)
+            
+            out.p(f"✅ Direct Analysis successful!")
+            out.p(f"   Scene Type: {result.scene_type}")
+            out.p(f"   Objects Found: {len(result.objects)}")
+            for obj in result.objects[:3]:  # Show first 3 objects
+                out.p(f"     - {obj.label} (confidence: {obj.confidence:.2f})")
+            out.p(f"   Styles: {result.styles}")
+            out.p(f"   Colors: {result.colors[:3]}")  # Show first 3 colors
+            out.p(f"   Tags: {result.tags[:5]}")  # Show first 5 tags
             
-            await channel.close()
             return True
-        else:
-            print(f"❌ gRPC Analysis failed: {response.message}")
-            await channel.close()
-            return False
             
-    except grpc.aio.AioRpcError as e:
-        print(f"❌ gRPC Error: {e.code()} - {e.details()}")
-        return False
-    except Exception as e:
-        print(f"❌ Analysis failed: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        return False
-
-async def test_direct_image_analysis():
-    """Test image analysis directly (without gRPC)."""
-    print("🔍 Testing Direct Image Analysis...")
-    
-    analyzer = ImageAnalyzer()
-    
-    # Test with a sample image
-    test_image_url = "https://i.pinimg.com/736x/cb/f5/49/cbf549e2dc77cef0c4e9905323744e8a.jpg"
-    
-    request = AnalyzeImageRequest(
-        image_url=test_image_url,
-        context="A test image for direct analysis"
-    )
-    
-    try:
-        result = await analyzer.analyze_image(request)
-        
-        print(f"✅ Direct Analysis successful!")
-        print(f"   Scene Type: {result.scene_type}")
-        print(f"   Objects Found: {len(result.objects)}")
-        for obj in result.objects[:3]:  # Show first 3 objects
-            print(f"     - {obj.label} (confidence: {obj.confidence:.2f})")
-        print(f"   Styles: {result.styles}")
-        print(f"   Colors: {result.colors[:3]}")  # Show first 3 colors
-        print(f"   Tags: {result.tags[:5]}")  # Show first 5 tags
-        
-        return True
-        
-    except Exception as e:
-        print(f"❌ Direct Analysis failed: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        return False
+        except Exception as e:
+            out.p(f"❌ Direct Analysis failed: {str(e)}")
+            out.p(traceback.format_exc())
+            return False
 
-async def test_grpc_health():
+async def run_grpc_health(pool):
     """Test gRPC health check."""
-    print("🏥 Testing gRPC Health Check...")
-    
-    try:
-        # Create gRPC channel
-        channel = grpc.aio.insecure_channel('localhost:8080')
-        stub = imageassistant_pb2_grpc.ImageAssistantServiceStub(channel)
-        
-        # Health check request
-        request = imageassistant_pb2.HealthCheckRequest(service="imageassistant")
-        response = await stub.Check(request)
+    with OutputBuffer() as out:
+        out.p("🏥 Testing gRPC Health Check...")
         
-        if response.status == imageassistant_pb2.HealthCheckResponse.ServingStatus.SERVING:
-            print("✅ gRPC Health Check passed!")
-            await channel.close()
-            return True
-        else:
-            print(f"❌ gRPC Health Check failed: {response.status}")
-            await channel.close()
-            return False
+        try:
+            response = await pool.stub().Check(HEALTH_REQUEST)
             
-    except grpc.aio.AioRpcError as e:
-        print(f"❌ gRPC Health Check Error: {e.code()} - {e.details()}")
-        return False
-    except Exception as e:
-        print(f"❌ Health check failed: {str(e)}")
-        return False
+            if response.status == imageassistant_pb2.HealthCheckResponse.ServingStatus.SERVING:
+                out.p("✅ gRPC Health Check passed!")
+                return True
+            else:
+                out.p(f"❌ gRPC Health Check failed: {response.status}")
+                return False
+                
+        except grpc.aio.AioRpcError as e:
+            out.p(f"❌ gRPC Health Check Error: {e.code()} - {e.details()}")
+            return False
+        except Exception as e:
+            out.p(f"❌ Health check failed: {str(e)}")
+            return False
 
 def test_environment():
     """Test environment configuration."""
@@ -156,8 +147,8 @@ def test_environment():
     #     return False
     
     # Test service account key file
-    key_file = os.getenv('GOOGLE_APPLICATION_CREDENTIALS')
-    if os.path.exists(key_file):
+    key_ok, key_file = creds_ok()
+    if key_ok:
         print(f"   ✅ Service account key file exists")
     else:
         print(f"   ❌ Service account key file not found: {key_file}")
@@ -177,18 +168,21 @@ async def main():
     
     print("\n" + "=" * 60)
     
-    # Test direct image analysis first
-    direct_success = await test_direct_image_analysis()
-    
-    print("\n" + "=" * 60)
-    
-    # Test gRPC health check
-    health_success = await test_grpc_health()
-    
-    print("\n" + "=" * 60)
-    
-    # Test gRPC image analysis
-    grpc_success = await test_grpc_image_analysis()
+    async with ChannelPool('localhost:8080') as pool:
+        # Connect all pooled channels up front so no analysis pays connection setup
+        if await pool.warm_up():
+            # Direct (Vertex AI) and gRPC (localhost) tests hit independent backends, so run them
+            # concurrently; each buffers its own output, so results print as whole blocks
+            direct_success, health_success, grpc_success = await asyncio.gather(
+                test_direct_image_analysis(),
+                run_grpc_health(pool),
+                run_grpc_image_analysis(pool),
+            )
+        else:
+            # The direct analysis doesn't need the server, so it still runs
+            print("\n❌ Health check failed - server may not be running")
+            direct_success = await test_direct_image_analysis()
+            health_success = grpc_success = False
     
     print("\n" + "=" * 60)
     print("📊 Test Results:")
@@ -221,4 +215,5 @@ if __name__ == "__main__":
     else:
         print("⚠️  Not in virtual environment. Activate with: source env/bin/activate")
     
+    install_uvloop()
     asyncio.run(main()) 
\ No newline at end of file
@@ -0,0 +1,66 @@
+import asyncio
+import os
+import sys
+
+import pytest
+import pytest_asyncio
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from channel_pool import ChannelPool
+
+GRPC_TARGET = os.getenv("IMAGE_ASSISTANT_ADDR", "localhost:8080")
+
+
+def _require_gcp():
+    """Skip integration tests when no Google Cloud project is configured."""
+    if not os.getenv("GOOGLE_CLOUD_PROJECT"):
+        pytest.skip("GOOGLE_CLOUD_PROJECT not set")
+
+
+@pytest.fixture(scope="session")
+def event_loop():
+    """One event loop for the session so session-scoped async fixtures can be shared."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def gemini_viz():
+    """ProductVisualizerGemini built once per session (one auth and client setup)."""
+    _require_gcp()
+    from product_visualizer_gemini import ProductVisualizerGemini
+    visualizer = ProductVisualizerGemini()
+    yield visualizer
+    # Let render uploads finish before the session loop closes, then release the HTTP session
+    await visualizer.aclose()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def recontext_viz():
+    """ProductVisualizerRecontext built once per session."""
+    _require_gcp()
+    from product_visualizer_recontext import ProductVisualizerRecontext
+    visualizer = ProductVisualizerRecontext()
+    yield visualizer
+    await visualizer.aclose()
+
+
+@pytest.fixture(scope="session")
+def analyzer():
+    """ImageAnalyzer built once per session."""
+    _require_gcp()
+    from image_analyzer import ImageAnalyzer
+    return ImageAnalyzer()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def grpc_pool():
+    """Channel pool to the running service, opened once; skips if the server is not up."""
+    pool = ChannelPool(GRPC_TARGET)
+    if not await pool.warm_up(timeout=5):
+        await pool.close()
+        pytest.skip(f"gRPC server not reachable at {GRPC_TARGET}")
+    yield pool
+    await pool.close()
@@ -0,0 +1,45 @@
+import os
+import struct
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from image_utils import get_image_dimensions
+
+IMAGES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "images")
+
+
+class TestGetImageDimensions:
+    """Header-only dimension parsing."""
+
+    def test_png_header(self):
+        header = b'\x89PNG\r\n\x1a\n' + struct.pack(">I", 13) + b'IHDR' + struct.pack(">II", 640, 480)
+        assert tuple(get_image_dimensions(header)) == (640, 480)
+
+    def test_gif_header(self):
+        header = b'GIF89a' + struct.pack("<HH", 32, 16)
+        assert tuple(get_image_dimensions(header)) == (32, 16)
+
+    def test_webp_vp8x_header(self):
+        header = (b'RIFF' + b'\x00' * 4 + b'WEBP' + b'VP8X' + b'\x00' * 8
+                  + (799).to_bytes(3, 'little') + (599).to_bytes(3, 'little'))
+        assert get_image_dimensions(header) == (800, 600)
+
+    def test_jpeg_skips_segments_before_frame(self):
+        app0 = b'\xff\xe0' + struct.pack(">H", 16) + b'JFIF\x00' + b'\x00' * 9
+        sof0 = b'\xff\xc0' + struct.pack(">HBHH", 17, 8, 300, 1200) + b'\x03'
+        data = b'\xff\xd8' + app0 + sof0 + b'\x00' * 16
+        assert get_image_dimensions(data) == (1200, 300)
+
+    def test_jpeg_without_frame_raises(self):
+        with pytest.raises(ValueError):
+            get_image_dimensions(b'\xff\xd8' + b'\x00' * 16)
+
+    @pytest.mark.parametrize("name", ["s-l1200.jpg", "composite_image_0.png"])
+    def test_matches_pil_on_sample_images(self, name):
+        Image = pytest.importorskip("PIL.Image")
+        with open(os.path.join(IMAGES_DIR, name), "rb") as f:
+            data = f.read()
+        assert tuple(get_image_dimensions(data)) == Image.open(os.path.join(IMAGES_DIR, name)).size
@@ -0,0 +1,74 @@
+"""End-to-end checks against Vertex AI and a running server; skipped when neither is configured."""
+
+import pytest
+
+from genproto import imageassistant_pb2
+from models import AnalyzeImageRequest, VisualizeProductRequest
+from _test_common import ENTRY_TABLE, POSTER, ROOM_SCENE, VASE
+
+
+@pytest.mark.asyncio
+async def test_grpc_health(grpc_pool):
+    response = await grpc_pool.stub().Check(
+        imageassistant_pb2.HealthCheckRequest(service="imageassistant.ImageAssistantService")
+    )
+    assert response.status == imageassistant_pb2.HealthCheckResponse.ServingStatus.SERVING
+
+
+@pytest.mark.asyncio
+async def test_grpc_visualize_vase(grpc_pool):
+    response = await grpc_pool.stub().VisualizeProduct(imageassistant_pb2.VisualizeProductRequest(
+        base_image_url=ENTRY_TABLE,
+        product_image_url=VASE,
+        prompt="Place this decorative vase on the table"
+    ))
+    assert response.success, response.message
+    assert response.render_url
+
+
+@pytest.mark.asyncio
+async def test_grpc_analyze_image(grpc_pool):
+    response = await grpc_pool.stub().AnalyzeImage(imageassistant_pb2.AnalyzeImageRequest(
+        image_url=ROOM_SCENE,
+        context="A test image for gRPC analysis"
+    ))
+    assert response.success, response.message
+
+
+@pytest.mark.asyncio
+async def test_gemini_wall_art(gemini_viz):
+    result = await gemini_viz.visualize_product(VisualizeProductRequest(
+        base_image_url=ROOM_SCENE,
+        product_image_url=POSTER,
+        prompt="How would this poster look on the wall in this room?"
+    ))
+    assert result.render_url
+
+
+@pytest.mark.asyncio
+async def test_gemini_table_decor(gemini_viz):
+    result = await gemini_viz.visualize_product(VisualizeProductRequest(
+        base_image_url=ENTRY_TABLE,
+        product_image_url=VASE,
+        prompt="Place this decorative vase on the table"
+    ))
+    assert result.render_url
+
+
+@pytest.mark.asyncio
+async def test_recontext_wall_art(recontext_viz):
+    result = await recontext_viz.visualize_product(VisualizeProductRequest(
+        base_image_url=ROOM_SCENE,
+        product_image_url=POSTER,
+        prompt="Seamlessly integrate this poster into the room scene with natural placement and realistic lighting"
+    ))
+    assert result.render_url
+
+
+@pytest.mark.asyncio
+async def test_analyze_image_direct(analyzer):
+    result = await analyzer.analyze_image(AnalyzeImageRequest(
+        image_url=ROOM_SCENE,
+        context="A test image for direct analysis"
+    ))
+    assert result.scene_type
@@ -0,0 +1,190 @@
+"""
+Application factory for the Online Boutique MCP Server.
+
+create_app() builds a FastAPI app serving only the requested feature set. A disabled feature
+costs nothing: its client is never constructed or connected, and its routes and tools are not
+registered, so they don't appear in `/tools/schema` either.
+"""
+
+import asyncio
+import os
+import logging
+from contextlib import asynccontextmanager
+from typing import AbstractSet
+
+import orjson
+from fastapi import FastAPI, Response
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+
+from routers.tool_schema import build_tools_schema
+
+logger = logging.getLogger(__name__)
+
+ALL_FEATURES = frozenset({"cart", "products", "reviews", "currency", "shopping_assistant", "image_assistant"})
+
+
+def create_app(features: AbstractSet[str] = ALL_FEATURES) -> FastAPI:
+    """Create the MCP server app with the routers and clients of `features` only."""
+    unknown = set(features) - ALL_FEATURES
+    if unknown:
+        raise ValueError(f"Unknown features: {', '.join(sorted(unknown))}")
+    features = frozenset(features)
+
+    # Feature modules are imported only when enabled, so a server without a feature never loads its client stack
+    routers = []
+    if "cart" in features:
+        from routers import cart_router
+        routers.append(cart_router)
+    if "products" in features:
+        from routers import product_catalog_router
+        routers.append(product_catalog_router)
+    if "reviews" in features:
+        from routers import review_router
+        routers.append(review_router)
+    if "currency" in features:
+        from routers import currency_router
+        routers.append(currency_router)
+    if "shopping_assistant" in features:
+        from routers import shopping_assistant_router
+        routers.append(shopping_assistant_router)
+    if "image_assistant" in features:
+        from routers import image_assistant_router
+        routers.append(image_assistant_router)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        """Manage application lifecycle - startup and shutdown.
+
+        Clients and tools live on app.state, so each app (and each worker process) owns its own
+        instead of sharing module globals.
+        """
+        state = app.state
+
+        # Startup
+        logger.info(f"🚀 Starting MCP Server with {', '.join(sorted(features))}...")
+
+        # Process-wide gRPC clients, so tools created elsewhere reuse the same pooled channels
+        grpc_clients = []
+        connected = []
+
+        if "cart" in features:
+            from clients.cart_client import get_cart_client
+            from tools.cart_tool import CartTools
+            cart_host = os.getenv("CART_SERVICE_HOST", "cartservice:7070")
+            state.cart_client = get_cart_client(host=cart_host)
+            state.cart_tools = CartTools(client=state.cart_client)
+            cart_router.set_cart_tools(state.cart_tools)
+            grpc_clients.append(state.cart_client)
+            connected.append(("cartservice", cart_host))
+
+        if "products" in features:
+            from clients.product_client import get_product_client
+            from tools.product_tools import ProductTools
+            product_host = os.getenv("PRODUCT_SERVICE_HOST", "productcatalogservice:3550")
+            state.product_client = get_product_client(host=product_host)
+            state.product_tools = ProductTools(client=state.product_client)
+            product_catalog_router.set_product_tools(state.product_tools)
+            grpc_clients.append(state.product_client)
+            connected.append(("productcatalogservice", product_host))
+
+        if "reviews" in features:
+            from clients.review_client import get_review_client
+            from tools.review_tools import ReviewTools
+            review_host = os.getenv("REVIEW_SERVICE_HOST", "reviewservice:8080")
+            state.review_client = get_review_client(host=review_host)
+            state.review_tools = ReviewTools(client=state.review_client)
+            review_router.set_review_tools(state.review_tools)
+            grpc_clients.append(state.review_client)
+            connected.append(("reviewservice", review_host))
+
+        if "currency" in features:
+            from clients.currency_client import get_currency_client
+            from tools.currency_tools import CurrencyTools
+            currency_host = os.getenv("CURRENCY_SERVICE_HOST", "currencyservice:7000")
+            state.currency_client = get_currency_client(address=currency_host)
+            state.currency_tools = CurrencyTools(client=state.currency_client)
+            currency_router.set_currency_tools(state.currency_tools)
+            grpc_clients.append(state.currency_client)
+            connected.append(("currencyservice", currency_host))
+
+        if "shopping_assistant" in features:
+            from clients.shopping_assistant_client import ShoppingAssistantServiceClient
+            from tools.shopping_assistant_tools import ShoppingAssistantTools
+            shopping_assistant_host = os.getenv("SHOPPING_ASSISTANT_SERVICE_HOST", "shoppingassistantservice:80")
+            state.shopping_assistant_client = ShoppingAssistantServiceClient(address=shopping_assistant_host)
+            state.shopping_assistant_tools = ShoppingAssistantTools(client=state.shopping_assistant_client)
+            shopping_assistant_router.set_shopping_assistant_tools(state.shopping_assistant_tools)
+            connected.append(("shoppingassistantservice", shopping_assistant_host))
+
+        if "image_assistant" in features:
+            from clients.image_assistant_client import get_image_assistant_client
+            from tools.image_assistant_tools import ImageAssistantTools
+            image_assistant_host = os.getenv("IMAGE_ASSISTANT_SERVICE_HOST", "imageassistantservice:8080")
+            state.image_assistant_client = get_image_assistant_client(address=image_assistant_host)
+            state.image_assistant_tools = ImageAssistantTools(client=state.image_assistant_client)
+            image_assistant_router.set_image_assistant_tools(state.image_assistant_tools)
+            grpc_clients.append(state.image_assistant_client)
+            connected.append(("imageassistantservice", image_assistant_host))
+
+        # Open the grpc.aio channels here, on the serving loop, so no tool call pays connection setup;
+        # backends that aren't up yet keep connecting in the background
+        await asyncio.gather(*(client.warm_up() for client in grpc_clients))
+
+        for service, host in connected:
+            logger.info(f"✅ Connected to {service} at {host}")
+
+        yield
+
+        # Shutdown
+        logger.info("🛑 Shutting down MCP Server...")
+        # grpc.aio channels must be closed on the loop that owns them; the singletons reconnect lazily if reused
+        for client in grpc_clients:
+            await client.close()
+        if "shopping_assistant" in features:
+            await state.shopping_assistant_client.aclose()
+            state.shopping_assistant_client.close()
+
+    app = FastAPI(
+        title="Online Boutique MCP Server",
+        description="Model Context Protocol server for Online Boutique microservices",
+        version="1.0.0",
+        lifespan=lifespan,
+        # Every route returns JSON; orjson encodes straight to bytes, several times faster than json.dumps
+        default_response_class=ORJSONResponse
+    )
+
+    # Add CORS middleware for cross-origin requests
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # Include routers
+    for module in routers:
+        app.include_router(module.router)
+
+    # The tool list is generated from the routes marked as MCP tools, so it can't drift from them;
+    # the routes are final once included, so it is serialized once and every request just sends the bytes
+    tools_schema_bytes = orjson.dumps({"tools": build_tools_schema(app.routes)})
+
+    # Health check endpoint
+    @app.get("/health")
+    async def health_check():
+        """Health check endpoint."""
+        return {
+            "status": "healthy",
+            "service": "online-boutique-mcp-server",
+            "version": "1.0.0"
+        }
+
+    # MCP Schema Endpoints (for tool discovery)
+    @app.get("/tools/schema")
+    async def get_tools_schema() -> Response:
+        """Get schema of all available MCP tools."""
+        return Response(content=tools_schema_bytes, media_type="application/json")
+
+    return app
@@ -0,0 +1,20 @@
+import os
+
+# Parse and serialize messages in C (upb) rather than pure Python. The backend is chosen when
+# google.protobuf is first imported, so this must run before any pb2 module is loaded.
+os.environ.setdefault("PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION", "upb")
+
+# Load every generated proto module once, through the genproto package, so all clients share
+# the same module objects and descriptor pool registrations
+from genproto import demo_pb2, demo_pb2_grpc
+from genproto import imageassistant_pb2, imageassistant_pb2_grpc
+from genproto import review_pb2, review_pb2_grpc
+
+__all__ = [
+    "demo_pb2",
+    "demo_pb2_grpc",
+    "imageassistant_pb2",
+    "imageassistant_pb2_grpc",
+    "review_pb2",
+    "review_pb2_grpc",
+]
@@ -1,9 +1,11 @@
-import grpc
+import threading
 from typing import Optional
 
 # Import from genproto package
 from genproto import demo_pb2, demo_pb2_grpc
 
+from clients.channel_pool import ChannelPool
+
 # Client stub (you’re using it): CartServiceStub
 # Server stub/servicer: CartServiceServicer (for implementing the server)
 class CartServiceClient:
@@ -15,43 +17,62 @@ class CartServiceClient:
 	- Keep network/serialization details out of tool logic
 	"""
 
-	def __init__(self, host: str = "cartservice:7070", insecure: bool = True) -> None:
+	def __init__(self, host: str = "cartservice:7070", insecure: bool = True, pool_size: int = 4) -> None:
 		self._host = host
-		self._channel: Optional[grpc.Channel] = None
-		self._stub: Optional[demo_pb2_grpc.CartServiceStub] = None
+		self._pool: Optional[ChannelPool[demo_pb2_grpc.CartServiceStub]] = None
 		self._insecure = insecure
+		self._pool_size = pool_size
 
 	def connect(self) -> None:
-		if self._channel is None:
-			self._channel = grpc.insecure_channel(self._host) if self._insecure else grpc.secure_channel(self._host, grpc.ssl_channel_credentials())
-			self._stub = demo_pb2_grpc.CartServiceStub(self._channel)
-
-	def close(self) -> None:
-		if self._channel is not None:
-			self._channel.close()
-			self._channel = None
-			self._stub = None
-
-	# Synchronous methods for simplicity; can be adapted to async if needed
-	def add_item(self, user_id: str, product_id: str, quantity: int) -> demo_pb2.Empty:
+		if self._pool is None:
+			self._pool = ChannelPool(self._host, demo_pb2_grpc.CartServiceStub, self._pool_size, self._insecure)
+
+	async def warm_up(self, timeout: float = 2.0) -> bool:
+		"""Open the pooled channels from inside the event loop, ahead of the first call."""
+		self.connect()
+		return await self._pool.warm_up(timeout)  # type: ignore[union-attr]
+
+	async def close(self) -> None:
+		if self._pool is not None:
+			pool, self._pool = self._pool, None
+			await pool.close()
+
+	# Async methods on grpc.aio channels, so one event loop keeps many RPCs in flight
+	async def add_item(self, user_id: str, product_id: str, quantity: int) -> demo_pb2.Empty:
 		self._ensure_connected()
 		request = demo_pb2.AddItemRequest(
 			user_id=user_id,
 			item=demo_pb2.CartItem(product_id=product_id, quantity=quantity),
 		)
-		return self._stub.AddItem(request)  # type: ignore[arg-type]
+		return await self._stub().AddItem(request)  # type: ignore[arg-type]
 
-	def get_cart(self, user_id: str) -> demo_pb2.Cart:
+	async def get_cart(self, user_id: str) -> demo_pb2.Cart:
 		self._ensure_connected()
 		request = demo_pb2.GetCartRequest(user_id=user_id)
-		return self._stub.GetCart(request)  # type: ignore[arg-type]
+		return await self._stub().GetCart(request)  # type: ignore[arg-type]
 
-	def empty_cart(self, user_id: str) -> demo_pb2.Empty:
+	async def empty_cart(self, user_id: str) -> demo_pb2.Empty:
 		self._ensure_connected()
 		request = demo_pb2.EmptyCartRequest(user_id=user_id)
-		return self._stub.EmptyCart(request)  # type: ignore[arg-type]
+		return await self._stub().EmptyCart(request)  # type: ignore[arg-type]
+
+	def _stub(self) -> demo_pb2_grpc.CartServiceStub:
+		return self._pool.stub()  # type: ignore[union-attr]
 
 	def _ensure_connected(self) -> None:
-		if self._stub is None:
+		if self._pool is None:
 			self.connect()
 
+
+_SINGLETON: Optional[CartServiceClient] = None
+_LOCK = threading.Lock()
+
+
+def get_cart_client(host: str = "cartservice:7070") -> CartServiceClient:
+	"""Process-wide CartServiceClient sharing one channel pool; the first call's address wins."""
+	global _SINGLETON
+	if _SINGLETON is None:
+		with _LOCK:
+			if _SINGLETON is None:
+				_SINGLETON = CartServiceClient(host=host)
+	return _SINGLETON
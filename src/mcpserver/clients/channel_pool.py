@@ -0,0 +1,87 @@
+import asyncio
+import itertools
+import json
+from typing import Callable, Generic, List, TypeVar
+
+import grpc
+
+StubT = TypeVar("StubT")
+
+# Idempotent reads, which are also safe to retry when the server gave up on a downstream call
+_READ_METHODS = {
+    "hipstershop.CartService": ["GetCart"],
+    "hipstershop.ProductCatalogService": ["ListProducts", "GetProduct", "SearchProducts"],
+    "hipstershop.CurrencyService": ["GetSupportedCurrencies", "Convert"],
+    "review.ReviewService": ["GetProductReviews", "GetUserReviews", "GetReview", "GetProductReviewSummary"],
+    "imageassistant.ImageAssistantService": ["AnalyzeImage"],
+}
+
+
+def _retry_policy(*codes: str) -> dict:
+    return {
+        "maxAttempts": 3,
+        "initialBackoff": "0.1s",
+        "maxBackoff": "1s",
+        "backoffMultiplier": 2,
+        "retryableStatusCodes": list(codes),
+    }
+
+
+# Detect dead connections with keepalive pings, admit large messages both ways, and let gRPC itself
+# retry failed reads. Retries happen inside the channel, with backoff and without re-entering Python, so
+# clients let grpc.RpcError propagate instead of wrapping it. Writes (AddItem, EmptyCart, CreateReview, ...)
+# are never retried: UNAVAILABLE can arrive after the server applied them, and a retry would apply them twice
+_COMMON_OPTS = [
+    # Servers only accept keepalive pings every 5 minutes by default (grpc-go and C-core alike) and answer
+    # faster ones with GOAWAY too_many_pings, which forces the reconnects keepalive is meant to avoid.
+    # Only connections with calls in flight are pinged
+    ("grpc.keepalive_time_ms", 300000),
+    ("grpc.keepalive_timeout_ms", 10000),
+    ("grpc.max_receive_message_length", 32 * 1024 * 1024),
+    ("grpc.max_send_message_length", 32 * 1024 * 1024),
+    ("grpc.enable_retries", 1),
+    ("grpc.service_config", json.dumps({
+        "methodConfig": [
+            {
+                "name": [{"service": service, "method": method} for service, methods in _READ_METHODS.items() for method in methods],
+                "retryPolicy": _retry_policy("UNAVAILABLE", "DEADLINE_EXCEEDED"),
+            },
+        ]
+    })),
+]
+
+class ChannelPool(Generic[StubT]):
+    """
+    Round-robin pool of gRPC channels to one backend, each its own HTTP/2 connection.
+
+    A single channel multiplexes every RPC onto one connection, so concurrent tool calls
+    queue behind its MAX_CONCURRENT_STREAMS limit and share one flow-control window.
+    """
+
+    def __init__(self, target: str, stub_factory: Callable[[grpc.aio.Channel], StubT], size: int = 4, insecure: bool = True) -> None:
+        # A distinct grpc.channel_number per channel keeps gRPC from sharing one subchannel between them
+        self._channels: List[grpc.aio.Channel] = [
+            grpc.aio.insecure_channel(target, options=[*_COMMON_OPTS, ("grpc.channel_number", i)]) if insecure
+            else grpc.aio.secure_channel(target, grpc.ssl_channel_credentials(), options=[*_COMMON_OPTS, ("grpc.channel_number", i)])
+            for i in range(max(1, size))
+        ]
+        self._stubs: List[StubT] = [stub_factory(channel) for channel in self._channels]
+        # stub() returns the stub bound to the next channel in the pool. It is the cycle's own
+        # __next__, so picking a stub costs one C call with no counter, modulo or indexing, and
+        # itertools.cycle advances atomically under the GIL, so no lock is needed
+        self.stub: Callable[[], StubT] = itertools.cycle(self._stubs).__next__
+
+    async def warm_up(self, timeout: float) -> bool:
+        """Connect every channel now, so the first calls don't pay the TCP and HTTP/2 handshakes.
+
+        Returns False if the backend isn't reachable within `timeout`; the channels keep
+        connecting in the background, so that is not an error.
+        """
+        try:
+            await asyncio.wait_for(asyncio.gather(*(channel.channel_ready() for channel in self._channels)), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def close(self) -> None:
+        await asyncio.gather(*(channel.close() for channel in self._channels))
@@ -1,89 +1,150 @@
-import grpc
+import asyncio
+import operator
+import threading
+import time
 import os
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 
 from genproto import demo_pb2, demo_pb2_grpc
 
+from clients.channel_pool import ChannelPool
+
+# Exchange rates rarely change; cache each service's EUR rate table for five minutes. A table missing
+# currencies whose conversion failed is only kept briefly, so one backend hiccup doesn't last the full TTL
+RATES_TTL_SECONDS = 300
+PARTIAL_RATES_TTL_SECONDS = 10
+_rates_cache: Dict[str, Tuple[float, Dict[str, float]]] = {}
+
+# The supported ISO codes essentially never change; re-list them once an hour
+CURRENCIES_TTL_SECONDS = 3600
+_currencies_cache: Dict[str, Tuple[float, List[str]]] = {}
+
+# `from` is a Python keyword, so the request's source-money field can only be reached by name
+_from_money = operator.attrgetter("from")
+
+
+def _split_nanos(total_nanos: int) -> Tuple[int, int]:
+    """Split an amount in nanos into Money units and nanos, which always share the amount's sign."""
+    # Integer divmod: float division rounds large amounts up to the next unit and leaves nanos negative
+    units, nanos = divmod(abs(total_nanos), 1_000_000_000)
+    return (-units, -nanos) if total_nanos < 0 else (units, nanos)
+
 
 class CurrencyServiceClient:
     """Client for Currency Service gRPC operations."""
     
-    def __init__(self, address: Optional[str] = None):
+    def __init__(self, address: Optional[str] = None, pool_size: int = 4):
         self.address = address or os.getenv("CURRENCY_SERVICE_ADDR", "localhost:7000")
-        self.channel = None
-        self.stub = None
+        self.pool_size = pool_size
+        self.pool = None
     
     def connect(self):
-        """Establish gRPC connection to Currency Service."""
-        if self.channel is None:
-            self.channel = grpc.insecure_channel(self.address)
-            self.stub = demo_pb2_grpc.CurrencyServiceStub(self.channel)
+        """Establish the pooled gRPC connections to Currency Service."""
+        if self.pool is None:
+            self.pool = ChannelPool(self.address, demo_pb2_grpc.CurrencyServiceStub, self.pool_size)
     
-    def close(self):
-        """Close the gRPC connection."""
-        if self.channel:
-            self.channel.close()
-            self.channel = None
-            self.stub = None
+    async def warm_up(self, timeout: float = 2.0) -> bool:
+        """Open the pooled channels from inside the event loop, ahead of the first call."""
+        self.connect()
+        return await self.pool.warm_up(timeout)
+    
+    async def close(self):
+        """Close the gRPC connections."""
+        if self.pool:
+            pool, self.pool = self.pool, None
+            await pool.close()
     
-    def get_supported_currencies(self) -> List[str]:
+    async def get_supported_currencies(self) -> List[str]:
         """Get list of supported currency codes."""
+        cached = _currencies_cache.get(self.address)
+        if cached and time.monotonic() < cached[0]:
+            return list(cached[1])
+        
         self.connect()
-        try:
-            request = demo_pb2.Empty()
-            response = self.stub.GetSupportedCurrencies(request)
-            return list(response.currency_codes)
-        except grpc.RpcError as e:
-            raise Exception(f"Failed to get supported currencies: {e.details()}")
+        request = demo_pb2.Empty()
+        response = await self.pool.stub().GetSupportedCurrencies(request)
+        currencies = list(response.currency_codes)
+        _currencies_cache[self.address] = (time.monotonic() + CURRENCIES_TTL_SECONDS, currencies)
+        return list(currencies)
     
-    def convert_currency(self, from_currency: str, to_currency: str, 
+    async def convert_currency(self, from_currency: str, to_currency: str, 
                         units: int, nanos: int = 0) -> Dict[str, Any]:
-        """Convert currency from one type to another."""
+        """Convert currency from one type to another.
+        
+        While a rate table from get_exchange_rates is fresh, the conversion is computed locally
+        through the EUR pivot instead of calling the service.
+        """
+        cached = _rates_cache.get(self.address)
+        if cached and time.monotonic() < cached[0]:
+            rates = cached[1]
+            if from_currency in rates and to_currency in rates:
+                amount = (units + nanos / 1e9) / rates[from_currency] * rates[to_currency]
+                # Round to whole nanos first so float error can't leave nanos at 1e9
+                converted_units, converted_nanos = _split_nanos(round(amount * 1e9))
+                return {
+                    "currency_code": to_currency,
+                    "units": converted_units,
+                    "nanos": converted_nanos
+                }
+        
         self.connect()
-        try:
-            from_money = demo_pb2.Money(
-                currency_code=from_currency,
-                units=units,
-                nanos=nanos
-            )
-            
-            request = demo_pb2.CurrencyConversionRequest()
-            getattr(request, 'from').CopyFrom(from_money)
-            request.to_code = to_currency
-            
-            response = self.stub.Convert(request)
-            
-            return {
-                "currency_code": response.currency_code,
-                "units": response.units,
-                "nanos": response.nanos
-            }
-        except grpc.RpcError as e:
-            raise Exception(f"Failed to convert currency: {e.details()}")
+        # Fill the embedded Money in place rather than building one and copying it in.
+        # Each call needs its own request: grpc.aio serializes it after this coroutine yields.
+        request = demo_pb2.CurrencyConversionRequest(to_code=to_currency)
+        from_money = _from_money(request)
+        from_money.currency_code = from_currency
+        from_money.units = units
+        from_money.nanos = nanos
+        
+        response = await self.pool.stub().Convert(request)
+        
+        return {
+            "currency_code": response.currency_code,
+            "units": response.units,
+            "nanos": response.nanos
+        }
     
-    def get_exchange_rates(self) -> Dict[str, float]:
+    async def get_exchange_rates(self) -> Dict[str, float]:
         """Get exchange rates for all supported currencies (relative to EUR)."""
         # Note: This is a convenience method that uses the conversion logic
         # to get rates by converting 1 EUR to each supported currency
+        cached = _rates_cache.get(self.address)
+        if cached and time.monotonic() < cached[0]:
+            return dict(cached[1])
+        
         self.connect()
-        try:
-            currencies = self.get_supported_currencies()
-            rates = {}
-            
-            for currency in currencies:
-                if currency == "EUR":
-                    rates[currency] = 1.0
-                else:
-                    try:
-                        result = self.convert_currency("EUR", currency, 1, 0)
-                        # Convert to float: units + nanos/1000000000
-                        rate = float(result["units"]) + float(result["nanos"]) / 1000000000.0
-                        rates[currency] = rate
-                    except Exception as e:
-                        # If conversion fails, skip this currency
-                        print(f"Warning: Could not get rate for {currency}: {e}")
-                        continue
-            
-            return rates
-        except Exception as e:
-            raise Exception(f"Failed to get exchange rates: {e}") 
\ No newline at end of file
+        currencies = await self.get_supported_currencies()
+        targets = [currency for currency in currencies if currency != "EUR"]
+        rates = {"EUR": 1.0} if "EUR" in currencies else {}
+        
+        # Conversions are independent, so issue them all at once: one round trip instead of N
+        results = await asyncio.gather(
+            *(self.convert_currency("EUR", currency, 1, 0) for currency in targets),
+            return_exceptions=True
+        )
+        complete = True
+        for currency, result in zip(targets, results):
+            if isinstance(result, Exception):
+                # If conversion fails, skip this currency
+                print(f"Warning: Could not get rate for {currency}: {result}")
+                complete = False
+                continue
+            # Convert to float: units + nanos/1000000000
+            rates[currency] = float(result["units"]) + float(result["nanos"]) / 1000000000.0
+        
+        ttl = RATES_TTL_SECONDS if complete else PARTIAL_RATES_TTL_SECONDS
+        _rates_cache[self.address] = (time.monotonic() + ttl, rates)
+        return dict(rates)
+
+_SINGLETON: Optional[CurrencyServiceClient] = None
+_LOCK = threading.Lock()
+
+
+def get_currency_client(address: Optional[str] = None) -> CurrencyServiceClient:
+    """Process-wide CurrencyServiceClient sharing one channel pool; the first call's address wins."""
+    global _SINGLETON
+    if _SINGLETON is None:
+        with _LOCK:
+            if _SINGLETON is None:
+                _SINGLETON = CurrencyServiceClient(address=address)
+    return _SINGLETON
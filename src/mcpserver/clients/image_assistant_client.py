@@ -1,38 +1,61 @@
-import grpc
+import asyncio
+import hashlib
+import threading
 import logging
-from typing import Optional
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
 
 # Import the generated protobuf files
 from genproto import imageassistant_pb2
 from genproto import imageassistant_pb2_grpc
 
+from clients.channel_pool import ChannelPool
+
 logger = logging.getLogger(__name__)
 
+# Demo scenes are analyzed over and over; keep the most recent analyses so repeats skip the RPC entirely
+ANALYSIS_CACHE_MAXSIZE = 64
+
 class ImageAssistantServiceClient:
     """Client for Image Assistant Service gRPC API."""
     
-    def __init__(self, address: str = "imageassistantservice:8080"):
+    def __init__(self, address: str = "imageassistantservice:8080", pool_size: int = 4):
         """Initialize the Image Assistant Service client.
         
         Args:
             address: The gRPC server address (host:port)
+            pool_size: Number of channels (HTTP/2 connections) calls are spread across
         """
         self.address = address
-        self.channel = None
-        self.stub = None
-        self._connect()
+        self.pool_size = pool_size
+        self.pool = None
+        # (sha256(image_url), context) -> successful AnalyzeImageResponse, least recently used first
+        self._analysis_cache: "OrderedDict[Tuple[str, str], imageassistant_pb2.AnalyzeImageResponse]" = OrderedDict()
+        # AnalyzeImage RPCs in flight by cache key; concurrent requests for one image share a single RPC
+        self._inflight: Dict[Tuple[str, str], asyncio.Task] = {}
+    
+    def _stub(self) -> imageassistant_pb2_grpc.ImageAssistantServiceStub:
+        """Next pooled stub, connecting on first use so the grpc.aio channels bind to the running loop."""
+        if self.pool is None:
+            self._connect()
+        return self.pool.stub()
     
     def _connect(self):
-        """Establish connection to the gRPC server."""
+        """Establish the pooled connections to the gRPC server."""
         try:
-            self.channel = grpc.insecure_channel(self.address)
-            self.stub = imageassistant_pb2_grpc.ImageAssistantServiceStub(self.channel)
+            self.pool = ChannelPool(self.address, imageassistant_pb2_grpc.ImageAssistantServiceStub, self.pool_size)
             logger.info(f"✅ Connected to Image Assistant Service at {self.address}")
         except Exception as e:
             logger.error(f"❌ Failed to connect to Image Assistant Service: {e}")
             raise
     
-    def analyze_image(self, image_url: str, context: Optional[str] = None) -> imageassistant_pb2.AnalyzeImageResponse:
+    async def warm_up(self, timeout: float = 2.0) -> bool:
+        """Open the pooled channels from inside the event loop, ahead of the first call."""
+        if self.pool is None:
+            self._connect()
+        return await self.pool.warm_up(timeout)
+    
+    async def analyze_image(self, image_url: str, context: Optional[str] = None) -> imageassistant_pb2.AnalyzeImageResponse:
         """Analyze an image for objects, scene type, styles, and colors.
         
         Args:
@@ -42,6 +65,21 @@ class ImageAssistantServiceClient:
         Returns:
             AnalyzeImageResponse with analysis results
         """
+        key = (hashlib.sha256(image_url.encode()).hexdigest(), context or "")
+        cached = self._analysis_cache.get(key)
+        if cached is not None:
+            self._analysis_cache.move_to_end(key)
+            return cached
+        
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._analyze(key, image_url, context))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shielded so one caller being cancelled doesn't cancel the RPC for the others
+        return await asyncio.shield(task)
+    
+    async def _analyze(self, key: Tuple[str, str], image_url: str, context: Optional[str]) -> imageassistant_pb2.AnalyzeImageResponse:
         try:
             logger.info(f"🔍 Analyzing image: {image_url}")
             
@@ -50,7 +88,11 @@ class ImageAssistantServiceClient:
                 context=context or ""
             )
             
-            response = self.stub.AnalyzeImage(request)
+            response = await self._stub().AnalyzeImage(request)
+            if response.success:
+                self._analysis_cache[key] = response
+                if len(self._analysis_cache) > ANALYSIS_CACHE_MAXSIZE:
+                    self._analysis_cache.popitem(last=False)
             return response
             
         except Exception as e:
@@ -61,7 +103,7 @@ class ImageAssistantServiceClient:
                 message=str(e)
             )
     
-    def visualize_product(self, base_image_url: str, product_image_url: str, prompt: str) -> imageassistant_pb2.VisualizeProductResponse:
+    async def visualize_product(self, base_image_url: str, product_image_url: str, prompt: str) -> imageassistant_pb2.VisualizeProductResponse:
         """Visualize a product in a user photo using AI.
         
         Args:
@@ -81,7 +123,7 @@ class ImageAssistantServiceClient:
                 prompt=prompt
             )
             
-            response = self.stub.VisualizeProduct(request)
+            response = await self._stub().VisualizeProduct(request)
             return response
             
         except Exception as e:
@@ -92,7 +134,7 @@ class ImageAssistantServiceClient:
                 message=str(e)
             )
     
-    def health_check(self) -> bool:
+    async def health_check(self) -> bool:
         """Check if the service is healthy.
         
         Returns:
@@ -100,14 +142,29 @@ class ImageAssistantServiceClient:
         """
         try:
             request = imageassistant_pb2.HealthCheckRequest()
-            response = self.stub.Check(request)
+            response = await self._stub().Check(request)
             return response.status == imageassistant_pb2.HealthCheckResponse.ServingStatus.SERVING
         except Exception as e:
             logger.error(f"❌ Health check failed: {e}")
             return False
     
-    def close(self):
-        """Close the gRPC connection."""
-        if self.channel:
-            self.channel.close()
-            logger.info("🔌 Disconnected from Image Assistant Service") 
\ No newline at end of file
+    async def close(self):
+        """Close the gRPC connections."""
+        if self.pool:
+            pool, self.pool = self.pool, None
+            await pool.close()
+            logger.info("🔌 Disconnected from Image Assistant Service")
+
+
+_SINGLETON: Optional[ImageAssistantServiceClient] = None
+_LOCK = threading.Lock()
+
+
+def get_image_assistant_client(address: str = "imageassistantservice:8080") -> ImageAssistantServiceClient:
+    """Process-wide ImageAssistantServiceClient sharing one channel pool; the first call's address wins."""
+    global _SINGLETON
+    if _SINGLETON is None:
+        with _LOCK:
+            if _SINGLETON is None:
+                _SINGLETON = ImageAssistantServiceClient(address=address)
+    return _SINGLETON
@@ -1,9 +1,17 @@
-import grpc
-from typing import Optional, List
+import asyncio
+import threading
+import time
+from typing import Any, Dict, Optional, List, Set, Tuple
 
 # Import from genproto package
 from genproto import demo_pb2, demo_pb2_grpc
 
+from clients.channel_pool import ChannelPool
+
+# The catalog is near-static, so reads are served from memory for a minute before re-fetching
+CATALOG_CACHE_TTL_SECONDS = 60
+CATALOG_CACHE_MAXSIZE = 1024
+
 
 class ProductCatalogServiceClient:
     """
@@ -15,48 +23,142 @@ class ProductCatalogServiceClient:
     - Keep network/serialization details out of tool logic
     """
     
-    def __init__(self, host: str = "productcatalogservice:3550", insecure: bool = True) -> None:
+    def __init__(self, host: str = "productcatalogservice:3550", insecure: bool = True, pool_size: int = 4) -> None:
         self._host = host
-        self._channel: Optional[grpc.Channel] = None
-        self._stub: Optional[demo_pb2_grpc.ProductCatalogServiceStub] = None
+        self._pool: Optional[ChannelPool[demo_pb2_grpc.ProductCatalogServiceStub]] = None
         self._insecure = insecure
+        self._pool_size = pool_size
+        # (method, key) -> (expiry, response); cached protos are shared, so callers must not mutate them
+        self._cache: Dict[Tuple[str, Any], Tuple[float, Any]] = {}
+        # Speculative get_product calls in flight; held so the tasks aren't garbage collected
+        self._prefetches: Set[asyncio.Task] = set()
+        # get_product RPCs in flight by product id; concurrent callers for one id share a single RPC
+        self._inflight: Dict[str, asyncio.Task] = {}
     
     def connect(self) -> None:
-        if self._channel is None:
-            self._channel = grpc.insecure_channel(self._host) if self._insecure else grpc.secure_channel(self._host, grpc.ssl_channel_credentials())
-            self._stub = demo_pb2_grpc.ProductCatalogServiceStub(self._channel)
+        if self._pool is None:
+            self._pool = ChannelPool(self._host, demo_pb2_grpc.ProductCatalogServiceStub, self._pool_size, self._insecure)
     
-    def close(self) -> None:
-        if self._channel is not None:
-            self._channel.close()
-            self._channel = None
-            self._stub = None
+    async def warm_up(self, timeout: float = 2.0) -> bool:
+        """Open the pooled channels from inside the event loop, ahead of the first call."""
+        self.connect()
+        return await self._pool.warm_up(timeout)  # type: ignore[union-attr]
+    
+    async def close(self) -> None:
+        # Speculative lookups still in flight would otherwise fail against the closed channels
+        for task in self._prefetches:
+            task.cancel()
+        if self._pool is not None:
+            pool, self._pool = self._pool, None
+            await pool.close()
     
     # Product catalog operations
-    def list_products(self) -> demo_pb2.ListProductsResponse:
+    async def list_products(self) -> demo_pb2.ListProductsResponse:
         """Get all products from the catalog."""
+        key = ("list_products", ())
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
         self._ensure_connected()
         request = demo_pb2.Empty()
-        return self._stub.ListProducts(request)  # type: ignore[arg-type]
+        response = await self._stub().ListProducts(request)  # type: ignore[arg-type]
+        self._cache_put(key, response)
+        return response
     
-    def get_product(self, product_id: str) -> demo_pb2.Product:
+    async def get_product(self, product_id: str) -> demo_pb2.Product:
         """Get a specific product by ID."""
+        cached = self._cache_get(("get_product", product_id))
+        if cached is not None:
+            return cached
+        task = self._inflight.get(product_id)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_product(product_id))
+            self._inflight[product_id] = task
+            task.add_done_callback(lambda _: self._inflight.pop(product_id, None))
+        # Shielded so one caller being cancelled doesn't cancel the RPC for the others
+        return await asyncio.shield(task)
+    
+    async def _fetch_product(self, product_id: str) -> demo_pb2.Product:
         self._ensure_connected()
         request = demo_pb2.GetProductRequest(id=product_id)
-        return self._stub.GetProduct(request)  # type: ignore[arg-type]
+        response = await self._stub().GetProduct(request)  # type: ignore[arg-type]
+        self._cache_put(("get_product", product_id), response)
+        return response
     
-    def search_products(self, query: str) -> demo_pb2.SearchProductsResponse:
-        """Search products by query string."""
-        self._ensure_connected()
-        request = demo_pb2.SearchProductsRequest(query=query)
-        return self._stub.SearchProducts(request)  # type: ignore[arg-type]
+    async def search_products(self, query: str, prefetch_top: int = 5) -> demo_pb2.SearchProductsResponse:
+        """Search products by query string.
+        
+        The top `prefetch_top` hits are fetched with get_product in the background, since
+        callers usually look them up next; those lookups then hit the cache.
+        """
+        # Catalog search is case-insensitive, so equivalent queries share one entry
+        key = ("search_products", query.lower().strip())
+        response = self._cache_get(key)
+        if response is None:
+            self._ensure_connected()
+            request = demo_pb2.SearchProductsRequest(query=query)
+            response = await self._stub().SearchProducts(request)  # type: ignore[arg-type]
+            self._cache_put(key, response)
+        if prefetch_top > 0:
+            self._prefetch_products(product.id for product in response.results[:prefetch_top])
+        return response
     
-    def semantic_search_products(self, query: str, limit: int = 10) -> demo_pb2.SearchProductsResponse:
+    async def semantic_search_products(self, query: str, limit: int = 10) -> demo_pb2.SearchProductsResponse:
         """Search products using semantic search with AI embeddings."""
         self._ensure_connected()
         request = demo_pb2.SemanticSearchRequest(query=query, limit=limit)
-        return self._stub.SemanticSearchProducts(request)  # type: ignore[arg-type]
+        return await self._stub().SemanticSearchProducts(request)  # type: ignore[arg-type]
+    
+    def _prefetch_products(self, product_ids) -> None:
+        for product_id in product_ids:
+            if self._cache_get(("get_product", product_id)) is None:
+                task = asyncio.create_task(self._prefetch_product(product_id))
+                self._prefetches.add(task)
+                task.add_done_callback(self._prefetches.discard)
+    
+    async def _prefetch_product(self, product_id: str) -> None:
+        try:
+            await self.get_product(product_id)
+        except Exception:
+            # Speculative, and may race close(); a real get_product call will surface the error
+            pass
+    
+    def invalidate(self) -> None:
+        """Drop every cached catalog response."""
+        self._cache.clear()
+    
+    def _cache_get(self, key: Tuple[str, Any]) -> Any:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() >= entry[0]:
+            del self._cache[key]
+            return None
+        return entry[1]
+    
+    def _cache_put(self, key: Tuple[str, Any], response: Any) -> None:
+        if len(self._cache) >= CATALOG_CACHE_MAXSIZE:
+            # Evict the oldest insertion; dicts keep insertion order
+            self._cache.pop(next(iter(self._cache)))
+        self._cache[key] = (time.monotonic() + CATALOG_CACHE_TTL_SECONDS, response)
+    
+    def _stub(self) -> demo_pb2_grpc.ProductCatalogServiceStub:
+        return self._pool.stub()  # type: ignore[union-attr]
     
     def _ensure_connected(self) -> None:
-        if self._stub is None:
+        if self._pool is None:
             self.connect()
+
+
+_SINGLETON: Optional[ProductCatalogServiceClient] = None
+_LOCK = threading.Lock()
+
+
+def get_product_client(host: str = "productcatalogservice:3550") -> ProductCatalogServiceClient:
+    """Process-wide ProductCatalogServiceClient sharing one channel pool; the first call's address wins."""
+    global _SINGLETON
+    if _SINGLETON is None:
+        with _LOCK:
+            if _SINGLETON is None:
+                _SINGLETON = ProductCatalogServiceClient(host=host)
+    return _SINGLETON
@@ -1,24 +1,69 @@
-import grpc
+import functools
+import threading
+from typing import Optional
 
 # Import from genproto package
 from genproto import review_pb2, review_pb2_grpc
 
+from clients.channel_pool import ChannelPool
+
+
+# Read requests are rebuilt with identical arguments over and over (the same product page, the same
+# summary), so memoize them. A request is only serialized, never mutated, after it is built, which
+# makes one instance safe to share between concurrent calls; per-call mutable templates would not be,
+# since grpc.aio serializes a request after the calling coroutine has yielded.
+@functools.lru_cache(maxsize=256)
+def _product_reviews_request(product_id: str, limit: int, offset: int) -> review_pb2.GetProductReviewsRequest:
+    return review_pb2.GetProductReviewsRequest(product_id=product_id, limit=limit, offset=offset)
+
+
+@functools.lru_cache(maxsize=256)
+def _user_reviews_request(user_id: str, limit: int, offset: int) -> review_pb2.GetUserReviewsRequest:
+    return review_pb2.GetUserReviewsRequest(user_id=user_id, limit=limit, offset=offset)
+
+
+@functools.lru_cache(maxsize=256)
+def _review_request(review_id: int) -> review_pb2.GetReviewRequest:
+    return review_pb2.GetReviewRequest(review_id=review_id)
+
+
+@functools.lru_cache(maxsize=256)
+def _review_summary_request(product_id: str) -> review_pb2.GetProductReviewSummaryRequest:
+    return review_pb2.GetProductReviewSummaryRequest(product_id=product_id)
+
 
 class ReviewServiceClient:
     """gRPC client for the Review Service."""
     
-    def __init__(self, host: str = "reviewservice:8080"):
+    def __init__(self, host: str = "reviewservice:8080", pool_size: int = 4):
         """
         Initialize the Review Service client.
         
         Args:
             host: The gRPC server address (host:port)
+            pool_size: Number of channels (HTTP/2 connections) calls are spread across
         """
         self.host = host
-        self.channel = grpc.insecure_channel(host)
-        self.stub = review_pb2_grpc.ReviewServiceStub(self.channel)
+        self.pool_size = pool_size
+        self.pool = None
+    
+    def connect(self):
+        """Create the pooled grpc.aio channels; must run inside the event loop."""
+        if self.pool is None:
+            self.pool = ChannelPool(self.host, review_pb2_grpc.ReviewServiceStub, self.pool_size)
     
-    def create_review(self, user_id: str, product_id: str, rating: int, review_text: str = ""):
+    def _stub(self) -> review_pb2_grpc.ReviewServiceStub:
+        """Next pooled stub; the grpc.aio channels are created on first use, inside the event loop."""
+        if self.pool is None:
+            self.connect()
+        return self.pool.stub()
+    
+    async def warm_up(self, timeout: float = 2.0) -> bool:
+        """Open the pooled channels from inside the event loop, ahead of the first call."""
+        self.connect()
+        return await self.pool.warm_up(timeout)
+    
+    async def create_review(self, user_id: str, product_id: str, rating: int, review_text: str = ""):
         """Create a new review."""
         request = review_pb2.CreateReviewRequest(
             user_id=user_id,
@@ -26,51 +71,54 @@ class ReviewServiceClient:
             rating=rating,
             review_text=review_text
         )
-        return self.stub.CreateReview(request)
+        return await self._stub().CreateReview(request)
     
-    def get_product_reviews(self, product_id: str, limit: int = 50, offset: int = 0):
+    async def get_product_reviews(self, product_id: str, limit: int = 50, offset: int = 0):
         """Get reviews for a specific product."""
-        request = review_pb2.GetProductReviewsRequest(
-            product_id=product_id,
-            limit=limit,
-            offset=offset
-        )
-        return self.stub.GetProductReviews(request)
+        return await self._stub().GetProductReviews(_product_reviews_request(product_id, limit, offset))
     
-    def get_user_reviews(self, user_id: str, limit: int = 50, offset: int = 0):
+    async def get_user_reviews(self, user_id: str, limit: int = 50, offset: int = 0):
         """Get reviews by a specific user."""
-        request = review_pb2.GetUserReviewsRequest(
-            user_id=user_id,
-            limit=limit,
-            offset=offset
-        )
-        return self.stub.GetUserReviews(request)
+        return await self._stub().GetUserReviews(_user_reviews_request(user_id, limit, offset))
     
-    def get_review(self, review_id: int):
+    async def get_review(self, review_id: int):
         """Get a specific review by ID."""
-        request = review_pb2.GetReviewRequest(review_id=review_id)
-        return self.stub.GetReview(request)
+        return await self._stub().GetReview(_review_request(review_id))
     
-    def update_review(self, review_id: int, rating: int, review_text: str = ""):
+    async def update_review(self, review_id: int, rating: int, review_text: str = ""):
         """Update an existing review."""
         request = review_pb2.UpdateReviewRequest(
             review_id=review_id,
             rating=rating,
             review_text=review_text
         )
-        return self.stub.UpdateReview(request)
+        return await self._stub().UpdateReview(request)
     
-    def delete_review(self, review_id: int):
+    async def delete_review(self, review_id: int):
         """Delete a review."""
         request = review_pb2.DeleteReviewRequest(review_id=review_id)
-        return self.stub.DeleteReview(request)
+        return await self._stub().DeleteReview(request)
     
-    def get_product_review_summary(self, product_id: str):
+    async def get_product_review_summary(self, product_id: str):
         """Get review summary for a product."""
-        request = review_pb2.GetProductReviewSummaryRequest(product_id=product_id)
-        return self.stub.GetProductReviewSummary(request)
+        return await self._stub().GetProductReviewSummary(_review_summary_request(product_id))
     
-    def close(self):
-        """Close the gRPC channel."""
-        if self.channel:
-            self.channel.close() 
\ No newline at end of file
+    async def close(self):
+        """Close the gRPC channels."""
+        if self.pool:
+            pool, self.pool = self.pool, None
+            await pool.close()
+
+
+_SINGLETON: Optional[ReviewServiceClient] = None
+_LOCK = threading.Lock()
+
+
+def get_review_client(host: str = "reviewservice:8080") -> ReviewServiceClient:
+    """Process-wide ReviewServiceClient sharing one channel pool; the first call's address wins."""
+    global _SINGLETON
+    if _SINGLETON is None:
+        with _LOCK:
+            if _SINGLETON is None:
+                _SINGLETON = ReviewServiceClient(host=host)
+    return _SINGLETON
@@ -7,15 +7,54 @@ AI-powered product recommendations based on user queries and room images.
 """
 
 import os
+import json
 import logging
+import httpx
 import requests
 import base64
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Dict, Any, Optional
 from io import BytesIO
-from PIL import Image
+
+try:
+    # SIMD base64 codec; returns str directly, skipping the ascii decode copy
+    from pybase64 import b64decode, b64encode_as_string
+except ImportError:
+    from base64 import b64decode
+    
+    def b64encode_as_string(data) -> str:
+        return base64.b64encode(data).decode('ascii')
+
+try:
+    # Serializes straight to bytes with SIMD string escaping; large image data URLs dominate payloads
+    from orjson import dumps as json_dumps
+except ImportError:
+    def json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode('utf-8')
 
 logger = logging.getLogger(__name__)
 
+_DEFAULT_HEADERS = {
+    'Accept': 'application/json'
+}
+
+# Set per request rather than on the session, so multipart posts get their own boundary Content-Type
+_JSON_CONTENT = {
+    'Content-Type': 'application/json'
+}
+
+_ENCODE_CHUNK_BYTES = 3 * 1024 * 1024
+
+# Longest side sent to the shopping assistant; room photos gain nothing for the vision model beyond this
+_MAX_IMAGE_SIDE = 1536
+
+# Leading signature bytes of formats that can be passed through without re-encoding
+_MAGIC = {
+    "JPEG": b'\xff\xd8\xff',
+    "PNG": b'\x89PNG\r\n\x1a\n',
+}
+
 
 class ShoppingAssistantServiceClient:
     """Client for Shopping Assistant Service HTTP operations."""
@@ -25,48 +64,117 @@ class ShoppingAssistantServiceClient:
         # Ensure http:// prefix for HTTP requests
         if not self.address.startswith(('http://', 'https://')):
             self.address = f"http://{self.address}"
+        # Built once; rstrip keeps an address given with a trailing slash from producing "//"
+        self._endpoint_url = self.address.rstrip('/') + '/'
+        self._healthz_url = self._endpoint_url + 'healthz'
         
         self.session = requests.Session()
-        self.session.headers.update({
-            'Content-Type': 'application/json',
-            'Accept': 'application/json'
-        })
+        self.session.headers.update(_DEFAULT_HEADERS)
+        # Size the keep-alive pool for concurrent callers (the default keeps 10 connections, so bursts
+        # reconnect) and retry connection failures and gateway errors briefly; urllib3 only retries
+        # status codes for idempotent methods, so recommendation POSTs are never sent twice
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=64,
+            max_retries=Retry(total=2, backoff_factor=0.1, status_forcelist=[502, 503, 504])
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        # Keep-alive pool for calls made from the event loop; created on first use
+        self._aclient: Optional[httpx.AsyncClient] = None
     
     def close(self):
         """Close the HTTP session."""
         if self.session:
             self.session.close()
     
+    async def aclose(self):
+        """Close the async HTTP client."""
+        if self._aclient:
+            aclient, self._aclient = self._aclient, None
+            await aclient.aclose()
+    
+    def _async_client(self) -> httpx.AsyncClient:
+        if self._aclient is None:
+            self._aclient = httpx.AsyncClient(
+                headers=_DEFAULT_HEADERS,
+                limits=httpx.Limits(max_keepalive_connections=20, keepalive_expiry=60)
+            )
+        return self._aclient
+    
+    @staticmethod
+    def _build_payload(user_message: str, image_data: Optional[str]) -> Dict[str, Any]:
+        payload = {
+            "message": user_message
+        }
+        
+        if image_data:
+            payload["image"] = image_data
+        
+        return payload
+    
     def get_ai_recommendations(self, user_message: str, image_data: Optional[str] = None) -> Dict[str, Any]:
         """
         Get AI-powered product recommendations based on user query and optional room image.
         
         Args:
             user_message: User's request/query for product recommendations
-            image_data: Optional base64-encoded image data of the room
+            image_data: Optional room image as a full base64 data URL (data:image/...;base64,...),
+                as returned by encode_image_file/encode_image_bytes; it is sent as-is
             
         Returns:
             dict: Response containing AI recommendations and product IDs
         """
         try:
-            payload = {
-                "message": user_message
-            }
-            
-            if image_data:
-                # Ensure proper base64 format for image
-                if not image_data.startswith('data:image'):
-                    # Add data URL prefix if missing
-                    payload["image"] = f"data:image/jpeg;base64,{image_data}"
-                else:
-                    payload["image"] = image_data
+            payload = self._build_payload(user_message, image_data)
             
             logger.info(f"Sending request to shopping assistant: {self.address}")
             logger.debug(f"Request payload: {user_message[:100]}...")
             
             response = self.session.post(
-                f"{self.address}/",
-                json=payload,
+                self._endpoint_url,
+                data=json_dumps(payload),
+                headers=_JSON_CONTENT,
+                timeout=30  # Generous timeout for AI processing
+            )
+            
+            response.raise_for_status()
+            result = response.json()
+            
+            logger.info("Successfully received AI recommendations")
+            return result
+            
+        except requests.exceptions.ConnectionError as e:
+            raise Exception(f"Failed to connect to shopping assistant service at {self.address}: {e}")
+        except requests.exceptions.Timeout as e:
+            raise Exception(f"Shopping assistant service request timed out: {e}")
+        except requests.exceptions.HTTPError as e:
+            raise Exception(f"Shopping assistant service returned error {response.status_code}: {e}")
+        except Exception as e:
+            raise Exception(f"Failed to get AI recommendations: {e}")
+    
+    async def aget_ai_recommendations(self, user_message: str, image_data: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Async get_ai_recommendations for use inside the event loop; the request does not block it.
+        
+        Args:
+            user_message: User's request/query for product recommendations
+            image_data: Optional room image as a full base64 data URL (data:image/...;base64,...),
+                as returned by encode_image_file/encode_image_bytes; it is sent as-is
+            
+        Returns:
+            dict: Response containing AI recommendations and product IDs
+        """
+        try:
+            payload = self._build_payload(user_message, image_data)
+            
+            logger.info(f"Sending request to shopping assistant: {self.address}")
+            logger.debug(f"Request payload: {user_message[:100]}...")
+            
+            response = await self._async_client().post(
+                self._endpoint_url,
+                content=json_dumps(payload),
+                headers=_JSON_CONTENT,
                 timeout=30  # Generous timeout for AI processing
             )
             
@@ -76,6 +184,43 @@ class ShoppingAssistantServiceClient:
             logger.info("Successfully received AI recommendations")
             return result
             
+        except httpx.ConnectError as e:
+            raise Exception(f"Failed to connect to shopping assistant service at {self.address}: {e}")
+        except httpx.TimeoutException as e:
+            raise Exception(f"Shopping assistant service request timed out: {e}")
+        except httpx.HTTPStatusError as e:
+            raise Exception(f"Shopping assistant service returned error {e.response.status_code}: {e}")
+        except Exception as e:
+            raise Exception(f"Failed to get AI recommendations: {e}")
+    
+    def get_ai_recommendations_binary(self, user_message: str, image_bytes: bytes, mime: str = "image/jpeg") -> Dict[str, Any]:
+        """
+        Get AI recommendations, uploading the room image as raw bytes in a multipart/form-data body.
+        
+        Skips the base64 encode and JSON escaping of the image, and sends a third fewer bytes than
+        the data URL path. Use get_ai_recommendations for services that only accept JSON.
+        
+        Args:
+            user_message: User's request/query for product recommendations
+            image_bytes: Raw image file contents
+            mime: MIME type of the image
+            
+        Returns:
+            dict: Response containing AI recommendations and product IDs
+        """
+        try:
+            logger.info(f"Sending multipart request to shopping assistant: {self.address}")
+            
+            response = self.session.post(
+                self._endpoint_url,
+                data={"message": user_message},
+                files={"image": ("room", image_bytes, mime)},
+                timeout=30  # Generous timeout for AI processing
+            )
+            
+            response.raise_for_status()
+            return response.json()
+            
         except requests.exceptions.ConnectionError as e:
             raise Exception(f"Failed to connect to shopping assistant service at {self.address}: {e}")
         except requests.exceptions.Timeout as e:
@@ -85,21 +230,59 @@ class ShoppingAssistantServiceClient:
         except Exception as e:
             raise Exception(f"Failed to get AI recommendations: {e}")
     
-    def encode_image_file(self, image_path: str) -> str:
+    async def aget_ai_recommendations_binary(self, user_message: str, image_bytes: bytes, mime: str = "image/jpeg") -> Dict[str, Any]:
+        """
+        Async get_ai_recommendations_binary for use inside the event loop.
+        
+        Args:
+            user_message: User's request/query for product recommendations
+            image_bytes: Raw image file contents
+            mime: MIME type of the image
+            
+        Returns:
+            dict: Response containing AI recommendations and product IDs
+        """
+        try:
+            logger.info(f"Sending multipart request to shopping assistant: {self.address}")
+            
+            response = await self._async_client().post(
+                self._endpoint_url,
+                data={"message": user_message},
+                files={"image": ("room", image_bytes, mime)},
+                timeout=30  # Generous timeout for AI processing
+            )
+            
+            response.raise_for_status()
+            return response.json()
+            
+        except httpx.ConnectError as e:
+            raise Exception(f"Failed to connect to shopping assistant service at {self.address}: {e}")
+        except httpx.TimeoutException as e:
+            raise Exception(f"Shopping assistant service request timed out: {e}")
+        except httpx.HTTPStatusError as e:
+            raise Exception(f"Shopping assistant service returned error {e.response.status_code}: {e}")
+        except Exception as e:
+            raise Exception(f"Failed to get AI recommendations: {e}")
+    
+    def encode_image_file(self, image_path: str, format: str = "JPEG") -> str:
         """
-        Encode an image file to base64 string.
+        Encode an image file to a base64 data URL.
         
         Args:
             image_path: Path to the image file
+            format: Image format of the file (JPEG, PNG, etc.)
             
         Returns:
-            str: Base64 encoded image data
+            str: Base64 encoded image data with data URL prefix
         """
         try:
+            # Encode in 3 MiB chunks so the whole file is never held alongside its encoding; each
+            # chunk is a multiple of 3 bytes, so the joined pieces equal a single encode of the file
             with open(image_path, "rb") as image_file:
-                image_data = image_file.read()
-                encoded = base64.b64encode(image_data).decode('utf-8')
-                return encoded
+                pieces = [f"data:image/{format.lower()};base64,"]
+                while chunk := image_file.read(_ENCODE_CHUNK_BYTES):
+                    pieces.append(b64encode_as_string(chunk))
+                return "".join(pieces)
         except Exception as e:
             raise Exception(f"Failed to encode image file {image_path}: {e}")
     
@@ -114,28 +297,62 @@ class ShoppingAssistantServiceClient:
         Returns:
             str: Base64 encoded image data with data URL prefix
         """
+        # Pillow and its codec libraries cost startup time and memory, and most MCP server
+        # processes never encode an image; after the first call this import is a sys.modules lookup
+        from PIL import Image
+        
         try:
-            # Convert to PIL Image to ensure proper format
+            mime_type = f"image/{format.lower()}"
+            
+            # Image.open only parses the header here; pixels are decoded on first use
             image = Image.open(BytesIO(image_bytes))
+            oversized = max(image.size) > _MAX_IMAGE_SIDE
+            
+            # Bytes already in the requested format and size go out as-is, skipping a full decode + re-encode
+            magic = _MAGIC.get(format.upper())
+            if magic and image_bytes.startswith(magic) and not oversized:
+                return f"data:{mime_type};base64,{b64encode_as_string(image_bytes)}"
+            
+            # Resolution past what the vision model uses only inflates the payload
+            if oversized:
+                image.thumbnail((_MAX_IMAGE_SIDE, _MAX_IMAGE_SIDE), Image.Resampling.LANCZOS)
             
             # Convert to RGB if necessary (for JPEG)
             if format.upper() == "JPEG" and image.mode != "RGB":
                 image = image.convert("RGB")
             
-            # Save to bytes
-            buffer = BytesIO()
-            image.save(buffer, format=format.upper())
-            buffer.seek(0)
+            # Tuned Huffman tables and progressive scans give a noticeably smaller JPEG than Pillow's defaults
+            save_options = {"quality": 85, "optimize": True, "progressive": True} if format.upper() == "JPEG" else {}
             
-            # Encode to base64
-            encoded = base64.b64encode(buffer.getvalue()).decode('utf-8')
-            mime_type = f"image/{format.lower()}"
+            # Save to bytes and encode straight from the buffer's memory, without copying it out;
+            # the with block releases the re-encoded image even if encoding fails
+            with BytesIO() as buffer:
+                image.save(buffer, format=format.upper(), **save_options)
+                encoded = b64encode_as_string(buffer.getbuffer())
             
             return f"data:{mime_type};base64,{encoded}"
             
         except Exception as e:
             raise Exception(f"Failed to encode image bytes: {e}")
     
+    def decode_image_b64(self, data: str) -> bytes:
+        """
+        Decode a base64 image, e.g. one returned by the shopping assistant, back to bytes.
+        
+        Args:
+            data: Base64 image data, with or without a data URL prefix
+            
+        Returns:
+            bytes: Raw image bytes
+        """
+        _, _, encoded = data.rpartition(";base64,")
+        try:
+            # validate=True rejects whitespace and other non-alphabet characters instead of silently
+            # dropping them, so a corrupted payload fails here rather than inside PIL's decoder
+            return b64decode(encoded, validate=True)
+        except Exception as e:
+            raise Exception(f"Failed to decode base64 image: {e}")
+    
     def health_check(self) -> Dict[str, Any]:
         """
         Check if the shopping assistant service is healthy.
@@ -144,11 +361,10 @@ class ShoppingAssistantServiceClient:
             dict: Health status information
         """
         try:
-            # Try a simple request to check connectivity
-            response = self.session.post(
-                f"{self.address}/",
-                json={"message": "health check"},
-                timeout=5
+            # A cheap probe endpoint; posting to / would run the whole recommendation pipeline
+            response = self.session.get(
+                self._healthz_url,
+                timeout=2
             )
             
             if response.status_code == 200:
@@ -1,11 +1,11 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class AddToCartRequest(BaseModel):
-    user_id: str
-    product_id: str
-    quantity: int
+    user_id: str = Field(..., description="User identifier")
+    product_id: str = Field(..., description="Product ID to add")
+    quantity: int = Field(..., description="Quantity to add")
 
 
 class CartRequest(BaseModel):
-    user_id: str
+    user_id: str = Field(..., description="User identifier")
@@ -1,19 +1,19 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional
 
 
 class ProductSearchRequest(BaseModel):
-    query: str
+    query: str = Field(..., description="Search query")
 
 
 class ProductByIdRequest(BaseModel):
-    product_id: str
+    product_id: str = Field(..., description="Product ID to retrieve")
 
 
 class ProductByCategoryRequest(BaseModel):
-    category: str
+    category: str = Field(..., description="Category to filter by")
 
 
 class SemanticSearchRequest(BaseModel):
-    query: str
-    limit: Optional[int] = 10
+    query: str = Field(..., description="Natural language search query")
+    limit: Optional[int] = Field(10, description="Maximum number of results (default: 10, max: 50)")
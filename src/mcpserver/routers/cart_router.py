@@ -5,6 +5,7 @@ from fastapi import APIRouter, HTTPException
 
 from models.cart import AddToCartRequest, CartRequest
 from tools.cart_tool import CartTools
+from routers.tool_schema import MCP_TOOL
 
 logger = logging.getLogger(__name__)
 
@@ -20,11 +21,11 @@ def set_cart_tools(tools: CartTools):
     cart_tools = tools
 
 
-@router.post("/add")
+@router.post("/add", openapi_extra=MCP_TOOL)
 async def add_to_cart(request: AddToCartRequest) -> Dict[str, Any]:
     """Add item to user's shopping cart."""
     try:
-        result = cart_tools.add_to_cart(
+        result = await cart_tools.add_to_cart(
             user_id=request.user_id,
             product_id=request.product_id,
             quantity=request.quantity
@@ -35,22 +36,22 @@ async def add_to_cart(request: AddToCartRequest) -> Dict[str, Any]:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/get")
+@router.post("/get", openapi_extra=MCP_TOOL)
 async def get_cart_contents(request: CartRequest) -> Dict[str, Any]:
     """Get contents of user's shopping cart."""
     try:
-        result = cart_tools.get_cart_contents(user_id=request.user_id)
+        result = await cart_tools.get_cart_contents(user_id=request.user_id)
         return result
     except Exception as e:
         logger.error(f"Error in get_cart_contents: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/clear")
+@router.post("/clear", openapi_extra=MCP_TOOL)
 async def clear_cart(request: CartRequest) -> Dict[str, Any]:
     """Clear user's shopping cart."""
     try:
-        result = cart_tools.clear_cart(user_id=request.user_id)
+        result = await cart_tools.clear_cart(user_id=request.user_id)
         return result
     except Exception as e:
         logger.error(f"Error in clear_cart: {e}")
@@ -2,9 +2,10 @@ import logging
 from typing import Dict, Any
 
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from tools.currency_tools import CurrencyTools
+from routers.tool_schema import MCP_TOOL
 
 logger = logging.getLogger(__name__)
 
@@ -15,14 +16,14 @@ currency_tools: CurrencyTools = None
 
 
 class ConvertCurrencyRequest(BaseModel):
-    from_currency: str
-    to_currency: str
-    amount: float
+    from_currency: str = Field(..., description="Source currency code (e.g., 'USD')")
+    to_currency: str = Field(..., description="Target currency code (e.g., 'EUR')")
+    amount: float = Field(..., description="Amount to convert as decimal")
 
 
 class FormatMoneyRequest(BaseModel):
-    amount: float
-    currency_code: str
+    amount: float = Field(..., description="Amount to format")
+    currency_code: str = Field(..., description="Currency code (e.g., 'USD')")
 
 
 def set_currency_tools(tools: CurrencyTools):
@@ -31,11 +32,11 @@ def set_currency_tools(tools: CurrencyTools):
     currency_tools = tools
 
 
-@router.get("/supported-currencies")
+@router.get("/supported-currencies", openapi_extra=MCP_TOOL)
 async def get_supported_currencies() -> Dict[str, Any]:
     """Get list of all supported currency codes."""
     try:
-        result = currency_tools.get_supported_currencies()
+        result = await currency_tools.get_supported_currencies()
         if not result["success"]:
             raise HTTPException(status_code=500, detail=result["error"])
         return result
@@ -44,11 +45,11 @@ async def get_supported_currencies() -> Dict[str, Any]:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/convert")
+@router.post("/convert", openapi_extra=MCP_TOOL)
 async def convert_currency(request: ConvertCurrencyRequest) -> Dict[str, Any]:
     """Convert currency from one type to another."""
     try:
-        result = currency_tools.convert_currency(
+        result = await currency_tools.convert_currency(
             request.from_currency,
             request.to_currency, 
             request.amount
@@ -61,11 +62,11 @@ async def convert_currency(request: ConvertCurrencyRequest) -> Dict[str, Any]:
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.get("/exchange-rates")
+@router.get("/exchange-rates", openapi_extra=MCP_TOOL)
 async def get_exchange_rates() -> Dict[str, Any]:
     """Get current exchange rates for all supported currencies."""
     try:
-        result = currency_tools.get_exchange_rates()
+        result = await currency_tools.get_exchange_rates()
         if not result["success"]:
             raise HTTPException(status_code=500, detail=result["error"])
         return result
@@ -74,7 +75,7 @@ async def get_exchange_rates() -> Dict[str, Any]:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/format-money")
+@router.post("/format-money", openapi_extra=MCP_TOOL)
 async def format_money(request: FormatMoneyRequest) -> Dict[str, Any]:
     """Format money amount with currency symbol."""
     try:
@@ -3,6 +3,7 @@ from typing import Dict, Any, Optional
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 from tools.image_assistant_tools import ImageAssistantTools
+from routers.tool_schema import MCP_TOOL
 
 logger = logging.getLogger(__name__)
 
@@ -25,7 +26,7 @@ class AnalyzeImageRequest(BaseModel):
 class VisualizeProductRequest(BaseModel):
     base_image_url: str = Field(..., description="URL of the base scene/room image")
     product_image_url: str = Field(..., description="URL of the product image")
-    prompt: str = Field(..., description="Description of how to place the product")
+    prompt: str = Field(..., description="Description of how to place the product (e.g., 'Place this vase on the table')")
 
 # Endpoints
 @router.post("/analyze-image")
@@ -105,12 +106,12 @@ async def health_check_endpoint() -> Dict[str, Any]:
         raise HTTPException(status_code=500, detail="Internal server error")
 
 # MCP Tool endpoints (for direct tool access)
-@router.post("/tools/analyze-image")
+@router.post("/tools/analyze-image", name="analyze_image", openapi_extra=MCP_TOOL)
 async def analyze_image_tool(request: AnalyzeImageRequest) -> Dict[str, Any]:
-    """MCP Tool: Analyze image for objects, scene type, styles, and colors."""
+    """Analyze an image for objects, scene type, styles, and colors using AI."""
     return await analyze_image_endpoint(request)
 
-@router.post("/tools/visualize-product")
+@router.post("/tools/visualize-product", name="visualize_product", openapi_extra=MCP_TOOL)
 async def visualize_product_tool(request: VisualizeProductRequest) -> Dict[str, Any]:
-    """MCP Tool: Visualize product in user photo using AI."""
+    """Visualize a product in a user photo using AI-powered image generation (Nano Banana)."""
     return await visualize_product_endpoint(request) 
\ No newline at end of file
@@ -5,6 +5,7 @@ from fastapi import APIRouter, HTTPException
 
 from models.product_catalog import ProductSearchRequest, ProductByIdRequest, ProductByCategoryRequest, SemanticSearchRequest
 from tools.product_tools import ProductTools
+from routers.tool_schema import MCP_TOOL
 
 logger = logging.getLogger(__name__)
 
@@ -20,55 +21,55 @@ def set_product_tools(tools: ProductTools):
     product_tools = tools
 
 
-@router.get("/list")
+@router.get("/list", openapi_extra=MCP_TOOL)
 async def list_all_products() -> Dict[str, Any]:
     """Get all products from the catalog."""
     try:
-        result = product_tools.list_all_products()
+        result = await product_tools.list_all_products()
         return result
     except Exception as e:
         logger.error(f"Error in list_all_products: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/get")
+@router.post("/get", openapi_extra=MCP_TOOL)
 async def get_product_by_id(request: ProductByIdRequest) -> Dict[str, Any]:
     """Get specific product by ID."""
     try:
-        result = product_tools.get_product_by_id(product_id=request.product_id)
+        result = await product_tools.get_product_by_id(product_id=request.product_id)
         return result
     except Exception as e:
         logger.error(f"Error in get_product_by_id: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/search")
+@router.post("/search", openapi_extra=MCP_TOOL)
 async def search_products(request: ProductSearchRequest) -> Dict[str, Any]:
     """Search for products by query."""
     try:
-        result = product_tools.search_products(query=request.query)
+        result = await product_tools.search_products(query=request.query)
         return result
     except Exception as e:
         logger.error(f"Error in search_products: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/category")
+@router.post("/category", openapi_extra=MCP_TOOL)
 async def get_products_by_category(request: ProductByCategoryRequest) -> Dict[str, Any]:
     """Get products filtered by category."""
     try:
-        result = product_tools.get_products_by_category(category=request.category)
+        result = await product_tools.get_products_by_category(category=request.category)
         return result
     except Exception as e:
         logger.error(f"Error in get_products_by_category: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/semantic-search")
+@router.post("/semantic-search", openapi_extra=MCP_TOOL)
 async def semantic_search_products(request: SemanticSearchRequest) -> Dict[str, Any]:
-    """Search for products using AI-powered semantic search."""
+    """Search for products using AI-powered semantic search with vector embeddings."""
     try:
-        result = product_tools.semantic_search_products(
+        result = await product_tools.semantic_search_products(
             query=request.query, 
             limit=request.limit or 10
         )
@@ -1,7 +1,8 @@
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional
 from tools.review_tools import ReviewTools
+from routers.tool_schema import MCP_TOOL
 
 # Global variable to hold the review tools instance
 review_tools: ReviewTools = None
@@ -16,40 +17,40 @@ router = APIRouter(prefix="/tools/reviews", tags=["review-tools"])
 
 # Request models
 class CreateReviewRequest(BaseModel):
-    user_id: str
-    product_id: str
-    rating: int
-    review_text: Optional[str] = ""
+    user_id: str = Field(..., description="User identifier")
+    product_id: str = Field(..., description="Product ID to review")
+    rating: int = Field(..., description="Rating from 1-5 stars")
+    review_text: Optional[str] = Field("", description="Review text/comment")
 
 class UpdateReviewRequest(BaseModel):
-    review_id: int
-    rating: int
-    review_text: Optional[str] = ""
+    review_id: int = Field(..., description="Review ID to update")
+    rating: int = Field(..., description="New rating from 1-5 stars")
+    review_text: Optional[str] = Field("", description="New review text")
 
 class GetProductReviewsRequest(BaseModel):
-    product_id: str
-    limit: Optional[int] = 50
-    offset: Optional[int] = 0
+    product_id: str = Field(..., description="Product ID")
+    limit: Optional[int] = Field(50, description="Maximum reviews to return")
+    offset: Optional[int] = Field(0, description="Number of reviews to skip")
 
 class GetUserReviewsRequest(BaseModel):
-    user_id: str
-    limit: Optional[int] = 50
-    offset: Optional[int] = 0
+    user_id: str = Field(..., description="User identifier")
+    limit: Optional[int] = Field(50, description="Maximum reviews to return")
+    offset: Optional[int] = Field(0, description="Number of reviews to skip")
 
 class DeleteReviewRequest(BaseModel):
-    review_id: int
+    review_id: int = Field(..., description="Review ID to delete")
 
 class GetProductReviewSummaryRequest(BaseModel):
-    product_id: str
+    product_id: str = Field(..., description="Product ID")
 
 # Endpoints
-@router.post("/create")
+@router.post("/create", openapi_extra=MCP_TOOL)
 async def create_review(request: CreateReviewRequest):
-    """Create a new review."""
+    """Create a new review for a product."""
     if not review_tools:
         raise HTTPException(status_code=500, detail="Review tools not initialized")
     
-    result = review_tools.create_review(
+    result = await review_tools.create_review(
         user_id=request.user_id,
         product_id=request.product_id,
         rating=request.rating,
@@ -61,13 +62,13 @@ async def create_review(request: CreateReviewRequest):
     
     return result
 
-@router.post("/product")
+@router.post("/product", openapi_extra=MCP_TOOL)
 async def get_product_reviews(request: GetProductReviewsRequest):
-    """Get reviews for a specific product."""
+    """Get all reviews for a specific product."""
     if not review_tools:
         raise HTTPException(status_code=500, detail="Review tools not initialized")
     
-    result = review_tools.get_product_reviews(
+    result = await review_tools.get_product_reviews(
         product_id=request.product_id,
         limit=request.limit,
         offset=request.offset
@@ -78,13 +79,13 @@ async def get_product_reviews(request: GetProductReviewsRequest):
     
     return result
 
-@router.post("/user")
+@router.post("/user", openapi_extra=MCP_TOOL)
 async def get_user_reviews(request: GetUserReviewsRequest):
-    """Get reviews by a specific user."""
+    """Get all reviews by a specific user."""
     if not review_tools:
         raise HTTPException(status_code=500, detail="Review tools not initialized")
     
-    result = review_tools.get_user_reviews(
+    result = await review_tools.get_user_reviews(
         user_id=request.user_id,
         limit=request.limit,
         offset=request.offset
@@ -95,13 +96,13 @@ async def get_user_reviews(request: GetUserReviewsRequest):
     
     return result
 
-@router.post("/update")
+@router.post("/update", openapi_extra=MCP_TOOL)
 async def update_review(request: UpdateReviewRequest):
     """Update an existing review."""
     if not review_tools:
         raise HTTPException(status_code=500, detail="Review tools not initialized")
     
-    result = review_tools.update_review(
+    result = await review_tools.update_review(
         review_id=request.review_id,
         rating=request.rating,
         review_text=request.review_text
@@ -114,13 +115,13 @@ async def update_review(request: UpdateReviewRequest):
     
     return result
 
-@router.post("/delete")
+@router.post("/delete", openapi_extra=MCP_TOOL)
 async def delete_review(request: DeleteReviewRequest):
     """Delete a review."""
     if not review_tools:
         raise HTTPException(status_code=500, detail="Review tools not initialized")
     
-    result = review_tools.delete_review(review_id=request.review_id)
+    result = await review_tools.delete_review(review_id=request.review_id)
     
     if result["status"] == "error":
         raise HTTPException(status_code=400, detail=result["message"])
@@ -129,13 +130,13 @@ async def delete_review(request: DeleteReviewRequest):
     
     return result
 
-@router.post("/summary")
+@router.post("/summary", openapi_extra=MCP_TOOL)
 async def get_product_review_summary(request: GetProductReviewSummaryRequest):
-    """Get review summary for a product."""
+    """Get review summary statistics for a product."""
     if not review_tools:
         raise HTTPException(status_code=500, detail="Review tools not initialized")
     
-    result = review_tools.get_product_review_summary(product_id=request.product_id)
+    result = await review_tools.get_product_review_summary(product_id=request.product_id)
     
     if result["status"] == "error":
         raise HTTPException(status_code=400, detail=result["message"])
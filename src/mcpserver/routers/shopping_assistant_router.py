@@ -10,9 +10,10 @@ import logging
 from typing import Dict, Any, Optional, List
 
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from tools.shopping_assistant_tools import ShoppingAssistantTools
+from routers.tool_schema import MCP_TOOL
 
 logger = logging.getLogger(__name__)
 
@@ -30,35 +31,35 @@ def set_shopping_assistant_tools(tools: ShoppingAssistantTools):
 
 # Pydantic models for request validation
 class AIRecommendationRequest(BaseModel):
-    user_query: str
-    room_image: Optional[str] = None
+    user_query: str = Field(..., description="User's request for product recommendations")
+    room_image: Optional[str] = Field(None, description="Optional base64-encoded image of the room")
 
 
 class StyleRecommendationRequest(BaseModel):
-    room_style: str
-    budget_max: Optional[float] = None
+    room_style: str = Field(..., description="Interior design style (e.g., 'modern', 'rustic', 'minimalist')")
+    budget_max: Optional[float] = Field(None, description="Optional maximum budget for recommendations")
 
 
 class RoomRecommendationRequest(BaseModel):
-    room_type: str
-    specific_needs: Optional[str] = None
+    room_type: str = Field(..., description="Type of room (e.g., 'living room', 'bedroom', 'kitchen')")
+    specific_needs: Optional[str] = Field(None, description="Optional specific requirements")
 
 
 class ImageAnalysisRequest(BaseModel):
-    room_image: str
-    user_preferences: Optional[str] = None
+    room_image: str = Field(..., description="Base64-encoded image of the room")
+    user_preferences: Optional[str] = Field(None, description="Optional user preferences or requirements")
 
 
 class ComplementaryProductsRequest(BaseModel):
-    existing_products: List[str]
-    room_context: Optional[str] = None
+    existing_products: List[str] = Field(..., description="List of existing product names or descriptions")
+    room_context: Optional[str] = Field(None, description="Optional context about the room")
 
 
-@router.post("/ai-recommendations")
+@router.post("/ai-recommendations", openapi_extra=MCP_TOOL)
 async def get_ai_recommendations(request: AIRecommendationRequest) -> Dict[str, Any]:
     """Get AI-powered product recommendations based on user query and optional room image."""
     try:
-        result = shopping_assistant_tools.get_ai_recommendations(
+        result = await shopping_assistant_tools.get_ai_recommendations(
             user_query=request.user_query,
             room_image=request.room_image
         )
@@ -73,11 +74,11 @@ async def get_ai_recommendations(request: AIRecommendationRequest) -> Dict[str,
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/style-recommendations")
+@router.post("/style-recommendations", openapi_extra=MCP_TOOL)
 async def get_style_based_recommendations(request: StyleRecommendationRequest) -> Dict[str, Any]:
     """Get product recommendations based on interior design style."""
     try:
-        result = shopping_assistant_tools.get_style_based_recommendations(
+        result = await shopping_assistant_tools.get_style_based_recommendations(
             room_style=request.room_style,
             budget_max=request.budget_max
         )
@@ -92,11 +93,11 @@ async def get_style_based_recommendations(request: StyleRecommendationRequest) -
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/room-recommendations")
+@router.post("/room-recommendations", openapi_extra=MCP_TOOL)
 async def get_room_specific_recommendations(request: RoomRecommendationRequest) -> Dict[str, Any]:
     """Get product recommendations for specific room types."""
     try:
-        result = shopping_assistant_tools.get_room_specific_recommendations(
+        result = await shopping_assistant_tools.get_room_specific_recommendations(
             room_type=request.room_type,
             specific_needs=request.specific_needs
         )
@@ -111,11 +112,11 @@ async def get_room_specific_recommendations(request: RoomRecommendationRequest)
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/analyze-room")
+@router.post("/analyze-room", openapi_extra=MCP_TOOL)
 async def analyze_room_image(request: ImageAnalysisRequest) -> Dict[str, Any]:
     """Analyze a room image and provide tailored product recommendations."""
     try:
-        result = shopping_assistant_tools.analyze_room_image(
+        result = await shopping_assistant_tools.analyze_room_image(
             room_image=request.room_image,
             user_preferences=request.user_preferences
         )
@@ -130,11 +131,11 @@ async def analyze_room_image(request: ImageAnalysisRequest) -> Dict[str, Any]:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/complementary-products")
+@router.post("/complementary-products", openapi_extra=MCP_TOOL)
 async def get_complementary_products(request: ComplementaryProductsRequest) -> Dict[str, Any]:
     """Get product recommendations that complement existing products."""
     try:
-        result = shopping_assistant_tools.get_complementary_products(
+        result = await shopping_assistant_tools.get_complementary_products(
             existing_products=request.existing_products,
             room_context=request.room_context
         )
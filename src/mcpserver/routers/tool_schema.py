@@ -0,0 +1,45 @@
+from typing import Any, Dict, Iterable, List
+
+from fastapi.routing import APIRoute
+
+# openapi_extra marker for routes exposed as MCP tools; it also shows up in the OpenAPI document
+MCP_TOOL: Dict[str, Any] = {"x-mcp-tool": True}
+
+
+def _parameters(route: APIRoute) -> Dict[str, Any]:
+    """Describe a tool's arguments from the pydantic model of its request body."""
+    parameters: Dict[str, Any] = {}
+    for body_param in route.dependant.body_params:
+        schema = body_param.type_.model_json_schema()
+        required = set(schema.get("required", ()))
+        for name, prop in schema["properties"].items():
+            # Optional[X] is rendered as anyOf [X, null]; the agent only needs X
+            type_schema = next((option for option in prop.get("anyOf", ()) if option.get("type") != "null"), prop)
+            parameter: Dict[str, Any] = {"type": type_schema["type"]}
+            if "items" in type_schema:
+                parameter["items"] = type_schema["items"]
+            parameter["description"] = prop.get("description", "")
+            if name not in required:
+                parameter["required"] = False
+            parameters[name] = parameter
+    return parameters
+
+
+def build_tools_schema(routes: Iterable[Any]) -> List[Dict[str, Any]]:
+    """Build the MCP tool list from the routes marked with MCP_TOOL.
+
+    The tool name is the route name, the description is the first line of the endpoint's
+    docstring and the parameters come from its request model's field descriptions.
+    """
+    tools: List[Dict[str, Any]] = []
+    for route in routes:
+        if not isinstance(route, APIRoute) or not (route.openapi_extra or {}).get("x-mcp-tool"):
+            continue
+        tools.append({
+            "name": route.name,
+            "description": route.description.split("\n", 1)[0].rstrip("."),
+            "parameters": _parameters(route),
+            "endpoint": route.path,
+            "method": next(iter(route.methods)),
+        })
+    return tools
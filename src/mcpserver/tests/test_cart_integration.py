@@ -10,6 +10,7 @@ Prerequisites:
 This test verifies the MCP cart tools work with the real cartservice.
 """
 
+import asyncio
 import sys
 import time
 import os
@@ -22,7 +23,7 @@ from clients.cart_client import CartServiceClient
 from tools.cart_tool import CartTools
 
 
-def test_cart_operations() -> None:
+async def test_cart_operations() -> None:
     """Test cart operations against port-forwarded cartservice."""
     
     print("🧪 Testing Cart MCP Tools Integration")
@@ -38,24 +39,24 @@ def test_cart_operations() -> None:
     try:
         # Test 1: Clear cart first
         print("\n1️⃣ Clearing cart...")
-        result = tools.clear_cart(test_user)
+        result = await tools.clear_cart(test_user)
         print(f"   ✅ {result}")
         
         # Test 2: Get empty cart
         print("\n2️⃣ Getting empty cart...")
-        result = tools.get_cart_contents(test_user)
+        result = await tools.get_cart_contents(test_user)
         print(f"   ✅ Cart items: {result['items']}")
         print(f"   ✅ Total items: {result['total_items']}")
         assert result['total_items'] == 0, "Cart should be empty"
         
         # Test 3: Add item to cart
         print("\n3️⃣ Adding 2 items to cart...")
-        result = tools.add_to_cart(test_user, test_product, 2)
+        result = await tools.add_to_cart(test_user, test_product, 2)
         print(f"   ✅ {result}")
         
         # Test 4: Get cart with items
         print("\n4️⃣ Getting cart with items...")
-        result = tools.get_cart_contents(test_user)
+        result = await tools.get_cart_contents(test_user)
         print(f"   ✅ Cart items: {result['items']}")
         print(f"   ✅ Total items: {result['total_items']}")
         assert result['total_items'] == 2, f"Expected 2 items, got {result['total_items']}"
@@ -66,12 +67,12 @@ def test_cart_operations() -> None:
         # Test 5: Add more of the same item
         print("\n5️⃣ Adding 3 more of the same item...")
         try:
-            result = tools.add_to_cart(test_user, test_product, 3)
+            result = await tools.add_to_cart(test_user, test_product, 3)
             print(f"   ✅ {result}")
             
             # Test 6: Check updated cart
             print("\n6️⃣ Checking updated cart...")
-            result = tools.get_cart_contents(test_user)
+            result = await tools.get_cart_contents(test_user)
             print(f"   ✅ Cart items: {result['items']}")
             print(f"   ✅ Total items: {result['total_items']}")
             # Note: Depending on cart implementation, this might be 5 (additive) or 3 (replace)
@@ -83,7 +84,7 @@ def test_cart_operations() -> None:
                 print("   ✅ Cart service properly enforces unique constraints")
                 
                 # Just verify the cart still has the original items
-                result = tools.get_cart_contents(test_user)
+                result = await tools.get_cart_contents(test_user)
                 print(f"   ✅ Cart items: {result['items']}")
                 print(f"   ✅ Total items: {result['total_items']}")
                 assert result['total_items'] == 2, f"Expected 2 items, got {result['total_items']}"
@@ -93,12 +94,12 @@ def test_cart_operations() -> None:
         # Test 7: Add different item
         test_product2 = "66VCHSJNUP"  # Another product from demo catalog
         print(f"\n7️⃣ Adding different product ({test_product2})...")
-        result = tools.add_to_cart(test_user, test_product2, 1)
+        result = await tools.add_to_cart(test_user, test_product2, 1)
         print(f"   ✅ {result}")
         
         # Test 8: Check cart with multiple products
         print("\n8️⃣ Checking cart with multiple products...")
-        result = tools.get_cart_contents(test_user)
+        result = await tools.get_cart_contents(test_user)
         print(f"   ✅ Cart items: {result['items']}")
         print(f"   ✅ Total items: {result['total_items']}")
         # Should have at least 2 different products now
@@ -107,12 +108,12 @@ def test_cart_operations() -> None:
         
         # Test 9: Clear cart again
         print("\n9️⃣ Clearing cart again...")
-        result = tools.clear_cart(test_user)
+        result = await tools.clear_cart(test_user)
         print(f"   ✅ {result}")
         
         # Test 10: Verify cart is empty
         print("\n🔟 Verifying cart is empty...")
-        result = tools.get_cart_contents(test_user)
+        result = await tools.get_cart_contents(test_user)
         print(f"   ✅ Cart items: {result['items']}")
         print(f"   ✅ Total items: {result['total_items']}")
         assert result['total_items'] == 0, "Cart should be empty after clearing"
@@ -128,10 +129,10 @@ def test_cart_operations() -> None:
         sys.exit(1)
     
     finally:
-        client.close()
+        await client.close()
 
 
-def test_validation() -> None:
+async def test_validation() -> None:
     """Test input validation."""
     print("\n🔍 Testing input validation...")
     
@@ -141,21 +142,21 @@ def test_validation() -> None:
     try:
         # Test empty user_id
         try:
-            tools.add_to_cart("", "PRODUCT", 1)
+            await tools.add_to_cart("", "PRODUCT", 1)
             assert False, "Should have raised ValueError for empty user_id"
         except ValueError as e:
             print(f"   ✅ Correctly rejected empty user_id: {e}")
         
         # Test invalid quantity
         try:
-            tools.add_to_cart("user", "PRODUCT", 0)
+            await tools.add_to_cart("user", "PRODUCT", 0)
             assert False, "Should have raised ValueError for zero quantity"
         except ValueError as e:
             print(f"   ✅ Correctly rejected zero quantity: {e}")
         
         # Test negative quantity
         try:
-            tools.add_to_cart("user", "PRODUCT", -1)
+            await tools.add_to_cart("user", "PRODUCT", -1)
             assert False, "Should have raised ValueError for negative quantity"
         except ValueError as e:
             print(f"   ✅ Correctly rejected negative quantity: {e}")
@@ -163,7 +164,7 @@ def test_validation() -> None:
         print("   ✅ All validation tests passed!")
         
     finally:
-        client.close()
+        await client.close()
 
 
 if __name__ == "__main__":
@@ -175,8 +176,8 @@ if __name__ == "__main__":
     # Give user a chance to cancel if port-forward isn't ready
     try:
         time.sleep(2)
-        test_validation()
-        test_cart_operations()
+        asyncio.run(test_validation())
+        asyncio.run(test_cart_operations())
     except KeyboardInterrupt:
         print("\n⏹️  Test cancelled by user")
         sys.exit(0)
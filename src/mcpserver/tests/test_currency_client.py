@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Unit tests for CurrencyServiceClient's local conversion path.
+
+While a rate table is cached, convert_currency computes the result through the EUR pivot
+without calling the service, so these tests need no running Currency Service.
+
+Run with: python test_currency_client.py
+"""
+
+import time
+import unittest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from clients import currency_client
+from clients.currency_client import CurrencyServiceClient, _split_nanos
+
+
+TEST_ADDRESS = "local-rates-test:7000"
+
+
+class TestSplitNanos(unittest.TestCase):
+    """Money units and nanos must share the amount's sign, with |nanos| < 1e9."""
+
+    def test_large_amount(self):
+        self.assertEqual(_split_nanos(10**17 - 1), (99_999_999, 999_999_999))
+
+    def test_whole_units(self):
+        self.assertEqual(_split_nanos(10**17), (100_000_000, 0))
+
+    def test_negative_amount(self):
+        self.assertEqual(_split_nanos(-(10**17 - 1)), (-99_999_999, -999_999_999))
+        self.assertEqual(_split_nanos(-500_000_000), (0, -500_000_000))
+
+    def test_zero(self):
+        self.assertEqual(_split_nanos(0), (0, 0))
+
+
+class TestLocalConversion(unittest.IsolatedAsyncioTestCase):
+    """convert_currency served from a cached rate table."""
+
+    def setUp(self):
+        currency_client._rates_cache[TEST_ADDRESS] = (
+            time.monotonic() + 60, {"EUR": 1.0, "USD": 1.25, "JPY": 125.0}
+        )
+        self.client = CurrencyServiceClient(address=TEST_ADDRESS)
+
+    def tearDown(self):
+        currency_client._rates_cache.pop(TEST_ADDRESS, None)
+
+    async def test_convert_through_eur_pivot(self):
+        result = await self.client.convert_currency("USD", "JPY", 10, 500_000_000)
+        self.assertEqual(result, {"currency_code": "JPY", "units": 1050, "nanos": 0})
+        # Served from the cache, so no channel was opened
+        self.assertIsNone(self.client.pool)
+
+    async def test_convert_fractional_result(self):
+        result = await self.client.convert_currency("EUR", "USD", 1, 10_000_000)
+        self.assertEqual(result, {"currency_code": "USD", "units": 1, "nanos": 262_500_000})
+
+    async def test_convert_large_amount(self):
+        result = await self.client.convert_currency("EUR", "JPY", 1_000_000, 0)
+        self.assertEqual(result, {"currency_code": "JPY", "units": 125_000_000, "nanos": 0})
+
+    async def test_nanos_in_range(self):
+        for units in (0, 1, 7, 99, 12_345, 999_999, 80_000_000):
+            result = await self.client.convert_currency("USD", "JPY", units, 999_999_999)
+            self.assertGreaterEqual(result["nanos"], 0)
+            self.assertLess(result["nanos"], 1_000_000_000)
+
+
+if __name__ == "__main__":
+    unittest.main()
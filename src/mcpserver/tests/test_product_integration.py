@@ -10,6 +10,7 @@ Prerequisites:
 This test verifies the MCP product tools work with the real productcatalogservice.
 """
 
+import asyncio
 import sys
 import time
 import os
@@ -22,7 +23,7 @@ from clients.product_client import ProductCatalogServiceClient
 from tools.product_tools import ProductTools
 
 
-def test_product_operations() -> None:
+async def test_product_operations() -> None:
     """Test product operations against port-forwarded productcatalogservice."""
     
     print("🧪 Testing Product MCP Tools Integration")
@@ -35,7 +36,7 @@ def test_product_operations() -> None:
     try:
         # Test 1: List all products
         print("\n1️⃣ Listing all products...")
-        result = tools.list_all_products()
+        result = await tools.list_all_products()
         print(f"   ✅ Status: {result['status']}")
         print(f"   ✅ Total products: {result['total_count']}")
         if result['status'] == 'ok' and result['total_count'] > 0:
@@ -47,7 +48,7 @@ def test_product_operations() -> None:
         
         # Test 2: Get specific product by ID
         print(f"\n2️⃣ Getting product by ID: {first_product_id}")
-        result = tools.get_product_by_id(first_product_id)
+        result = await tools.get_product_by_id(first_product_id)
         print(f"   ✅ Status: {result['status']}")
         if result['status'] == 'ok':
             product = result['product']
@@ -59,14 +60,14 @@ def test_product_operations() -> None:
         
         # Test 3: Get non-existent product
         print("\n3️⃣ Testing non-existent product...")
-        result = tools.get_product_by_id("NONEXISTENT")
+        result = await tools.get_product_by_id("NONEXISTENT")
         print(f"   ✅ Status: {result['status']}")
         print(f"   ✅ Message: {result['message']}")
         assert result['status'] == 'not_found', "Should return not_found for missing product"
         
         # Test 4: Search products
         print("\n4️⃣ Searching for 'shirt' products...")
-        result = tools.search_products("shirt")
+        result = await tools.search_products("shirt")
         print(f"   ✅ Status: {result['status']}")
         print(f"   ✅ Found: {result['total_count']} products")
         if result['total_count'] > 0:
@@ -74,7 +75,7 @@ def test_product_operations() -> None:
         
         # Test 5: Get products by category
         print("\n5️⃣ Getting products in 'clothing' category...")
-        result = tools.get_products_by_category("clothing")
+        result = await tools.get_products_by_category("clothing")
         print(f"   ✅ Status: {result['status']}")
         print(f"   ✅ Found: {result['total_count']} clothing products")
         if result['total_count'] > 0:
@@ -82,13 +83,13 @@ def test_product_operations() -> None:
         
         # Test 6: Test another category
         print("\n6️⃣ Getting products in 'accessories' category...")
-        result = tools.get_products_by_category("accessories")
+        result = await tools.get_products_by_category("accessories")
         print(f"   ✅ Status: {result['status']}")
         print(f"   ✅ Found: {result['total_count']} accessory products")
         
         # Test 7: Semantic search for comfortable seating
         print("\n7️⃣ Semantic search for 'comfortable seating'...")
-        result = tools.semantic_search_products("comfortable seating", limit=5)
+        result = await tools.semantic_search_products("comfortable seating", limit=5)
         print(f"   ✅ Status: {result['status']}")
         print(f"   ✅ Search type: {result.get('search_type', 'N/A')}")
         print(f"   ✅ Found: {result['total_count']} semantically related products")
@@ -97,7 +98,7 @@ def test_product_operations() -> None:
         
         # Test 8: Semantic search for kitchen appliances
         print("\n8️⃣ Semantic search for 'kitchen appliances'...")
-        result = tools.semantic_search_products("kitchen appliances", limit=3)
+        result = await tools.semantic_search_products("kitchen appliances", limit=3)
         print(f"   ✅ Status: {result['status']}")
         print(f"   ✅ Found: {result['total_count']} kitchen-related products")
         if result['total_count'] > 0:
@@ -106,7 +107,7 @@ def test_product_operations() -> None:
         
         # Test 9: Semantic search for winter clothing
         print("\n9️⃣ Semantic search for 'winter clothing'...")
-        result = tools.semantic_search_products("winter clothing", limit=3)
+        result = await tools.semantic_search_products("winter clothing", limit=3)
         print(f"   ✅ Status: {result['status']}")
         print(f"   ✅ Found: {result['total_count']} winter clothing items")
         
@@ -122,10 +123,10 @@ def test_product_operations() -> None:
         sys.exit(1)
     
     finally:
-        client.close()
+        await client.close()
 
 
-def test_validation() -> None:
+async def test_validation() -> None:
     """Test input validation."""
     print("\n🔍 Testing input validation...")
     
@@ -134,33 +135,33 @@ def test_validation() -> None:
     
     try:
         # Test empty product ID
-        result = tools.get_product_by_id("")
+        result = await tools.get_product_by_id("")
         assert result['status'] == 'error', "Should reject empty product ID"
         print(f"   ✅ Correctly rejected empty product ID: {result['message']}")
         
         # Test empty search query
-        result = tools.search_products("")
+        result = await tools.search_products("")
         assert result['status'] == 'error', "Should reject empty search query"
         print(f"   ✅ Correctly rejected empty search query: {result['message']}")
         
         # Test empty category
-        result = tools.get_products_by_category("")
+        result = await tools.get_products_by_category("")
         assert result['status'] == 'error', "Should reject empty category"
         print(f"   ✅ Correctly rejected empty category: {result['message']}")
         
         # Test empty semantic search query
-        result = tools.semantic_search_products("")
+        result = await tools.semantic_search_products("")
         assert result['status'] == 'error', "Should reject empty semantic search query"
         print(f"   ✅ Correctly rejected empty semantic search query: {result['message']}")
         
         # Test invalid limit (negative) - should be converted to default limit
-        result = tools.semantic_search_products("test", limit=-1)
+        result = await tools.semantic_search_products("test", limit=-1)
         print(f"   ✅ Result: {result}")
         assert result['status'] in ['ok'], "Should handle negative limit gracefully"
         print(f"   ✅ Handled negative limit correctly: {result['status']}")
         
         # Test large limit (should be clamped)
-        result = tools.semantic_search_products("test", limit=100)
+        result = await tools.semantic_search_products("test", limit=100)
         print(f"   ✅ Result: {result['status']}")
         assert result['status'] in ['ok'], "Should handle large limit"
         print(f"   ✅ Handled large limit correctly")
@@ -168,7 +169,7 @@ def test_validation() -> None:
         print("   ✅ All validation tests passed!")
         
     finally:
-        client.close()
+        await client.close()
 
 
 if __name__ == "__main__":
@@ -180,8 +181,8 @@ if __name__ == "__main__":
     # Give user a chance to cancel if port-forward isn't ready
     try:
         time.sleep(2)
-        test_validation()
-        test_product_operations()
+        asyncio.run(test_validation())
+        asyncio.run(test_product_operations())
     except KeyboardInterrupt:
         print("\n⏹️  Test cancelled by user")
         sys.exit(0)
@@ -18,7 +18,7 @@ from tools.review_tools import ReviewTools
 from clients.review_client import ReviewServiceClient
 from genproto import review_pb2
 
-def test_review_tools_validation():
+async def test_review_tools_validation():
     """Test input validation in review tools."""
     print("🧪 Testing Review Tools Validation...")
     
@@ -27,27 +27,27 @@ def test_review_tools_validation():
     tools = ReviewTools(client=mock_client)
     
     # Test create review validation
-    result = tools.create_review("", "PRODUCT123", 5, "Great!")
+    result = await tools.create_review("", "PRODUCT123", 5, "Great!")
     assert result["status"] == "error"
     assert "User ID cannot be empty" in result["message"]
     print("  ✅ Empty user ID validation works")
     
-    result = tools.create_review("USER123", "", 5, "Great!")
+    result = await tools.create_review("USER123", "", 5, "Great!")
     assert result["status"] == "error"
     assert "Product ID cannot be empty" in result["message"]
     print("  ✅ Empty product ID validation works")
     
-    result = tools.create_review("USER123", "PRODUCT123", 6, "Great!")
+    result = await tools.create_review("USER123", "PRODUCT123", 6, "Great!")
     assert result["status"] == "error"
     assert "Rating must be an integer between 1 and 5" in result["message"]
     print("  ✅ Invalid rating validation works")
     
-    result = tools.create_review("USER123", "PRODUCT123", 0, "Great!")
+    result = await tools.create_review("USER123", "PRODUCT123", 0, "Great!")
     assert result["status"] == "error"
     assert "Rating must be an integer between 1 and 5" in result["message"]
     print("  ✅ Zero rating validation works")
 
-def test_review_tools_success():
+async def test_review_tools_success():
     """Test successful review operations."""
     print("\n🧪 Testing Review Tools Success Cases...")
     
@@ -74,7 +74,7 @@ def test_review_tools_success():
     tools = ReviewTools(client=mock_client)
     
     # Test create review
-    result = tools.create_review("USER123", "PRODUCT123", 5, "Great product!")
+    result = await tools.create_review("USER123", "PRODUCT123", 5, "Great product!")
     assert result["status"] == "ok"
     assert result["review"]["id"] == 123
     assert result["review"]["rating"] == 5
@@ -85,7 +85,7 @@ def test_review_tools_success():
     mock_reviews_response.reviews = [mock_review]
     mock_client.get_product_reviews.return_value = mock_reviews_response
     
-    result = tools.get_product_reviews("PRODUCT123")
+    result = await tools.get_product_reviews("PRODUCT123")
     assert result["status"] == "ok"
     assert len(result["reviews"]) == 1
     assert result["reviews"][0]["id"] == 123
@@ -97,7 +97,7 @@ def test_review_tools_success():
     mock_update_response.review = mock_review
     mock_client.update_review.return_value = mock_update_response
     
-    result = tools.update_review(123, 4, "Updated review")
+    result = await tools.update_review(123, 4, "Updated review")
     assert result["status"] == "ok"
     assert result["review"]["id"] == 123
     print("  ✅ Update review success case works")
@@ -108,11 +108,11 @@ def test_review_tools_success():
     mock_delete_response.message = "Review deleted successfully"
     mock_client.delete_review.return_value = mock_delete_response
     
-    result = tools.delete_review(123)
+    result = await tools.delete_review(123)
     assert result["status"] == "ok"
     print("  ✅ Delete review success case works")
 
-def test_review_tools_error_cases():
+async def test_review_tools_error_cases():
     """Test error handling in review tools."""
     print("\n🧪 Testing Review Tools Error Cases...")
     
@@ -123,14 +123,14 @@ def test_review_tools_error_cases():
     tools = ReviewTools(client=mock_client)
     
     # Test connection error
-    result = tools.create_review("USER123", "PRODUCT123", 5, "Great!")
+    result = await tools.create_review("USER123", "PRODUCT123", 5, "Great!")
     assert result["status"] == "error"
     assert "Failed to create review" in result["message"]
     print("  ✅ Connection error handling works")
     
     # Test not found error
     mock_client.update_review.side_effect = Exception("NOT_FOUND: Review not found")
-    result = tools.update_review(999, 5, "Updated")
+    result = await tools.update_review(999, 5, "Updated")
     assert result["status"] == "not_found"
     print("  ✅ Not found error handling works")
 
@@ -170,9 +170,9 @@ def main():
     print("🚀 Starting Review Service MCP Integration Tests...\n")
     
     try:
-        test_review_tools_validation()
-        test_review_tools_success()
-        test_review_tools_error_cases()
+        asyncio.run(test_review_tools_validation())
+        asyncio.run(test_review_tools_success())
+        asyncio.run(test_review_tools_error_cases())
         test_format_review()
         
         print("\n✅ All tests passed! Review Service MCP integration is working correctly.")
@@ -10,6 +10,7 @@ Prerequisites:
 This test verifies the MCP review tools work with the real reviewservice.
 """
 
+import asyncio
 import sys
 import time
 import os
@@ -22,7 +23,7 @@ from clients.review_client import ReviewServiceClient
 from tools.review_tools import ReviewTools
 
 
-def test_review_operations() -> None:
+async def test_review_operations() -> None:
     """Test review CRUD operations against port-forwarded reviewservice."""
     
     print("🧪 Testing Review MCP Tools Integration")
@@ -41,7 +42,7 @@ def test_review_operations() -> None:
         print("\n1️⃣ Creating a new review...")
         original_rating = 4
         original_text = "Great sunglasses! Love the style and quality."
-        result = tools.create_review(
+        result = await tools.create_review(
             user_id=test_user_id,
             product_id=test_product_id,
             rating=original_rating,
@@ -86,7 +87,7 @@ def test_review_operations() -> None:
         
         # Test 2: Get reviews for the product and verify our created review
         print(f"\n2️⃣ Getting reviews for product: {test_product_id}")
-        result = tools.get_product_reviews(test_product_id)
+        result = await tools.get_product_reviews(test_product_id)
         print(f"   ✅ Status: {result['status']}")
         if result['status'] == 'ok':
             print(f"   ✅ Total reviews found: {result['total_count']}")
@@ -132,7 +133,7 @@ def test_review_operations() -> None:
         
         # Test 3: Get reviews by user and verify content
         print(f"\n3️⃣ Getting reviews by user: {test_user_id}")
-        result = tools.get_user_reviews(test_user_id)
+        result = await tools.get_user_reviews(test_user_id)
         print(f"   ✅ Status: {result['status']}")
         if result['status'] == 'ok':
             print(f"   ✅ User has {result['total_count']} reviews")
@@ -169,7 +170,7 @@ def test_review_operations() -> None:
         print(f"\n4️⃣ Updating review ID: {created_review_id}")
         updated_rating = 5
         updated_text = "Updated: Absolutely amazing sunglasses! Perfect fit and style."
-        result = tools.update_review(
+        result = await tools.update_review(
             review_id=created_review_id,
             rating=updated_rating,
             review_text=updated_text
@@ -218,7 +219,7 @@ def test_review_operations() -> None:
         
         # Test 4.5: Verify update by fetching the review independently
         print(f"\n4️⃣.5 Verifying update by fetching review independently...")
-        result = tools.get_product_reviews(test_product_id)
+        result = await tools.get_product_reviews(test_product_id)
         if result['status'] == 'ok' and result['total_count'] > 0:
             # Find our updated review in the list
             our_updated_review = next((r for r in result['reviews'] if r['id'] == created_review_id), None)
@@ -268,7 +269,7 @@ def test_review_operations() -> None:
         
         # Test 5: Get product review summary
         print(f"\n5️⃣ Getting review summary for product: {test_product_id}")
-        result = tools.get_product_review_summary(test_product_id)
+        result = await tools.get_product_review_summary(test_product_id)
         print(f"   ✅ Status: {result['status']}")
         if result['status'] == 'ok':
             summary = result['summary']
@@ -280,7 +281,7 @@ def test_review_operations() -> None:
         
         # Test 6: Delete the review
         print(f"\n6️⃣ Deleting review ID: {created_review_id}")
-        result = tools.delete_review(created_review_id)
+        result = await tools.delete_review(created_review_id)
         print(f"   ✅ Status: {result['status']}")
         if result['status'] == 'ok':
             print(f"   ✅ Successfully deleted review")
@@ -290,7 +291,7 @@ def test_review_operations() -> None:
         
         # Test 7: Verify deletion by trying to get user reviews again
         print(f"\n7️⃣ Verifying deletion - getting user reviews again...")
-        result = tools.get_user_reviews(test_user_id)
+        result = await tools.get_user_reviews(test_user_id)
         print(f"   ✅ Status: {result['status']}")
         if result['status'] == 'ok':
             remaining_reviews = [r for r in result['reviews'] if r['id'] == created_review_id]
@@ -316,14 +317,14 @@ def test_review_operations() -> None:
         if created_review_id:
             try:
                 print(f"\n🧹 Cleaning up: Deleting review {created_review_id}")
-                tools.delete_review(created_review_id)
+                await tools.delete_review(created_review_id)
             except Exception as e:
                 print(f"   ⚠️  Cleanup failed: {e}")
         
-        client.close()
+        await client.close()
 
 
-def test_validation() -> None:
+async def test_validation() -> None:
     """Test input validation."""
     print("\n🔍 Testing input validation...")
     
@@ -332,42 +333,42 @@ def test_validation() -> None:
     
     try:
         # Test empty user ID
-        result = tools.create_review("", "PRODUCT123", 5, "Great!")
+        result = await tools.create_review("", "PRODUCT123", 5, "Great!")
         assert result['status'] == 'error', "Should reject empty user ID"
         print(f"   ✅ Correctly rejected empty user ID: {result['message']}")
         
         # Test empty product ID
-        result = tools.create_review("USER123", "", 5, "Great!")
+        result = await tools.create_review("USER123", "", 5, "Great!")
         assert result['status'] == 'error', "Should reject empty product ID"
         print(f"   ✅ Correctly rejected empty product ID: {result['message']}")
         
         # Test invalid rating (too high)
-        result = tools.create_review("USER123", "PRODUCT123", 6, "Great!")
+        result = await tools.create_review("USER123", "PRODUCT123", 6, "Great!")
         assert result['status'] == 'error', "Should reject rating > 5"
         print(f"   ✅ Correctly rejected invalid rating (6): {result['message']}")
         
         # Test invalid rating (too low)
-        result = tools.create_review("USER123", "PRODUCT123", 0, "Great!")
+        result = await tools.create_review("USER123", "PRODUCT123", 0, "Great!")
         assert result['status'] == 'error', "Should reject rating < 1"
         print(f"   ✅ Correctly rejected invalid rating (0): {result['message']}")
         
         # Test invalid review ID for update
-        result = tools.update_review(-1, 5, "Updated")
+        result = await tools.update_review(-1, 5, "Updated")
         assert result['status'] == 'error', "Should reject negative review ID"
         print(f"   ✅ Correctly rejected negative review ID: {result['message']}")
         
         # Test non-existent review update
-        result = tools.update_review(999999, 5, "Updated")
+        result = await tools.update_review(999999, 5, "Updated")
         assert result['status'] in ['error', 'not_found'], "Should handle non-existent review"
         print(f"   ✅ Correctly handled non-existent review: {result['message']}")
         
         print("   ✅ All validation tests passed!")
         
     finally:
-        client.close()
+        await client.close()
 
 
-def test_content_edge_cases() -> None:
+async def test_content_edge_cases() -> None:
     """Test edge cases for review content."""
     print("\n🔍 Testing content edge cases...")
     
@@ -381,7 +382,7 @@ def test_content_edge_cases() -> None:
     try:
         # Test 1: Empty review text
         print("\n   📝 Testing empty review text...")
-        result = tools.create_review(edge_case_user, edge_case_product, 3, "")
+        result = await tools.create_review(edge_case_user, edge_case_product, 3, "")
         if result['status'] == 'ok':
             review_id = result['review']['id']
             created_reviews.append(review_id)
@@ -395,7 +396,7 @@ def test_content_edge_cases() -> None:
         # Test 2: Review with special characters and unicode
         special_text = "Amazing product! 🌟⭐ Très bon! 日本語 Test: <script>alert('xss')</script> & \"quotes\" 'single' \\backslash\\ line1\nline2\ttab"
         print("\n   🔤 Testing special characters and unicode...")
-        result = tools.create_review(edge_case_user, edge_case_product, 5, special_text)
+        result = await tools.create_review(edge_case_user, edge_case_product, 5, special_text)
         if result['status'] == 'ok':
             review_id = result['review']['id']
             created_reviews.append(review_id)
@@ -407,7 +408,7 @@ def test_content_edge_cases() -> None:
                 print(f"       Got: '{result['review']['review_text']}'")
             
             # Verify by fetching it back
-            fetch_result = tools.get_user_reviews(edge_case_user)
+            fetch_result = await tools.get_user_reviews(edge_case_user)
             if fetch_result['status'] == 'ok':
                 fetched_review = next((r for r in fetch_result['reviews'] if r['id'] == review_id), None)
                 if fetched_review and fetched_review['review_text'] == special_text:
@@ -422,7 +423,7 @@ def test_content_edge_cases() -> None:
         # Test 3: Very long review text
         long_text = "This is a very long review. " * 100  # 2800+ characters
         print(f"\n   📏 Testing very long review text ({len(long_text)} characters)...")
-        result = tools.create_review(edge_case_user, edge_case_product, 2, long_text)
+        result = await tools.create_review(edge_case_user, edge_case_product, 2, long_text)
         if result['status'] == 'ok':
             review_id = result['review']['id']
             created_reviews.append(review_id)
@@ -456,7 +457,7 @@ def test_content_edge_cases() -> None:
         if created_reviews:
             print(f"\n   🔄 Testing update with edge case content...")
             update_text = "Updated with émojis 🎉 and newlines\nLine 2\nLine 3"
-            result = tools.update_review(created_reviews[0], 4, update_text)
+            result = await tools.update_review(created_reviews[0], 4, update_text)
             if result['status'] == 'ok':
                 if result['review']['review_text'] == update_text:
                     print(f"   ✅ Update with special content works correctly")
@@ -473,14 +474,14 @@ def test_content_edge_cases() -> None:
         # Clean up created reviews
         for review_id in created_reviews:
             try:
-                tools.delete_review(review_id)
+                await tools.delete_review(review_id)
             except Exception as e:
                 print(f"   ⚠️  Cleanup failed for review {review_id}: {e}")
         
-        client.close()
+        await client.close()
 
 
-def test_error_handling() -> None:
+async def test_error_handling() -> None:
     """Test error handling scenarios."""
     print("\n🔍 Testing error handling...")
     
@@ -489,23 +490,23 @@ def test_error_handling() -> None:
     
     try:
         # Test getting reviews for non-existent product
-        result = tools.get_product_reviews("NONEXISTENT_PRODUCT")
+        result = await tools.get_product_reviews("NONEXISTENT_PRODUCT")
         print(f"   ✅ Non-existent product reviews status: {result['status']}")
         print(f"   ✅ Reviews found: {result['total_count']}")
         
         # Test getting reviews for non-existent user
-        result = tools.get_user_reviews("nonexistent-user-12345")
+        result = await tools.get_user_reviews("nonexistent-user-12345")
         print(f"   ✅ Non-existent user reviews status: {result['status']}")
         print(f"   ✅ Reviews found: {result['total_count']}")
         
         # Test getting summary for non-existent product
-        result = tools.get_product_review_summary("NONEXISTENT_PRODUCT")
+        result = await tools.get_product_review_summary("NONEXISTENT_PRODUCT")
         print(f"   ✅ Non-existent product summary status: {result['status']}")
         
         print("   ✅ All error handling tests passed!")
         
     finally:
-        client.close()
+        await client.close()
 
 
 if __name__ == "__main__":
@@ -517,10 +518,10 @@ if __name__ == "__main__":
     # Give user a chance to cancel if port-forward isn't ready
     try:
         time.sleep(2)
-        test_validation()
-        test_error_handling()
-        test_content_edge_cases()
-        test_review_operations()
+        asyncio.run(test_validation())
+        asyncio.run(test_error_handling())
+        asyncio.run(test_content_edge_cases())
+        asyncio.run(test_review_operations())
     except KeyboardInterrupt:
         print("\n⏹️  Test cancelled by user")
         sys.exit(0)
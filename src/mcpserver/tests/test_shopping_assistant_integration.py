@@ -25,7 +25,7 @@ from clients.shopping_assistant_client import ShoppingAssistantServiceClient
 from tools.shopping_assistant_tools import ShoppingAssistantTools
 
 
-class TestShoppingAssistantIntegration(unittest.TestCase):
+class TestShoppingAssistantIntegration(unittest.IsolatedAsyncioTestCase):
     """Integration tests for Shopping Assistant Service."""
     
     @classmethod
@@ -47,6 +47,10 @@ class TestShoppingAssistantIntegration(unittest.TestCase):
             cls.client.close()
         print("✅ Shopping assistant service client closed")
     
+    async def asyncTearDown(self):
+        """Close the async HTTP client opened on this test's event loop; it is recreated lazily in the next test."""
+        await self.client.aclose()
+    
     def test_health_check(self):
         """Test shopping assistant service health check."""
         print("\n🏥 Testing health check...")
@@ -65,11 +69,11 @@ class TestShoppingAssistantIntegration(unittest.TestCase):
             if "error" in result:
                 print(f"   Error: {result['error']}")
     
-    def test_basic_ai_recommendations(self):
+    async def test_basic_ai_recommendations(self):
         """Test basic AI recommendations without image."""
         print("\n🛋️ Testing basic AI recommendations...")
         
-        result = self.tools.get_ai_recommendations(
+        result = await self.tools.get_ai_recommendations(
             user_query="I need furniture for my living room"
         )
         
@@ -96,11 +100,11 @@ class TestShoppingAssistantIntegration(unittest.TestCase):
             # Don't fail the test if service is not available
             self.skipTest("Shopping assistant service not available")
     
-    def test_style_based_recommendations(self):
+    async def test_style_based_recommendations(self):
         """Test style-based recommendations."""
         print("\n🎨 Testing style-based recommendations...")
         
-        result = self.tools.get_style_based_recommendations(
+        result = await self.tools.get_style_based_recommendations(
             room_style="modern",
             budget_max=500.0
         )
@@ -124,11 +128,11 @@ class TestShoppingAssistantIntegration(unittest.TestCase):
             print(f"❌ Style-based recommendations failed: {result.get('error', 'Unknown error')}")
             self.skipTest("Shopping assistant service not available")
     
-    def test_room_specific_recommendations(self):
+    async def test_room_specific_recommendations(self):
         """Test room-specific recommendations."""
         print("\n🏠 Testing room-specific recommendations...")
         
-        result = self.tools.get_room_specific_recommendations(
+        result = await self.tools.get_room_specific_recommendations(
             room_type="bedroom",
             specific_needs="storage solutions"
         )
@@ -152,11 +156,11 @@ class TestShoppingAssistantIntegration(unittest.TestCase):
             print(f"❌ Room-specific recommendations failed: {result.get('error', 'Unknown error')}")
             self.skipTest("Shopping assistant service not available")
     
-    def test_complementary_products(self):
+    async def test_complementary_products(self):
         """Test complementary product recommendations."""
         print("\n🔗 Testing complementary product recommendations...")
         
-        result = self.tools.get_complementary_products(
+        result = await self.tools.get_complementary_products(
             existing_products=["sofa", "coffee table"],
             room_context="modern living room"
         )
@@ -180,12 +184,12 @@ class TestShoppingAssistantIntegration(unittest.TestCase):
             print(f"❌ Complementary product recommendations failed: {result.get('error', 'Unknown error')}")
             self.skipTest("Shopping assistant service not available")
     
-    def test_error_handling_empty_query(self):
+    async def test_error_handling_empty_query(self):
         """Test error handling with empty query."""
         print("\n❌ Testing error handling...")
         
         # Test empty query
-        result = self.tools.get_ai_recommendations(user_query="")
+        result = await self.tools.get_ai_recommendations(user_query="")
         
         self.assertFalse(result["success"])
         self.assertIn("error", result)
@@ -193,12 +197,12 @@ class TestShoppingAssistantIntegration(unittest.TestCase):
         
         print("✅ Empty query error handling works correctly")
     
-    def test_error_handling_invalid_products_list(self):
+    async def test_error_handling_invalid_products_list(self):
         """Test error handling with invalid products list."""
         print("\n❌ Testing complementary products error handling...")
         
         # Test empty products list
-        result = self.tools.get_complementary_products(existing_products=[])
+        result = await self.tools.get_complementary_products(existing_products=[])
         
         self.assertFalse(result["success"])
         self.assertIn("error", result)
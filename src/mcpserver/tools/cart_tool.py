@@ -1,6 +1,6 @@
 from typing import Dict, Any
 
-from clients.cart_client import CartServiceClient
+from clients.cart_client import CartServiceClient, get_cart_client
 
 
 class CartTools:
@@ -11,22 +11,22 @@ class CartTools:
 	"""
 
 	def __init__(self, client: CartServiceClient | None = None) -> None:
-		self._client = client or CartServiceClient()
+		self._client = client or get_cart_client()
 
-	def add_to_cart(self, user_id: str, product_id: str, quantity: int) -> Dict[str, Any]:
+	async def add_to_cart(self, user_id: str, product_id: str, quantity: int) -> Dict[str, Any]:
 		self._validate_user_id(user_id)
 		self._validate_product_id(product_id)
 		self._validate_quantity(quantity)
 
-		resp = self._client.add_item(user_id=user_id, product_id=product_id, quantity=quantity)
+		resp = await self._client.add_item(user_id=user_id, product_id=product_id, quantity=quantity)
 		return {
 			"status": "ok",
 			"message": f"Added {quantity} of product '{product_id}' to cart for user '{user_id}'.",
 		}
 
-	def get_cart_contents(self, user_id: str) -> Dict[str, Any]:
+	async def get_cart_contents(self, user_id: str) -> Dict[str, Any]:
 		self._validate_user_id(user_id)
-		cart = self._client.get_cart(user_id=user_id)
+		cart = await self._client.get_cart(user_id=user_id)
 		items = [
 			{"product_id": i.product_id, "quantity": i.quantity}
 			for i in cart.items
@@ -38,9 +38,9 @@ class CartTools:
 			"total_items": sum(i["quantity"] for i in items),
 		}
 
-	def clear_cart(self, user_id: str) -> Dict[str, Any]:
+	async def clear_cart(self, user_id: str) -> Dict[str, Any]:
 		self._validate_user_id(user_id)
-		self._client.empty_cart(user_id=user_id)
+		await self._client.empty_cart(user_id=user_id)
 		return {"status": "ok", "message": f"Cleared cart for user '{user_id}'."}
 
 	def _validate_user_id(self, user_id: str) -> None:
@@ -12,14 +12,14 @@ class CurrencyTools:
     def __init__(self, client: CurrencyServiceClient):
         self.client = client
     
-    def get_supported_currencies(self) -> Dict[str, Any]:
+    async def get_supported_currencies(self) -> Dict[str, Any]:
         """Get list of all supported currency codes.
         
         Returns:
             dict: Response with list of currency codes
         """
         try:
-            currencies = self.client.get_supported_currencies()
+            currencies = await self.client.get_supported_currencies()
             return {
                 "success": True,
                 "currencies": currencies,
@@ -35,7 +35,7 @@ class CurrencyTools:
                 "count": 0
             }
     
-    def convert_currency(self, from_currency: str, to_currency: str, 
+    async def convert_currency(self, from_currency: str, to_currency: str, 
                         amount: float) -> Dict[str, Any]:
         """Convert currency from one type to another.
         
@@ -65,7 +65,7 @@ class CurrencyTools:
             units = int(amount)
             nanos = int((amount - units) * 1_000_000_000)
             
-            result = self.client.convert_currency(
+            result = await self.client.convert_currency(
                 from_currency.upper(), 
                 to_currency.upper(), 
                 units, 
@@ -96,14 +96,14 @@ class CurrencyTools:
                 "original_amount": amount
             }
     
-    def get_exchange_rates(self) -> Dict[str, Any]:
+    async def get_exchange_rates(self) -> Dict[str, Any]:
         """Get current exchange rates for all supported currencies.
         
         Returns:
             dict: Exchange rates relative to EUR
         """
         try:
-            rates = self.client.get_exchange_rates()
+            rates = await self.client.get_exchange_rates()
             return {
                 "success": True,
                 "base_currency": "EUR",
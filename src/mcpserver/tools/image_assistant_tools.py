@@ -28,7 +28,7 @@ class ImageAssistantTools:
         try:
             logger.info(f"🔍 Analyzing image: {image_url}")
             
-            response = self.client.analyze_image(image_url=image_url, context=context)
+            response = await self.client.analyze_image(image_url=image_url, context=context)
             
             if not response.success:
                 return {
@@ -90,7 +90,7 @@ class ImageAssistantTools:
             logger.info(f"   📸 Base scene: {base_image_url}")
             logger.info(f"   🏺 Product: {product_image_url}")
             
-            response = self.client.visualize_product(
+            response = await self.client.visualize_product(
                 base_image_url=base_image_url,
                 product_image_url=product_image_url,
                 prompt=prompt
@@ -132,7 +132,7 @@ class ImageAssistantTools:
             Dictionary containing health status
         """
         try:
-            is_healthy = self.client.health_check()
+            is_healthy = await self.client.health_check()
             
             if is_healthy:
                 return {
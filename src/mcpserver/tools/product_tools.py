@@ -1,5 +1,5 @@
 from typing import Dict, Any, List
-from clients.product_client import ProductCatalogServiceClient
+from clients.product_client import ProductCatalogServiceClient, get_product_client
 from genproto import demo_pb2
 
 
@@ -12,9 +12,9 @@ class ProductTools:
     """
     
     def __init__(self, client: ProductCatalogServiceClient | None = None) -> None:
-        self._client = client or ProductCatalogServiceClient()
+        self._client = client or get_product_client()
     
-    def list_all_products(self) -> Dict[str, Any]:
+    async def list_all_products(self) -> Dict[str, Any]:
         """
         Get all products from the catalog.
         
@@ -22,7 +22,7 @@ class ProductTools:
             Dict with status, products list, and count
         """
         try:
-            response = self._client.list_products()
+            response = await self._client.list_products()
             
             products = []
             for product in response.products:
@@ -43,7 +43,7 @@ class ProductTools:
                 "total_count": 0
             }
     
-    def get_product_by_id(self, product_id: str) -> Dict[str, Any]:
+    async def get_product_by_id(self, product_id: str) -> Dict[str, Any]:
         """
         Get a specific product by its ID.
         
@@ -61,7 +61,7 @@ class ProductTools:
             }
         
         try:
-            product = self._client.get_product(product_id.strip())
+            product = await self._client.get_product(product_id.strip())
             
             return {
                 "status": "ok",
@@ -84,7 +84,7 @@ class ProductTools:
                     "product": None
                 }
     
-    def search_products(self, query: str) -> Dict[str, Any]:
+    async def search_products(self, query: str) -> Dict[str, Any]:
         """
         Search for products by name, description, or category.
         
@@ -103,7 +103,7 @@ class ProductTools:
             }
         
         try:
-            response = self._client.search_products(query.strip())
+            response = await self._client.search_products(query.strip())
             
             products = []
             for product in response.results:
@@ -126,7 +126,7 @@ class ProductTools:
                 "query": query.strip()
             }
     
-    def get_products_by_category(self, category: str) -> Dict[str, Any]:
+    async def get_products_by_category(self, category: str) -> Dict[str, Any]:
         """
         Get all products in a specific category.
         
@@ -146,7 +146,7 @@ class ProductTools:
         
         try:
             # Get all products first, then filter by category
-            response = self._client.list_products()
+            response = await self._client.list_products()
             category_lower = category.strip().lower()
             
             matching_products = []
@@ -173,7 +173,7 @@ class ProductTools:
                 "category": category.strip()
             }
     
-    def semantic_search_products(self, query: str, limit: int = 10) -> Dict[str, Any]:
+    async def semantic_search_products(self, query: str, limit: int = 10) -> Dict[str, Any]:
         """
         Search for products using AI-powered semantic search.
         
@@ -203,7 +203,7 @@ class ProductTools:
             limit = 50
         
         try:
-            response = self._client.semantic_search_products(query.strip(), limit)
+            response = await self._client.semantic_search_products(query.strip(), limit)
             
             products = []
             for product in response.results:
@@ -1,5 +1,5 @@
 from typing import Dict, Any, List
-from clients.review_client import ReviewServiceClient
+from clients.review_client import ReviewServiceClient, get_review_client
 import datetime
 
 
@@ -12,9 +12,9 @@ class ReviewTools:
     """
     
     def __init__(self, client: ReviewServiceClient | None = None) -> None:
-        self._client = client or ReviewServiceClient()
+        self._client = client or get_review_client()
     
-    def create_review(self, user_id: str, product_id: str, rating: int, review_text: str = "") -> Dict[str, Any]:
+    async def create_review(self, user_id: str, product_id: str, rating: int, review_text: str = "") -> Dict[str, Any]:
         """
         Create a new review for a product.
         
@@ -50,7 +50,7 @@ class ReviewTools:
             }
         
         try:
-            response = self._client.create_review(
+            response = await self._client.create_review(
                 user_id=user_id.strip(),
                 product_id=product_id.strip(), 
                 rating=rating,
@@ -78,7 +78,7 @@ class ReviewTools:
                 "review": None
             }
     
-    def get_product_reviews(self, product_id: str, limit: int = 50, offset: int = 0) -> Dict[str, Any]:
+    async def get_product_reviews(self, product_id: str, limit: int = 50, offset: int = 0) -> Dict[str, Any]:
         """
         Get all reviews for a specific product.
         
@@ -99,7 +99,7 @@ class ReviewTools:
             }
         
         try:
-            response = self._client.get_product_reviews(
+            response = await self._client.get_product_reviews(
                 product_id=product_id.strip(),
                 limit=max(1, min(100, limit)),  # Limit between 1-100
                 offset=max(0, offset)
@@ -124,7 +124,7 @@ class ReviewTools:
                 "product_id": product_id.strip()
             }
     
-    def get_user_reviews(self, user_id: str, limit: int = 50, offset: int = 0) -> Dict[str, Any]:
+    async def get_user_reviews(self, user_id: str, limit: int = 50, offset: int = 0) -> Dict[str, Any]:
         """
         Get all reviews by a specific user.
         
@@ -145,7 +145,7 @@ class ReviewTools:
             }
         
         try:
-            response = self._client.get_user_reviews(
+            response = await self._client.get_user_reviews(
                 user_id=user_id.strip(),
                 limit=max(1, min(100, limit)),
                 offset=max(0, offset)
@@ -170,7 +170,7 @@ class ReviewTools:
                 "user_id": user_id.strip()
             }
     
-    def update_review(self, review_id: int, rating: int, review_text: str = "") -> Dict[str, Any]:
+    async def update_review(self, review_id: int, rating: int, review_text: str = "") -> Dict[str, Any]:
         """
         Update an existing review.
         
@@ -197,7 +197,7 @@ class ReviewTools:
             }
         
         try:
-            response = self._client.update_review(
+            response = await self._client.update_review(
                 review_id=review_id,
                 rating=rating,
                 review_text=review_text.strip() if review_text else ""
@@ -231,7 +231,7 @@ class ReviewTools:
                     "review": None
                 }
     
-    def delete_review(self, review_id: int) -> Dict[str, Any]:
+    async def delete_review(self, review_id: int) -> Dict[str, Any]:
         """
         Delete a review.
         
@@ -248,7 +248,7 @@ class ReviewTools:
             }
         
         try:
-            response = self._client.delete_review(review_id=review_id)
+            response = await self._client.delete_review(review_id=review_id)
             
             if response.success:
                 return {
@@ -273,7 +273,7 @@ class ReviewTools:
                     "message": f"Failed to delete review: {str(e)}"
                 }
     
-    def get_product_review_summary(self, product_id: str) -> Dict[str, Any]:
+    async def get_product_review_summary(self, product_id: str) -> Dict[str, Any]:
         """
         Get review summary statistics for a product.
         
@@ -291,7 +291,7 @@ class ReviewTools:
             }
         
         try:
-            response = self._client.get_product_review_summary(product_id=product_id.strip())
+            response = await self._client.get_product_review_summary(product_id=product_id.strip())
             
             summary = {
                 "product_id": response.product_id,
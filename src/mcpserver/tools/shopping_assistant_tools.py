@@ -21,7 +21,7 @@ class ShoppingAssistantTools:
     def __init__(self, client: ShoppingAssistantServiceClient):
         self.client = client
     
-    def get_ai_recommendations(self, user_query: str, room_image: Optional[str] = None) -> Dict[str, Any]:
+    async def get_ai_recommendations(self, user_query: str, room_image: Optional[str] = None) -> Dict[str, Any]:
         """
         Get AI-powered product recommendations based on user query and optional room image.
         
@@ -42,8 +42,12 @@ class ShoppingAssistantTools:
                     "product_ids": []
                 }
             
+            # The client sends images as-is, so bare base64 from callers gets its data URL prefix here
+            if room_image and not room_image.startswith('data:image'):
+                room_image = f"data:image/jpeg;base64,{room_image}"
+            
             # Get AI recommendations from the shopping assistant service
-            result = self.client.get_ai_recommendations(user_query, room_image)
+            result = await self.client.aget_ai_recommendations(user_query, room_image)
             
             # Extract product IDs from the response content
             product_ids = self._extract_product_ids(result.get('content', ''))
@@ -67,7 +71,7 @@ class ShoppingAssistantTools:
                 "product_ids": []
             }
     
-    def get_style_based_recommendations(self, room_style: str, budget_max: Optional[float] = None) -> Dict[str, Any]:
+    async def get_style_based_recommendations(self, room_style: str, budget_max: Optional[float] = None) -> Dict[str, Any]:
         """
         Get product recommendations based on interior design style.
         
@@ -86,7 +90,7 @@ class ShoppingAssistantTools:
                 query += f" with a budget under ${budget_max:.2f}"
             
             # Get recommendations using the main method
-            result = self.get_ai_recommendations(query)
+            result = await self.get_ai_recommendations(query)
             
             if result["success"]:
                 result["room_style"] = room_style
@@ -106,7 +110,7 @@ class ShoppingAssistantTools:
                 "product_ids": []
             }
     
-    def get_room_specific_recommendations(self, room_type: str, specific_needs: Optional[str] = None) -> Dict[str, Any]:
+    async def get_room_specific_recommendations(self, room_type: str, specific_needs: Optional[str] = None) -> Dict[str, Any]:
         """
         Get product recommendations for specific room types.
         
@@ -125,7 +129,7 @@ class ShoppingAssistantTools:
                 query += f" focusing on {specific_needs}"
             
             # Get recommendations using the main method
-            result = self.get_ai_recommendations(query)
+            result = await self.get_ai_recommendations(query)
             
             if result["success"]:
                 result["room_type"] = room_type
@@ -145,7 +149,7 @@ class ShoppingAssistantTools:
                 "product_ids": []
             }
     
-    def analyze_room_image(self, room_image: str, user_preferences: Optional[str] = None) -> Dict[str, Any]:
+    async def analyze_room_image(self, room_image: str, user_preferences: Optional[str] = None) -> Dict[str, Any]:
         """
         Analyze a room image and provide tailored product recommendations.
         
@@ -172,7 +176,7 @@ class ShoppingAssistantTools:
                 query += f". User preferences: {user_preferences}"
             
             # Get recommendations with image
-            result = self.get_ai_recommendations(query, room_image)
+            result = await self.get_ai_recommendations(query, room_image)
             
             if result["success"]:
                 result["user_preferences"] = user_preferences
@@ -191,7 +195,7 @@ class ShoppingAssistantTools:
                 "product_ids": []
             }
     
-    def get_complementary_products(self, existing_products: List[str], room_context: Optional[str] = None) -> Dict[str, Any]:
+    async def get_complementary_products(self, existing_products: List[str], room_context: Optional[str] = None) -> Dict[str, Any]:
         """
         Get product recommendations that complement existing products.
         
@@ -219,7 +223,7 @@ class ShoppingAssistantTools:
                 query += f" in a {room_context}"
             
             # Get recommendations
-            result = self.get_ai_recommendations(query)
+            result = await self.get_ai_recommendations(query)
             
             if result["success"]:
                 result["existing_products"] = existing_products
@@ -14,6 +14,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import base64
 import os
 import psycopg2
 from google.cloud import secretmanager_v1
@@ -119,14 +120,25 @@ def search_products(query, limit=5):
 def create_app():
     app = Flask(__name__)
 
+    @app.route("/healthz", methods=['GET'])
+    def healthz():
+        # Liveness/readiness probe; must not touch Gemini or Cloud SQL
+        return {'status': 'ok'}
+
     @app.route("/", methods=['POST'])
     def talkToGemini():
         logger.info("Beginning AI recommendation call")
         
         try:
-            request_data = request.json
-            prompt = request_data.get('message', '')
-            image_data = request_data.get('image')
+            if request.files:
+                # multipart/form-data: the room image arrives as raw bytes instead of a base64 data URL
+                prompt = request.form.get('message', '')
+                upload = request.files.get('image')
+                image_data = f"data:{upload.mimetype};base64,{base64.b64encode(upload.read()).decode('ascii')}" if upload else None
+            else:
+                request_data = request.json
+                prompt = request_data.get('message', '')
+                image_data = request_data.get('image')
             
             if not prompt:
                 return {"content": "Please provide a query for product recommendations."}, 400
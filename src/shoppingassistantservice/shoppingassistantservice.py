@@ -14,6 +14,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import base64
 import os
 
 from google.cloud import secretmanager_v1
@@ -62,10 +63,22 @@ vectorstore = AlloyDBVectorStore.create_sync(
 def create_app():
     app = Flask(__name__)
 
+    @app.route("/healthz", methods=['GET'])
+    def healthz():
+        # Liveness/readiness probe; must not touch Gemini or AlloyDB
+        return {'status': 'ok'}
+
     @app.route("/", methods=['POST'])
     def talkToGemini():
         print("Beginning RAG call")
-        prompt = request.json['message']
+        if request.files:
+            # multipart/form-data: the room image arrives as raw bytes instead of a base64 data URL
+            prompt = request.form['message']
+            upload = request.files['image']
+            image_url = f"data:{upload.mimetype};base64,{base64.b64encode(upload.read()).decode('ascii')}"
+        else:
+            prompt = request.json['message']
+            image_url = request.json['image']
         prompt = unquote(prompt)
 
         # Step 1 – Get a room description from Gemini-vision-pro
@@ -76,7 +89,7 @@ def create_app():
                     "type": "text",
                     "text": "You are a professional interior designer, give me a detailed decsription of the style of the room in this image",
                 },
-                {"type": "image_url", "image_url": request.json['image']},
+                {"type": "image_url", "image_url": image_url},
             ]
         )
         response = llm_vision.invoke([message])